@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for cluster generation and set cover solving.
+
+Measures `ClusterGenerator.create_clusters` and `solve_set_cover` over a
+matrix of horizon lengths, candidate counts and synthetic service patterns,
+and writes throughput, latency percentiles and peak memory as JSON so runs
+can be compared across commits.
+
+Usage:
+    python -m benchmarks.run_benchmarks --output results.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.CreateClusters import (
+    ClusterConfig,
+    ClusterGenerator,
+    clear_cluster_library_cache,
+)
+from src.MCSolver import InvertedIndex, SolverConfig, solve_set_cover
+
+PATTERNS = ("weekday", "holiday", "noise")
+SPECIAL_CLUSTERS = ("Holidays", "Working days", "Days before Holidays", "All days")
+
+
+@dataclass
+class BenchmarkConfig:
+    """Configuration of a benchmark run."""
+
+    year: int = 2024  # Leap year, so the longest horizon has 366 days
+    horizons: List[int] = field(default_factory=lambda: [7, 31, 91, 182, 366])
+    extra_candidates: List[int] = field(default_factory=lambda: [0, 200, 1000])
+    patterns: List[str] = field(default_factory=lambda: list(PATTERNS))
+    services: int = 20  # Services solved per solver case
+    repeats: int = 20  # Timed calls per cluster generation case
+    noise: float = 0.05  # Fraction of days flipped by noisy patterns
+    seed: int = 0
+    solver: SolverConfig = field(default_factory=SolverConfig)
+
+
+def summarize(latencies: List[float], peak_memory: int) -> Dict[str, object]:
+    """
+    Summarize the latencies of a benchmark case.
+
+    Args:
+        latencies: Wall time of every timed call, in seconds.
+        peak_memory: Peak traced allocation of one untimed pass, in bytes.
+
+    Returns:
+        Run count, throughput, latency percentiles and peak memory.
+    """
+    samples = np.asarray(latencies) * 1000.0
+    total = float(np.sum(latencies))
+    return {
+        "runs": len(latencies),
+        "throughput_per_s": len(latencies) / total if total > 0 else None,
+        "latency_ms": {
+            "mean": float(samples.mean()),
+            "p50": float(np.percentile(samples, 50)),
+            "p90": float(np.percentile(samples, 90)),
+            "p99": float(np.percentile(samples, 99)),
+            "max": float(samples.max()),
+        },
+        "peak_memory_kib": peak_memory / 1024,
+    }
+
+
+def measure(calls: List[Callable[[], object]]) -> Dict[str, object]:
+    """
+    Time every call, then trace the memory of one extra pass over them.
+
+    Memory is traced separately because tracemalloc slows down allocation
+    heavy code and would distort the latencies.
+
+    Args:
+        calls: Zero-argument callables forming one pass of the case.
+
+    Returns:
+        Output of `summarize`.
+    """
+    latencies = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        for call in calls:
+            call()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return summarize(latencies, peak_memory)
+
+
+def make_candidates(
+    clusters: NDArray, extra: int, rng: np.random.Generator, noise: float
+) -> NDArray:
+    """
+    Extend the generated clusters with perturbed copies.
+
+    Args:
+        clusters: Boolean cluster matrix from `create_clusters`.
+        extra: Number of additional candidates.
+        rng: Random generator.
+        noise: Fraction of days flipped in every copy.
+
+    Returns:
+        Boolean candidate matrix with `extra` rows appended.
+    """
+    if extra == 0:
+        return clusters
+    copies = clusters[rng.integers(0, len(clusters), extra)]
+    copies = copies ^ (rng.random(copies.shape) < noise)
+    return np.vstack([clusters, copies])
+
+
+def make_services(
+    clusters: NDArray,
+    names: List[str],
+    pattern: str,
+    count: int,
+    rng: np.random.Generator,
+    noise: float,
+) -> NDArray:
+    """
+    Generate synthetic running-day patterns.
+
+    Args:
+        clusters: Boolean cluster matrix from `create_clusters`.
+        names: Cluster names.
+        pattern: "weekday" for pure weekday clusters, "holiday" for weekday
+            clusters that skip holidays and run on a few of them, "noise" for
+            weekday clusters with random days flipped.
+        count: Number of services.
+        rng: Random generator.
+        noise: Fraction of days flipped by the noise pattern.
+
+    Returns:
+        Boolean S×D matrix of running days, each row non-empty.
+
+    Raises:
+        ValueError: If the pattern is unknown.
+    """
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown pattern: {pattern}")
+
+    weekday_rows = [i for i, name in enumerate(names) if name not in SPECIAL_CLUSTERS]
+    services = clusters[rng.choice(weekday_rows, count)].copy()
+
+    if pattern == "holiday":
+        holidays = clusters[names.index("Holidays")]
+        added = holidays & (rng.random(services.shape) < 0.5)
+        services = (services & ~holidays) | added
+    elif pattern == "noise":
+        services ^= rng.random(services.shape) < noise
+
+    for row in services:
+        if not row.any():
+            row[rng.integers(0, len(row))] = True
+    return services
+
+
+def bench_create_clusters(config: BenchmarkConfig) -> List[Dict[str, object]]:
+    """
+    Benchmark cluster generation for every horizon.
+
+    Cold runs clear the memoized cluster libraries before every call and so
+    measure library construction; warm runs measure slicing a cached library;
+    view runs generate only the requested columns with `create_cluster_view`.
+
+    Args:
+        config: Benchmark configuration.
+
+    Returns:
+        Three result records per horizon: cold, warm and view.
+    """
+    generator = ClusterGenerator(ClusterConfig(year=config.year))
+
+    def cold(horizon: int) -> None:
+        clear_cluster_library_cache()
+        generator.create_clusters(1, horizon)
+
+    results = []
+    for horizon in config.horizons:
+        for library, call in (
+            ("cold", lambda: cold(horizon)),
+            ("warm", lambda: generator.create_clusters(1, horizon)),
+            ("view", lambda: generator.create_cluster_view(1, horizon).materialize()),
+        ):
+            record = {
+                "benchmark": "create_clusters",
+                "horizon": horizon,
+                "library": library,
+            }
+            record.update(measure([call] * config.repeats))
+            results.append(record)
+    return results
+
+
+def bench_solve_set_cover(config: BenchmarkConfig) -> List[Dict[str, object]]:
+    """
+    Benchmark set cover solving for every horizon, candidate count and pattern.
+
+    Args:
+        config: Benchmark configuration.
+
+    Returns:
+        One result record per case.
+    """
+    rng = np.random.default_rng(config.seed)
+    generator = ClusterGenerator(ClusterConfig(year=config.year))
+
+    results = []
+    for horizon in config.horizons:
+        clusters_array, names, day_indices = generator.create_clusters(1, horizon)
+        clusters = clusters_array != 0
+
+        for extra in config.extra_candidates:
+            candidates = make_candidates(clusters, extra, rng, config.noise)
+            sets = [set(day_indices[row].tolist()) for row in candidates]
+            index = (
+                InvertedIndex(sets) if config.solver.selection == "inverted" else None
+            )
+
+            for pattern in config.patterns:
+                services = make_services(
+                    clusters, names, pattern, config.services, rng, config.noise
+                )
+                parents = [set(day_indices[row].tolist()) for row in services]
+                calls = [
+                    lambda parent=parent: solve_set_cover(
+                        parent, sets, config.solver, index=index
+                    )
+                    for parent in parents
+                ]
+                record = {
+                    "benchmark": "solve_set_cover",
+                    "horizon": horizon,
+                    "candidates": len(sets),
+                    "pattern": pattern,
+                }
+                record.update(measure(calls))
+                results.append(record)
+    return results
+
+
+def git_revision() -> Optional[str]:
+    """Return the commit of the working tree, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(config: Optional[BenchmarkConfig] = None) -> Dict[str, object]:
+    """
+    Run the whole benchmark suite.
+
+    Args:
+        config: Benchmark configuration, the defaults if None.
+
+    Returns:
+        Machine-readable report with metadata, configuration and results.
+    """
+    config = config or BenchmarkConfig()
+    return {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_revision(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "config": asdict(config),
+        "results": bench_create_clusters(config) + bench_solve_set_cover(config),
+    }
+
+
+def format_report(report: Dict[str, object]) -> str:
+    """
+    Format a report as a human-readable table.
+
+    Args:
+        report: Output of `run_benchmarks`.
+
+    Returns:
+        One line per result record.
+    """
+    lines = []
+    for record in report["results"]:
+        case = f"{record['benchmark']:<16} days={record['horizon']:<4}"
+        if "library" in record:
+            case += f" {record['library']:<25}"
+        if "candidates" in record:
+            case += f" candidates={record['candidates']:<5} {record['pattern']:<8}"
+        latency = record["latency_ms"]
+        lines.append(
+            f"{case} {record['throughput_per_s'] or 0:>10.1f}/s"
+            f"  p50={latency['p50']:.3f}ms  p99={latency['p99']:.3f}ms"
+            f"  peak={record['peak_memory_kib']:.0f}KiB"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Tuple[BenchmarkConfig, str]:
+    """
+    Parse the command line.
+
+    Args:
+        argv: Arguments without the program name, sys.argv if None.
+
+    Returns:
+        Benchmark configuration and output path.
+    """
+    defaults = BenchmarkConfig()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--year", type=int, default=defaults.year)
+    parser.add_argument("--horizons", type=int, nargs="+", default=defaults.horizons)
+    parser.add_argument(
+        "--extra-candidates", type=int, nargs="+", default=defaults.extra_candidates
+    )
+    parser.add_argument(
+        "--patterns", nargs="+", choices=PATTERNS, default=defaults.patterns
+    )
+    parser.add_argument("--services", type=int, default=defaults.services)
+    parser.add_argument("--repeats", type=int, default=defaults.repeats)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--engine", default=defaults.solver.engine)
+    parser.add_argument("--selection", default=defaults.solver.selection)
+    args = parser.parse_args(argv)
+
+    config = BenchmarkConfig(
+        year=args.year,
+        horizons=args.horizons,
+        extra_candidates=args.extra_candidates,
+        patterns=args.patterns,
+        services=args.services,
+        repeats=args.repeats,
+        seed=args.seed,
+        solver=SolverConfig(engine=args.engine, selection=args.selection),
+    )
+    return config, args.output
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmarks and save the JSON report."""
+    config, output = parse_args(argv)
+    report = run_benchmarks(config)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(format_report(report))
+    print(f"Results saved to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import customtkinter as ctk
 import tkinter
 from tkinter import messagebox
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 import os
@@ -15,36 +15,33 @@ from PIL import Image
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
-from src.CreateClusters import ClusterGenerator, ClusterConfig
-from src.MCSolver import solve_set_cover, SolverConfig
+from src.CreateClusters import ClusterConfig, create_range_clusters
+from src.MCSolver import IncrementalSetCoverSolver, SolverConfig
+from src.MatrixSolver import ClusterRangeIndex, prune_clusters
 
 
 @dataclass
 class DateRange:
     """
-    Represents a validated date range.
+    Represents a validated date range, possibly spanning several years.
 
     Attributes:
         start: Start date
         end: End date
-        year: Year for which the range is valid
     """
 
     start: date
     end: date
-    year: int = 2021
 
     def __post_init__(self):
         """Validate date range after initialization."""
         if self.end < self.start:
             raise ValueError("Start date must be before end date")
-        if self.start.year != self.year or self.end.year != self.year:
-            raise ValueError(f"Dates must be in year {self.year}")
 
     @property
     def day_indices(self) -> Tuple[int, int]:
-        """Get day indices (1-based) for the date range."""
-        return (self.start.timetuple().tm_yday, self.end.timetuple().tm_yday)
+        """Get day ordinals (`date.toordinal`) for the date range."""
+        return (self.start.toordinal(), self.end.toordinal())
 
 
 class CalendarState:
@@ -55,6 +52,9 @@ class CalendarState:
         picked_ids: Dictionary tracking selected dates and their IDs
         date_range: Current selected date range
         clusters: Generated clusters data
+        range_index: Clusters of the whole years around the date range
+        cluster_sets: Day ordinals of every cluster, built once per date range
+        solver: Solver holding the last cover, repaired as dates are toggled
     """
 
     def __init__(self):
@@ -63,6 +63,9 @@ class CalendarState:
         }
         self.date_range: Optional[DateRange] = None
         self.clusters: Optional[Tuple] = None
+        self.range_index: Optional[ClusterRangeIndex] = None
+        self.cluster_sets: Optional[List[Set[int]]] = None
+        self.solver: Optional[IncrementalSetCoverSolver] = None
 
     def clear(self) -> None:
         """Reset state to initial values."""
@@ -77,6 +80,9 @@ class CalendarState:
         """
         if selected_date not in self.picked_ids["dates"]:
             self.picked_ids["dates"].append(selected_date)
+            if self.solver is not None:
+                # Picked dates have no service
+                self.solver.remove_day(selected_date.toordinal())
 
     def remove_date(self, selected_date: datetime) -> None:
         """
@@ -87,6 +93,11 @@ class CalendarState:
         """
         if selected_date in self.picked_ids["dates"]:
             self.picked_ids["dates"].remove(selected_date)
+            if self.solver is not None:
+                try:
+                    self.solver.add_day(selected_date.toordinal())
+                except RuntimeError:
+                    self.solver = None  # Solve from scratch on the next request
 
 
 class CalendarPopup(ctk.CTkToplevel):
@@ -192,12 +203,33 @@ class CalendarApp(ctk.CTk):
             end_date = datetime.strptime(self.end_date.get(), "%d/%m/%Y").date()
 
             self.calendar_state.date_range = DateRange(start_date, end_date)
-
-            # Generate clusters after setting date range
-            cluster_generator = ClusterGenerator(self.cluster_config)
-            self.calendar_state.clusters = cluster_generator.create_clusters(
-                *self.calendar_state.date_range.day_indices
-            )
+            self.calendar_state.solver = None
+
+            # Index whole years once, so moving the range inside them only
+            # slices the index. It holds every year of the range at once, so
+            # memory grows with the number of years.
+            first, last = self.calendar_state.date_range.day_indices
+            index = self.calendar_state.range_index
+            if index is None or not (
+                index.day_indices[0] <= first and last <= index.day_indices[-1]
+            ):
+                index = ClusterRangeIndex(
+                    create_range_clusters(
+                        date(start_date.year, 1, 1),
+                        date(end_date.year, 12, 31),
+                        self.cluster_config,
+                        "bool",
+                    )
+                )
+                self.calendar_state.range_index = index
+
+            # Merge the clusters that are duplicates inside the range
+            clusters = index.window(first, last)
+            self.calendar_state.clusters = prune_clusters(clusters).clusters
+            clusters_array, _, dates = self.calendar_state.clusters
+            self.calendar_state.cluster_sets = [
+                set(dates[row != 0].tolist()) for row in clusters_array
+            ]
 
             # Clear existing calendar frame and show calendar
             for widget in self.calendar_frame.winfo_children():
@@ -220,7 +252,7 @@ class CalendarApp(ctk.CTk):
         self.calendar = Calendar(
             self.calendar_frame,
             selectmode="day",
-            year=self.calendar_state.date_range.year,
+            year=self.calendar_state.date_range.start.year,
             month=self.calendar_state.date_range.start.month,
             # day=self.calendar_state.date_range.start.day,
             date_pattern="dd/mm/yyyy",
@@ -413,32 +445,36 @@ class ResultWindow(ctk.CTkToplevel):
         Returns:
             Formatted string containing calculation results
         """
-        clusters, names, dates = self.calendar_state.clusters
+        _, names, _ = self.calendar_state.clusters
         periodicity = self.calculate_periodicity()
 
         if len(periodicity) == 0:
             return self.generate_no_service_text()
 
-        processed_clusters = self.process_clusters(clusters, dates)
-        results = solve_set_cover(
-            set(periodicity), processed_clusters, self.solver_config
-        )
+        solver = self.calendar_state.solver
+        parent = set(periodicity.tolist())
+        if solver is None or solver.config != self.solver_config:
+            solver = IncrementalSetCoverSolver(self.solver_config)
+        if solver.original_parent != parent:
+            # Stored only once solved; the same sets keep the solver's index
+            self.calendar_state.solver = None
+            solver.solve(parent, self.calendar_state.cluster_sets)
+        self.calendar_state.solver = solver
 
-        return self.format_results(results, names, periodicity)
+        return self.format_results(solver.selected, names, periodicity)
 
     def calculate_periodicity(self) -> np.ndarray:
         """
         Calculate periodicity based on selected dates.
 
         Returns:
-            Array of day indices where service is needed
+            Array of day ordinals where service is needed
         """
         start_idx, end_idx = self.calendar_state.date_range.day_indices
-        period_length = end_idx - start_idx + 1
 
-        selected_indices = [
-            date.timetuple().tm_yday for date in self.calendar_state.picked_ids["dates"]
-        ]
+        selected_indices = {
+            date.toordinal() for date in self.calendar_state.picked_ids["dates"]
+        }
 
         periodicity = np.array(
             [
@@ -450,30 +486,14 @@ class ResultWindow(ctk.CTkToplevel):
 
         return periodicity
 
-    def process_clusters(
-        self, clusters: np.ndarray, dates: np.ndarray
-    ) -> List[Set[int]]:
-        """
-        Process clusters into sets for solver.
-
-        Args:
-            clusters: Array of cluster data
-            dates: Array of date indices
-
-        Returns:
-            List of sets representing processed clusters
-        """
-        processed = np.multiply(clusters, dates).astype(int).tolist()
-        return [set(filter((0).__ne__, cluster)) for cluster in processed]
-
     def format_results(
-        self, results: List[Set[int]], names: List[str], periodicity: np.ndarray
+        self, results: List[int], names: List[str], periodicity: np.ndarray
     ) -> str:
         """
         Format results into human-readable text.
 
         Args:
-            results: List of result sets
+            results: Row indices of the selected clusters
             names: List of cluster names
             periodicity: Array of day indices
 
@@ -483,28 +503,13 @@ class ResultWindow(ctk.CTkToplevel):
         if not results:
             return self.generate_no_service_text()
 
-        # Get cluster names for results
-        result_names = []
-        result_union = set()
-
-        processed_clusters = self.process_clusters(
-            self.calendar_state.clusters[0], self.calendar_state.clusters[2]
-        )
-
-        for result_set in results:
-            try:
-                idx = processed_clusters.index(result_set)
-                name = names[idx]
-                result_names.append(name)
-                result_union |= result_set
-            except ValueError:
-                continue
-        print(f"results: {results}")
-        print(f"processed_clusters: {processed_clusters}")
+        clusters, _, dates = self.calendar_state.clusters
 
+        # Get cluster names and covered days for results
+        result_names = [names[idx] for idx in results]
+        result_union = set(dates[np.any(clusters[results] != 0, axis=0)].tolist())
         print(f"result_names: {result_names}")
         print(f"result_union: {result_union}")
-        print(f"names: {names}")
 
         # Format text
         service_text = self.format_service_text(result_names)
@@ -559,14 +564,8 @@ class ResultWindow(ctk.CTkToplevel):
         return " ".join(texts)
 
     def days_to_dates(self, days: List[int]) -> List[str]:
-        """Convert day indices to formatted dates."""
-        return [
-            (
-                datetime(self.calendar_state.date_range.year, 1, 1)
-                + timedelta(days=day - 1)
-            ).strftime("%d/%m/%Y")
-            for day in days
-        ]
+        """Convert day ordinals to formatted dates."""
+        return [date.fromordinal(day).strftime("%d/%m/%Y") for day in days]
 
     def format_dates(self, dates: List[str]) -> str:
         """Format list of dates into readable string."""
@@ -0,0 +1,479 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, fields, is_dataclass
+from datetime import date
+from functools import cached_property
+from itertools import product
+from typing import Callable, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+WEEKDAY_NAMES = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+MONTH_NAMES = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+ORDINAL_WORDS = {
+    1: "first",
+    2: "second",
+    3: "third",
+    4: "fourth",
+    5: "fifth",
+    -1: "last",
+}
+
+# datetime64 day whose `date.toordinal()` is 1
+_ORDINAL_EPOCH = np.datetime64("0001-01-01", "D")
+
+
+@dataclass(frozen=True, eq=False)
+class CalendarDays:
+    """
+    Calendar attributes of a run of consecutive days, computed on demand.
+
+    Every attribute is an array with one entry per day, derived once with
+    vectorized date arithmetic and shared by all conditions evaluated on
+    the same days.
+    """
+
+    ordinals: NDArray  # `date.toordinal()` of every day
+    holidays: NDArray  # Boolean holiday mask, Sundays included
+    working_days: NDArray  # Boolean mask of working days
+
+    @cached_property
+    def dates(self) -> NDArray:
+        """Days as datetime64[D]."""
+        return _ORDINAL_EPOCH + (self.ordinals - 1)
+
+    @cached_property
+    def weekday(self) -> NDArray:
+        """Weekday, Monday=0."""
+        return (self.ordinals - 1) % 7
+
+    @cached_property
+    def month(self) -> NDArray:
+        """Month, 1-based."""
+        return self.dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+
+    @cached_property
+    def day(self) -> NDArray:
+        """Day of the month, 1-based."""
+        month_starts = self.dates.astype("datetime64[M]").astype("datetime64[D]")
+        return (self.dates - month_starts).astype(np.int64) + 1
+
+    @cached_property
+    def days_in_month(self) -> NDArray:
+        """Length of the month of every day."""
+        month_starts = self.dates.astype("datetime64[M]")
+        lengths = (month_starts + 1).astype("datetime64[D]") - month_starts.astype(
+            "datetime64[D]"
+        )
+        return lengths.astype(np.int64)
+
+    @cached_property
+    def week(self) -> NDArray:
+        """Monday-based week number, counted without restarting at year ends."""
+        return (self.ordinals - 1) // 7
+
+    @cached_property
+    def month_groups(self) -> NDArray:
+        """Index of the calendar month of every day, 0 for the first month."""
+        months = self.dates.astype("datetime64[M]").astype(np.int64)
+        return months - months[0]
+
+    @cached_property
+    def working_day_number(self) -> NDArray:
+        """Position of each working day within its month, 0 on other days."""
+        counts = np.cumsum(self.working_days)
+        starts = np.flatnonzero(np.diff(self.month_groups, prepend=-1))
+        offsets = (counts - self.working_days)[starts]
+        return np.where(self.working_days, counts - offsets[self.month_groups], 0)
+
+    @cached_property
+    def working_days_in_month(self) -> NDArray:
+        """Number of working days in the month of every day."""
+        totals = np.bincount(self.month_groups, weights=self.working_days)
+        return totals.astype(np.int64)[self.month_groups]
+
+
+class DayCondition(ABC):
+    """
+    Condition on calendar days, evaluated on whole arrays of days.
+
+    Conditions compose with `&`, `|` and `~`. `str` gives the readable text
+    used by name templates.
+    """
+
+    @abstractmethod
+    def mask(self, days: CalendarDays) -> NDArray:
+        """
+        Evaluate the condition.
+
+        Args:
+            days: Days to evaluate.
+
+        Returns:
+            Boolean mask, one entry per day.
+        """
+
+    def key(self) -> Tuple[object, ...]:
+        """
+        Identify the condition for fingerprints, stable across processes.
+
+        Dataclass conditions are keyed by class name and field values, with
+        nested conditions keyed in turn. Other subclasses must override it.
+
+        Returns:
+            Tuple of strings, numbers and nested tuples.
+
+        Raises:
+            NotImplementedError: If the condition is not a dataclass.
+        """
+        if not is_dataclass(self):
+            raise NotImplementedError(f"{type(self).__name__} must define key().")
+        values = (_key_value(getattr(self, item.name)) for item in fields(self))
+        return (type(self).__name__, *values)
+
+    def __and__(self, other: "DayCondition") -> "DayCondition":
+        return AllOf((self, other))
+
+    def __or__(self, other: "DayCondition") -> "DayCondition":
+        return AnyOf((self, other))
+
+    def __invert__(self) -> "DayCondition":
+        return Not(self)
+
+
+def _key_value(value: object) -> object:
+    """Convert a condition field to plain tuples, strings and numbers."""
+    if isinstance(value, DayCondition):
+        return value.key()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (tuple, list)):
+        return tuple(_key_value(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class AllOf(DayCondition):
+    """Days meeting every condition."""
+
+    conditions: Tuple[DayCondition, ...]
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        return np.logical_and.reduce([c.mask(days) for c in self.conditions])
+
+    def __str__(self) -> str:
+        return " and ".join(str(c) for c in self.conditions)
+
+
+@dataclass(frozen=True)
+class AnyOf(DayCondition):
+    """Days meeting at least one condition."""
+
+    conditions: Tuple[DayCondition, ...]
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        return np.logical_or.reduce([c.mask(days) for c in self.conditions])
+
+    def __str__(self) -> str:
+        return " or ".join(str(c) for c in self.conditions)
+
+
+@dataclass(frozen=True)
+class Not(DayCondition):
+    """Days not meeting a condition."""
+
+    condition: DayCondition
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        return ~self.condition.mask(days)
+
+    def __str__(self) -> str:
+        return f"not {self.condition}"
+
+
+@dataclass(frozen=True)
+class Weekday(DayCondition):
+    """Days falling on one weekday, given by name or index (Monday=0)."""
+
+    weekday: Union[int, str]
+
+    @property
+    def index(self) -> int:
+        """Weekday index, Monday=0."""
+        if isinstance(self.weekday, str):
+            return WEEKDAY_NAMES.index(self.weekday)
+        return self.weekday
+
+    @property
+    def singular(self) -> str:
+        """Weekday name, e.g. "Monday"."""
+        return WEEKDAY_NAMES[self.index]
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        return days.weekday == self.index
+
+    def __str__(self) -> str:
+        return f"{self.singular}s"
+
+
+@dataclass(frozen=True)
+class Months(DayCondition):
+    """Days in a range of months, wrapping around the year end."""
+
+    first: int
+    last: int
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        if self.first <= self.last:
+            return (days.month >= self.first) & (days.month <= self.last)
+        return (days.month >= self.first) | (days.month <= self.last)
+
+    def __str__(self) -> str:
+        if self.first == self.last:
+            return MONTH_NAMES[self.first - 1]
+        return f"{MONTH_NAMES[self.first - 1]}–{MONTH_NAMES[self.last - 1]}"
+
+
+@dataclass(frozen=True)
+class EveryNthWeek(DayCondition):
+    """
+    Days in weeks whose number is `phase` modulo `interval`.
+
+    Weeks are counted continuously from Monday 0001-01-01, unlike ISO week
+    numbers, so the alternation is kept across years with 53 ISO weeks.
+    """
+
+    interval: int
+    phase: int
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        return days.week % self.interval == self.phase
+
+    def __str__(self) -> str:
+        if self.interval == 2:
+            return "odd weeks" if self.phase == 1 else "even weeks"
+        return f"weeks {self.phase} mod {self.interval}"
+
+
+@dataclass(frozen=True)
+class NthWeekdayOfMonth(DayCondition):
+    """The n-th occurrence of a day's weekday in its month; n=-1 for the last."""
+
+    n: int
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        if self.n < 0:
+            return (days.days_in_month - days.day) // 7 == -self.n - 1
+        return (days.day - 1) // 7 == self.n - 1
+
+    def __str__(self) -> str:
+        return ORDINAL_WORDS.get(self.n, f"{self.n}th")
+
+
+@dataclass(frozen=True)
+class NthWorkingDayOfMonth(DayCondition):
+    """The n-th working day of every month; n=-1 for the last."""
+
+    n: int
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        if self.n < 0:
+            target = days.working_days_in_month + self.n + 1
+        else:
+            target = self.n
+        return days.working_days & (days.working_day_number == target)
+
+    def __str__(self) -> str:
+        return ORDINAL_WORDS.get(self.n, f"{self.n}th")
+
+
+@dataclass(frozen=True)
+class WorkingDays(DayCondition):
+    """Working days."""
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        return days.working_days
+
+    def __str__(self) -> str:
+        return "working days"
+
+
+@dataclass(frozen=True)
+class Holidays(DayCondition):
+    """Holidays, Sundays included."""
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        return days.holidays
+
+    def __str__(self) -> str:
+        return "holidays"
+
+
+@dataclass(frozen=True)
+class DateRanges(DayCondition):
+    """Days inside any of a set of inclusive date ranges, e.g. school terms."""
+
+    ranges: Tuple[Tuple[date, date], ...]
+    label: str = "date ranges"
+
+    def mask(self, days: CalendarDays) -> NDArray:
+        bounds = np.array(
+            [(start.toordinal(), end.toordinal()) for start, end in self.ranges]
+        ).reshape(-1, 2)
+        inside = (days.ordinals >= bounds[:, :1]) & (days.ordinals <= bounds[:, 1:])
+        return inside.any(axis=0)
+
+    def __str__(self) -> str:
+        return self.label
+
+
+@dataclass(frozen=True)
+class ClusterFamily:
+    """
+    Declarative family of candidate clusters.
+
+    Every combination of the grid values is one member. Its name is the
+    template formatted with the member's values, and its days are given by
+    the condition the factory builds from them.
+    """
+
+    template: str  # Name template, e.g. "{days} in {months}"
+    condition: Callable[..., DayCondition]  # Builds a member's condition
+    grid: Tuple[Tuple[str, Tuple[object, ...]], ...] = field(default=())
+
+    def members(self) -> Iterator[Tuple[str, DayCondition]]:
+        """
+        Iterate over the members of the family.
+
+        Yields:
+            Name and condition of every member.
+        """
+        keys = [key for key, _ in self.grid]
+        for values in product(*(values for _, values in self.grid)):
+            params = dict(zip(keys, values))
+            yield self.template.format(**params), self.condition(**params)
+
+    def build(self, days: CalendarDays) -> Tuple[List[str], NDArray]:
+        """
+        Generate the clusters of the family.
+
+        Args:
+            days: Days to generate the clusters over.
+
+        Returns:
+            Member names and the boolean M×D cluster matrix.
+        """
+        names = []
+        rows = []
+        for name, condition in self.members():
+            names.append(name)
+            rows.append(condition.mask(days))
+        if not rows:
+            return names, np.zeros((0, len(days.ordinals)), dtype=bool)
+        return names, np.vstack(rows)
+
+
+def cluster_family(
+    template: str, condition: Callable[..., DayCondition], **grid: Sequence[object]
+) -> ClusterFamily:
+    """
+    Create a cluster family from keyword grid values.
+
+    Args:
+        template: Name template formatted with each member's values.
+        condition: Builds a member's condition from its values.
+        **grid: Values of every template field.
+
+    Returns:
+        The cluster family.
+    """
+    return ClusterFamily(
+        template, condition, tuple((key, tuple(values)) for key, values in grid.items())
+    )
+
+
+def _all_of(**params: DayCondition) -> DayCondition:
+    """Combine the conditions given as grid values."""
+    return AllOf(tuple(params.values()))
+
+
+EVERY_SECOND_WEEKDAY = cluster_family(
+    "every 2nd {days.singular} ({weeks})",
+    _all_of,
+    days=[Weekday(i) for i in range(7)],
+    weeks=[EveryNthWeek(2, 1), EveryNthWeek(2, 0)],
+)
+
+NTH_WEEKDAY_OF_MONTH = cluster_family(
+    "{nth} {days.singular} of the month",
+    _all_of,
+    nth=[NthWeekdayOfMonth(n) for n in (1, 2, 3, 4, -1)],
+    days=[Weekday(i) for i in range(7)],
+)
+
+WORKING_DAY_OF_MONTH = cluster_family(
+    "{nth} working day of the month",
+    _all_of,
+    nth=[NthWorkingDayOfMonth(1), NthWorkingDayOfMonth(-1)],
+)
+
+
+def weekdays_in_months(*months: Months) -> ClusterFamily:
+    """
+    Create the family of every weekday within month ranges.
+
+    Args:
+        *months: Month ranges, e.g. `Months(7, 8)` for "Fridays in July–August".
+
+    Returns:
+        The cluster family, one member per weekday and range.
+    """
+    return cluster_family(
+        "{days} in {months}",
+        _all_of,
+        days=[Weekday(i) for i in range(7)],
+        months=months,
+    )
+
+
+def school_term_weekdays(
+    terms: Sequence[Tuple[date, date]], label: str = "school term"
+) -> ClusterFamily:
+    """
+    Create the family of weekdays and working days within school terms.
+
+    Args:
+        terms: Inclusive (start, end) dates of every term.
+        label: Text naming the terms in cluster names.
+
+    Returns:
+        The cluster family, one member per weekday from Monday to Friday plus
+        one for working days.
+    """
+    return cluster_family(
+        "{days} in {term}",
+        _all_of,
+        days=[Weekday(i) for i in range(5)] + [WorkingDays()],
+        term=[DateRanges(tuple(terms), label)],
+    )
@@ -1,9 +1,25 @@
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import List, Tuple, Dict
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Dict
 import numpy as np
 from numpy.typing import NDArray
 
+from src.ClusterFamilies import CalendarDays, ClusterFamily
+from src.Holidays import date_string_day_indices, holiday_day_indices
+
+if TYPE_CHECKING:
+    from src.LibraryStore import ClusterStore
+
+# Number of full-year cluster libraries kept by `get_cluster_library`
+LIBRARY_CACHE_SIZE = 32
+
+# Compiled library files consulted before building a library
+_cluster_stores: List["ClusterStore"] = []
+
+# Cluster matrix layouts: float64 0/1, bool, or rows packed 8 days per byte
+LAYOUTS = ("float", "bool", "packed")
+
 
 @dataclass
 class ClusterConfig:
@@ -21,22 +37,56 @@ class ClusterConfig:
             "Sunday",
         ]
     )
-    holidays: List[str] = field(
-        default_factory=lambda: [
-            "01/01",
-            "06/01",
-            "05/04",
-            "01/05",
-            "03/05",
-            "23/05",
-            "03/06",
-            "15/08",
-            "01/11",
-            "11/11",
-            "25/12",
-            "26/12",
-        ]
-    )
+    holidays: List[str] = field(default_factory=list)  # Extra DD/MM holidays
+    region: Optional[str] = "PL"  # Holiday calendar of `Holidays.REGIONS`, or None
+    families: Tuple[ClusterFamily, ...] = ()  # Extra candidate families
+
+
+@dataclass(frozen=True)
+class ClusterLibrary:
+    """Read-only clusters of a whole year, sliced without copying."""
+
+    clusters: NDArray  # Boolean cluster matrix over every day of the year
+    names: Tuple[str, ...]  # Cluster names, one per row
+    day_indices: NDArray  # 1-based day index of every column
+
+    @cached_property
+    def float_clusters(self) -> NDArray:
+        """Read-only float64 copy of the cluster matrix, built on first use."""
+        clusters = self.clusters.astype(float)
+        clusters.flags.writeable = False
+        return clusters
+
+    def slice(
+        self, start_idx: int, end_idx: int, layout: str = "float"
+    ) -> Tuple[NDArray, List[str], NDArray]:
+        """
+        Return the clusters of a day range.
+
+        Float and bool clusters are read-only views of the library; packed
+        clusters are packed from the bool view for the requested range.
+
+        Args:
+            start_idx: The starting day index (1-based).
+            end_idx: The ending day index (1-based).
+            layout: One of `LAYOUTS`.
+
+        Returns:
+            The cluster array, cluster names and day indices of the range.
+
+        Raises:
+            ValueError: If the layout is unknown.
+        """
+        if layout == "float":
+            clusters = self.float_clusters[:, start_idx - 1 : end_idx]
+        elif layout == "bool":
+            clusters = self.clusters[:, start_idx - 1 : end_idx]
+        elif layout == "packed":
+            clusters = pack_clusters(self.clusters[:, start_idx - 1 : end_idx])
+        else:
+            raise ValueError(f"Unknown cluster layout: {layout}")
+
+        return clusters, list(self.names), self.day_indices[start_idx - 1 : end_idx]
 
 
 class ClusterGenerator:
@@ -46,71 +96,62 @@ class ClusterGenerator:
         self.config = config
         self.days_in_year = 365 if not self._is_leap_year(config.year) else 366
         self.day_offsets = self._calculate_day_offsets()
+        self.day_of_week = self._calculate_day_of_week()
+        self.single_day_matrix = self._calculate_single_day_matrix()
 
     def _calculate_day_offsets(self) -> List[int]:
         """Calculate day offsets for each weekday based on the first day of the year."""
         first_day = datetime(self.config.year, 1, 1).weekday()  # Monday=0, Sunday=6
         return [(i - first_day) % 7 for i in range(7)]
 
+    def _calculate_day_of_week(self) -> NDArray:
+        """Calculate the weekday (Monday=0) of every day of the year."""
+        first_day = datetime(self.config.year, 1, 1).weekday()
+        return (np.arange(self.days_in_year) + first_day) % 7
+
+    def _calculate_single_day_matrix(self) -> NDArray:
+        """Calculate the 7×D weekday masks, one row per weekday."""
+        return (self.day_of_week == np.arange(7)[:, None]).astype(int)
+
     def _is_leap_year(self, year: int) -> bool:
         """Check if the given year is a leap year."""
         return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
 
     def _create_single_day_clusters(self) -> Dict[str, NDArray]:
         """Create clusters for individual days of the week."""
-        clusters = {}
-        for day_index, day_name in enumerate(self.config.weekdays):
-            clusters[day_name] = np.array(
-                [
-                    (
-                        1
-                        if (
-                            datetime(self.config.year, 1, 1) + timedelta(days=i)
-                        ).weekday()
-                        == day_index
-                        else 0
-                    )
-                    for i in range(self.days_in_year)
-                ]
-            )
-        return clusters
+        return dict(zip(self.config.weekdays, self.single_day_matrix))
 
     def _create_multi_day_clusters(self, num_days: int) -> Dict[str, NDArray]:
         """Create clusters for consecutive days."""
-        clusters = {}
-        single_day_clusters = self._create_single_day_clusters()
         weekdays = self.config.weekdays
         num_weekdays = len(weekdays)
 
-        for i in range(num_weekdays):
-            cluster_days = []
-            cluster_name_parts = []
-
-            for j in range(num_days):
-                day_idx = (i + j) % num_weekdays
-                day_name = weekdays[day_idx]
-                cluster_days.append(single_day_clusters[day_name])
-                cluster_name_parts.append(day_name)
+        # Circular sums of num_days consecutive weekday rows from prefix sums
+        wrapped = self.single_day_matrix[np.arange(num_weekdays + num_days - 1) % 7]
+        prefix = np.zeros((len(wrapped) + 1, self.days_in_year), dtype=int)
+        np.cumsum(wrapped, axis=0, out=prefix[1:])
+        windows = prefix[num_days : num_days + num_weekdays] - prefix[:num_weekdays]
 
+        clusters = {}
+        for i in range(num_weekdays):
+            first_day = weekdays[i]
+            last_day = weekdays[(i + num_days - 1) % num_weekdays]
             if num_days <= 2:
-                name = f"{cluster_name_parts[0]} and {cluster_name_parts[-1]}"
+                name = f"{first_day} and {last_day}"
             else:
-                name = f"from {cluster_name_parts[0]} to {cluster_name_parts[-1]}"
-
-            clusters[name] = np.sum(cluster_days, axis=0)
+                name = f"from {first_day} to {last_day}"
+            clusters[name] = windows[i]
 
         return clusters
 
     def _create_special_clusters(self, working_days: NDArray) -> Dict[str, NDArray]:
         """Create special clusters like holidays and pre-holidays."""
-        holiday_indices = self._date_strings_to_indices(self.config.holidays)
         holidays = np.zeros(self.days_in_year)
-        holidays[np.array(holiday_indices) - 1] = 1
+        holidays[self._holiday_indices() - 1] = 1
 
         # Add Sundays to holidays
         sunday_idx = self.config.weekdays.index("Sunday")
-        holidays += self._create_single_day_clusters()[self.config.weekdays[sunday_idx]]
-        holidays[holidays > 1] = 1
+        holidays[self.day_of_week == sunday_idx] = 1
 
         # Working days excluding holidays
         working_days = working_days.copy()
@@ -126,14 +167,13 @@ class ClusterGenerator:
             "Days before Holidays": pre_holidays,
         }
 
-    def _date_strings_to_indices(self, date_strings: List[str]) -> List[int]:
+    def _holiday_indices(self) -> NDArray:
+        """Get the day-of-year indices of the region's and the extra holidays."""
+        return _year_holiday_indices(self.config)
+
+    def _date_strings_to_indices(self, date_strings: List[str]) -> NDArray:
         """Convert date strings (DD/MM) to day-of-year indices."""
-        return [
-            datetime.strptime(f"{date}/{self.config.year}", "%d/%m/%Y")
-            .timetuple()
-            .tm_yday
-            for date in date_strings
-        ]
+        return date_string_day_indices(self.config.year, date_strings)
 
     def _combine_clusters(
         self,
@@ -148,50 +188,32 @@ class ClusterGenerator:
 
         # Add regular clusters
         for collection in cluster_collections.values():
-            for name, cluster in collection.items():
-                all_clusters.append(cluster)
-                cluster_names.append(name)
+            all_clusters.extend(collection.values())
+            cluster_names.extend(collection)
 
         # Add special clusters
-        for name, cluster in special_clusters.items():
-            all_clusters.append(cluster)
-            cluster_names.append(name)
+        all_clusters.extend(special_clusters.values())
+        cluster_names.extend(special_clusters)
 
         # Add "All days" cluster
-        all_days = np.ones(self.days_in_year)
-        all_clusters.append(all_days)
+        all_clusters.append(np.ones(self.days_in_year))
         cluster_names.append("All days")
 
-        # Convert to numpy array and slice to requested range
-        clusters_array = np.array(all_clusters)[:, start_idx - 1 : end_idx]
-        day_indices = np.array(range(start_idx, end_idx + 1))
+        # Stack only the requested range of every cluster
+        clusters_array = np.empty((len(all_clusters), end_idx - start_idx + 1))
+        for row, cluster in zip(clusters_array, all_clusters):
+            row[:] = cluster[start_idx - 1 : end_idx]
+        day_indices = np.arange(start_idx, end_idx + 1)
 
         return clusters_array, cluster_names, day_indices
 
-    def create_clusters(
-        self, start_idx: int, end_idx: int
-    ) -> Tuple[NDArray, List[str], NDArray]:
+    def build_library(self) -> ClusterLibrary:
         """
-        Create clusters of days based on specific patterns and holidays.
-
-        Args:
-            start_idx: The starting day index (1-based).
-            end_idx: The ending day index (1-based).
+        Build the clusters of the whole year.
 
         Returns:
-            A tuple containing:
-            - A numpy array of clusters for the specified range.
-            - A list of cluster names.
-            - A numpy array of day indices for the specified range.
-
-        Raises:
-            ValueError: If indices are invalid.
+            The year's cluster library with read-only arrays.
         """
-        if start_idx < 1 or end_idx > self.days_in_year or start_idx > end_idx:
-            raise ValueError(
-                f"Invalid indices: start_idx={start_idx}, end_idx={end_idx}"
-            )
-
         # Create all cluster collections
         cluster_collections = {
             "single": self._create_single_day_clusters(),
@@ -208,7 +230,500 @@ class ClusterGenerator:
         # Create special clusters
         special_clusters = self._create_special_clusters(working_days)
 
-        # Combine all clusters and return
-        return self._combine_clusters(
-            cluster_collections, special_clusters, start_idx, end_idx
+        # Combine all clusters
+        clusters_array, cluster_names, day_indices = self._combine_clusters(
+            cluster_collections, special_clusters, 1, self.days_in_year
         )
+        clusters = clusters_array != 0
+
+        # Add user-defined cluster families
+        if self.config.families:
+            days = CalendarDays(
+                ordinals=day_indices + (date(self.config.year, 1, 1).toordinal() - 1),
+                holidays=special_clusters["Holidays"] != 0,
+                working_days=special_clusters["Working days"] != 0,
+            )
+            family_rows = [clusters]
+            for family in self.config.families:
+                names, rows = family.build(days)
+                cluster_names.extend(names)
+                family_rows.append(rows)
+            clusters = np.vstack(family_rows)
+
+        clusters.flags.writeable = False
+        day_indices.flags.writeable = False
+        return ClusterLibrary(clusters, tuple(cluster_names), day_indices)
+
+    def create_cluster_view(self, start_idx: int, end_idx: int) -> "ClusterView":
+        """
+        Create a lazy view of the clusters of a day range.
+
+        Unlike `create_clusters`, the view never builds the full-year library
+        unless cluster families are configured; see `ClusterView`.
+
+        Args:
+            start_idx: The starting day index (1-based).
+            end_idx: The ending day index (1-based).
+
+        Returns:
+            The view of the range.
+
+        Raises:
+            ValueError: If indices are invalid.
+        """
+        self._check_indices(start_idx, end_idx)
+        return ClusterView(self.config, start_idx, end_idx)
+
+    def _check_indices(self, start_idx: int, end_idx: int) -> None:
+        """Raise ValueError unless the indices form a range within the year."""
+        if start_idx < 1 or end_idx > self.days_in_year or start_idx > end_idx:
+            raise ValueError(
+                f"Invalid indices: start_idx={start_idx}, end_idx={end_idx}"
+            )
+
+    def create_clusters(
+        self, start_idx: int, end_idx: int, layout: str = "float"
+    ) -> Tuple[NDArray, List[str], NDArray]:
+        """
+        Create clusters of days based on specific patterns and holidays.
+
+        The full-year library is taken from `get_cluster_library`, so float
+        and bool clusters are read-only views shared between calls. Packed
+        clusters hold the days of each row in `np.packbits` order, 8 per byte.
+
+        Args:
+            start_idx: The starting day index (1-based).
+            end_idx: The ending day index (1-based).
+            layout: "float" for 0/1 float64 rows, "bool" or "packed".
+
+        Returns:
+            A tuple containing:
+            - A numpy array of clusters for the specified range.
+            - A list of cluster names.
+            - A numpy array of day indices for the specified range.
+
+        Raises:
+            ValueError: If indices or layout are invalid.
+        """
+        self._check_indices(start_idx, end_idx)
+        return get_cluster_library(self.config).slice(start_idx, end_idx, layout)
+
+
+@dataclass(frozen=True, eq=False)
+class ClusterView:
+    """
+    Clusters of a day range, generated on demand for its columns only.
+
+    Weekday clusters are looked up from a 7-column table of the weekdays each
+    cluster contains, indexed by the weekday of every requested day, and
+    holidays are taken from the region's holiday table, so a one-week view
+    allocates one week of columns instead of a whole year. Rows match
+    `create_clusters` exactly. Cluster families depend on whole months, so
+    their rows are sliced from the memoized library when configured.
+    """
+
+    config: ClusterConfig
+    start_idx: int  # First day index (1-based)
+    end_idx: int  # Last day index (1-based)
+
+    @cached_property
+    def day_indices(self) -> NDArray:
+        """1-based day index of every column."""
+        return np.arange(self.start_idx, self.end_idx + 1)
+
+    @cached_property
+    def day_of_week(self) -> NDArray:
+        """Weekday (Monday=0) of every column."""
+        first_day = date(self.config.year, 1, 1).weekday()
+        return (self.day_indices - 1 + first_day) % 7
+
+    @cached_property
+    def weekday_table(self) -> Tuple[Tuple[str, ...], NDArray]:
+        """Names and C×7 weekday membership of the weekday clusters."""
+        return weekday_cluster_table(tuple(self.config.weekdays))
+
+    @cached_property
+    def names(self) -> List[str]:
+        """Cluster names, in the order of `create_clusters`."""
+        names = list(self.weekday_table[0])
+        names.extend(["Holidays", "Working days", "Days before Holidays", "All days"])
+        if self.config.families:
+            library = get_cluster_library(self.config)
+            names.extend(library.names[len(names) :])
+        return names
+
+    @cached_property
+    def holidays(self) -> NDArray:
+        """Holiday mask of every column and of the day after the range."""
+        year = self.config.year
+        days_in_year = (date(year + 1, 1, 1) - date(year, 1, 1)).days
+        # The day after 31 December wraps to 1 January, as in the library
+        indices = np.append(self.day_indices, self.end_idx % days_in_year + 1)
+        first_day = date(year, 1, 1).weekday()
+        sunday = (indices - 1 + first_day) % 7 == self.config.weekdays.index("Sunday")
+        holidays = _year_holiday_indices(self.config)
+        # Day indices start at 1, so the appended 0 never matches
+        positions = np.searchsorted(holidays, indices)
+        return (np.append(holidays, 0)[positions] == indices) | sunday
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Number of clusters and days of the view."""
+        return len(self.names), len(self.day_indices)
+
+    def row(self, name: str) -> NDArray:
+        """
+        Generate a single cluster row.
+
+        Args:
+            name: Cluster name.
+
+        Returns:
+            Boolean mask over the days of the view.
+
+        Raises:
+            KeyError: If the view has no cluster with that name.
+        """
+        weekday_names, table = self.weekday_table
+        holidays = self.holidays[:-1]
+        if name in weekday_names:
+            return table[weekday_names.index(name)][self.day_of_week]
+        if name == "Holidays":
+            return holidays
+        if name == "Working days":
+            return self.row("from Monday to Friday") & ~holidays
+        if name == "Days before Holidays":
+            return self.holidays[1:] & ~holidays
+        if name == "All days":
+            return np.ones(len(self.day_indices), dtype=bool)
+        if name in self.names:
+            library = get_cluster_library(self.config)
+            return library.clusters[
+                library.names.index(name), self.start_idx - 1 : self.end_idx
+            ]
+        raise KeyError(name)
+
+    def materialize(self, layout: str = "float") -> Tuple[NDArray, List[str], NDArray]:
+        """
+        Generate every cluster of the view.
+
+        Args:
+            layout: One of `LAYOUTS`.
+
+        Returns:
+            The cluster array, cluster names and day indices, as returned by
+            `create_clusters` for the same range.
+
+        Raises:
+            ValueError: If the layout is unknown.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown cluster layout: {layout}")
+
+        weekday_names, table = self.weekday_table
+        special = ("Holidays", "Working days", "Days before Holidays", "All days")
+        rows = [table[:, self.day_of_week]]
+        rows.append(np.array([self.row(name) for name in special]))
+        if self.config.families:
+            library = get_cluster_library(self.config)
+            rows.append(
+                library.clusters[len(rows[0]) + len(special) :][
+                    :, self.start_idx - 1 : self.end_idx
+                ]
+            )
+        clusters = np.vstack(rows)
+
+        if layout == "float":
+            clusters = clusters.astype(float)
+        elif layout == "packed":
+            clusters = pack_clusters(clusters)
+        return clusters, self.names.copy(), self.day_indices
+
+
+@lru_cache(maxsize=None)
+def weekday_cluster_table(
+    weekdays: Tuple[str, ...],
+) -> Tuple[Tuple[str, ...], NDArray]:
+    """
+    Describe the single and multi-day clusters by the weekdays they contain.
+
+    Args:
+        weekdays: Weekday names, Monday first.
+
+    Returns:
+        Cluster names in library order and their read-only C×7 membership.
+    """
+    names = list(weekdays)
+    rows = [np.eye(7, dtype=bool)]
+    for num_days in range(2, 7):
+        for i in range(7):
+            first_day = weekdays[i]
+            last_day = weekdays[(i + num_days - 1) % 7]
+            if num_days <= 2:
+                names.append(f"{first_day} and {last_day}")
+            else:
+                names.append(f"from {first_day} to {last_day}")
+        offsets = (np.arange(7)[:, None] + np.arange(num_days)) % 7
+        membership = np.zeros((7, 7), dtype=bool)
+        np.put_along_axis(membership, offsets, True, axis=1)
+        rows.append(membership)
+
+    table = np.vstack(rows)
+    table.flags.writeable = False
+    return tuple(names), table
+
+
+def _year_holiday_indices(config: ClusterConfig) -> NDArray:
+    """Get the sorted day-of-year indices of the region's and the extra holidays."""
+    indices = date_string_day_indices(config.year, config.holidays)
+    if config.region is None:
+        return np.unique(indices)
+    region_indices = holiday_day_indices(config.region, config.year)
+    return np.union1d(region_indices, indices)
+
+
+@lru_cache(maxsize=LIBRARY_CACHE_SIZE)
+def _load_cluster_library(
+    year: int,
+    weekdays: Tuple[str, ...],
+    holidays: Tuple[str, ...],
+    region: Optional[str],
+    families: Tuple[ClusterFamily, ...],
+) -> ClusterLibrary:
+    """Load or build a cluster library; memoized by `get_cluster_library`."""
+    config = ClusterConfig(
+        year=year,
+        weekdays=list(weekdays),
+        holidays=list(holidays),
+        region=region,
+        families=families,
+    )
+    for store in _cluster_stores:
+        library = store.find(config)
+        if library is not None:
+            return library
+    return ClusterGenerator(config).build_library()
+
+
+def get_cluster_library(config: ClusterConfig) -> ClusterLibrary:
+    """
+    Get the full-year cluster library of a configuration.
+
+    Libraries are memoized by year, weekday names, holidays and families in a
+    bounded LRU cache, so each is built once per process while it stays
+    among the `LIBRARY_CACHE_SIZE` most recently used ones. On a miss, the
+    stores added with `attach_cluster_store` are searched before building.
+
+    Args:
+        config: Cluster configuration.
+
+    Returns:
+        The shared, read-only cluster library.
+    """
+    return _load_cluster_library(
+        config.year,
+        tuple(config.weekdays),
+        tuple(config.holidays),
+        config.region,
+        tuple(config.families),
+    )
+
+
+def clear_cluster_library_cache() -> None:
+    """Drop every memoized cluster library."""
+    _load_cluster_library.cache_clear()
+
+
+def attach_cluster_store(store: "ClusterStore") -> None:
+    """
+    Load cluster libraries from a compiled file instead of building them.
+
+    Args:
+        store: Opened store, e.g. from `LibraryStore.open_cluster_store`.
+    """
+    _cluster_stores.append(store)
+
+
+def detach_cluster_stores() -> None:
+    """Stop using compiled files and drop the libraries loaded from them."""
+    _cluster_stores.clear()
+    clear_cluster_library_cache()
+
+
+def iter_range_clusters(
+    start: date, end: date, config: ClusterConfig, layout: str = "float"
+) -> Iterator[Tuple[NDArray, List[str], NDArray]]:
+    """
+    Stream the clusters of a date range, one calendar year at a time.
+
+    Day indices are proleptic Gregorian ordinals (`date.toordinal`), so
+    ranges may span several years. Each chunk comes from the library of its
+    year, with `config.holidays` resolved in that year; `config.year` is
+    ignored. Libraries are only loaded when their chunk is reached.
+
+    Args:
+        start: First day of the range.
+        end: Last day of the range.
+        config: Cluster configuration.
+        layout: One of `LAYOUTS`.
+
+    Yields:
+        The cluster array, cluster names and day ordinals of every year.
+
+    Raises:
+        ValueError: If the range or layout is invalid.
+    """
+    if end < start:
+        raise ValueError(f"Invalid range: start={start}, end={end}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown cluster layout: {layout}")
+
+    for year in range(start.year, end.year + 1):
+        library = get_cluster_library(replace(config, year=year))
+        first_day = date(year, 1, 1)
+        start_idx = (max(start, first_day) - first_day).days + 1
+        end_idx = (min(end, date(year, 12, 31)) - first_day).days + 1
+
+        clusters, names, day_indices = library.slice(start_idx, end_idx, layout)
+        if end_idx == len(library.day_indices):
+            new_year = _is_holiday(replace(config, year=year + 1), 1)
+            clusters = _link_following_year(library, new_year, start_idx, layout)
+        yield clusters, names, day_indices + (first_day.toordinal() - 1)
+
+
+def create_range_clusters(
+    start: date, end: date, config: ClusterConfig, layout: str = "float"
+) -> Tuple[NDArray, List[str], NDArray]:
+    """
+    Create the clusters of a date range that may span several years.
+
+    The whole range is held in one array, so memory grows linearly with the
+    number of years; `iter_range_clusters` keeps a single year at a time.
+
+    Args:
+        start: First day of the range.
+        end: Last day of the range.
+        config: Cluster configuration; holidays are resolved in every year.
+        layout: One of `LAYOUTS`.
+
+    Returns:
+        The cluster array, cluster names and day ordinals of the range.
+
+    Raises:
+        ValueError: If the range or layout is invalid.
+    """
+    chunk_layout = "bool" if layout == "packed" else layout
+    chunks = list(iter_range_clusters(start, end, config, chunk_layout))
+    if len(chunks) == 1:
+        clusters, names, day_indices = chunks[0]
+    else:
+        clusters = np.concatenate([chunk[0] for chunk in chunks], axis=1)
+        names = chunks[0][1]
+        day_indices = np.concatenate([chunk[2] for chunk in chunks])
+
+    if layout == "packed":
+        clusters = pack_clusters(clusters)
+    return clusters, names, day_indices
+
+
+def _is_holiday(config: ClusterConfig, day_idx: int) -> bool:
+    """Whether a day (1-based index in `config.year`) is a holiday or a Sunday."""
+    day = date(config.year, 1, 1) + timedelta(days=day_idx - 1)
+    if day.weekday() == config.weekdays.index("Sunday"):
+        return True
+    return day_idx in _year_holiday_indices(config)
+
+
+def _link_following_year(
+    library: ClusterLibrary,
+    new_year: bool,
+    start_idx: int,
+    layout: str,
+) -> NDArray:
+    """
+    Resolve "Days before Holidays" on 31 December from the following year.
+
+    A single-year library wraps around to its own 1 January instead, which
+    only differs when 1 January is not a holiday in both years.
+
+    Args:
+        library: Library of the year ending the chunk.
+        new_year: Whether 1 January of the following year is a holiday.
+        start_idx: First day index (1-based) of the chunk.
+        layout: One of `LAYOUTS`.
+
+    Returns:
+        The chunk's clusters from `start_idx` to the end of the year.
+    """
+    end_idx = len(library.day_indices)
+    holidays_row = library.names.index("Holidays")
+    before_row = library.names.index("Days before Holidays")
+    day_before = new_year and not library.clusters[holidays_row, -1]
+    if library.clusters[before_row, -1] == day_before:
+        return library.slice(start_idx, end_idx, layout)[0]
+
+    clusters = library.clusters[:, start_idx - 1 : end_idx].copy()
+    clusters[before_row, -1] = day_before
+    if layout == "float":
+        return clusters.astype(float)
+    if layout == "packed":
+        return pack_clusters(clusters)
+    return clusters
+
+
+def pack_clusters(clusters: NDArray) -> NDArray:
+    """
+    Pack 0/1 cluster rows into bits, 8 days per byte.
+
+    Args:
+        clusters: Cluster matrix or single row, any numeric or bool dtype.
+
+    Returns:
+        uint8 array with the last axis packed by `np.packbits`; trailing bits
+        of the last byte are zero.
+    """
+    return np.packbits(np.asarray(clusters) != 0, axis=-1)
+
+
+def unpack_clusters(packed: NDArray, num_days: int) -> NDArray:
+    """
+    Unpack packed cluster rows back to bool.
+
+    Args:
+        packed: Output of `pack_clusters`.
+        num_days: Number of days of the unpacked rows.
+
+    Returns:
+        Boolean array with `num_days` columns.
+    """
+    return np.unpackbits(packed, axis=-1, count=num_days).astype(bool)
+
+
+def popcount(packed: NDArray) -> NDArray:
+    """
+    Count the days of packed cluster rows.
+
+    Args:
+        packed: Output of `pack_clusters`.
+
+    Returns:
+        Number of set bits along the last axis.
+    """
+    return np.bitwise_count(packed).sum(axis=-1, dtype=np.int64)
+
+
+def intersection_counts(packed: NDArray, other: NDArray) -> NDArray:
+    """
+    Count the days shared by packed cluster rows.
+
+    Args:
+        packed: C×B packed cluster rows.
+        other: One packed row of B bytes, or an S×B matrix of packed rows.
+
+    Returns:
+        Shared days per cluster for a single row, otherwise the C×S matrix of
+        shared days of every pair.
+    """
+    if other.ndim == 1:
+        return popcount(packed & other)
+    return popcount(packed[:, None, :] & other[None, :, :])
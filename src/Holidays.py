@@ -0,0 +1,260 @@
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Years covered by the precomputed holiday tables (Gregorian calendar)
+FIRST_YEAR = 1583
+LAST_YEAR = 2499
+
+# datetime64 day whose `date.toordinal()` is 1
+_ORDINAL_EPOCH = np.datetime64("0001-01-01", "D")
+
+
+@dataclass(frozen=True)
+class Years:
+    """Years in which a holiday is observed; open-ended when a bound is None."""
+
+    first: Optional[int] = None
+    last: Optional[int] = None
+
+    def contains(self, years: NDArray) -> NDArray:
+        """Mask of the years inside the range."""
+        inside = np.ones(np.shape(years), dtype=bool)
+        if self.first is not None:
+            inside &= years >= self.first
+        if self.last is not None:
+            inside &= years <= self.last
+        return inside
+
+
+ALWAYS = Years()
+
+FixedHoliday = Union[Tuple[int, int], Tuple[int, int, Years]]
+EasterHoliday = Union[int, Tuple[int, Years]]
+
+
+@dataclass(frozen=True)
+class HolidayCalendar:
+    """
+    Public holidays of a region, as fixed dates and offsets from Easter.
+
+    Either kind of holiday may be followed by the `Years` it is observed in,
+    for holidays introduced or abolished by law.
+    """
+
+    fixed: Tuple[FixedHoliday, ...]  # (day, month[, years]) of fixed dates
+    easter_offsets: Tuple[EasterHoliday, ...] = ()  # Days after Easter Sunday
+
+    def key(self) -> Tuple[object, ...]:
+        """Identify the calendar for fingerprints, stable across processes."""
+        fixed = tuple(
+            (day, month, span.first, span.last)
+            for day, month, span in self.fixed_dates()
+        )
+        easter = tuple(
+            (offset, span.first, span.last) for offset, span in self.easter_dates()
+        )
+        return fixed, easter
+
+    def fixed_dates(self) -> Tuple[Tuple[int, int, Years], ...]:
+        """Fixed-date holidays as (day, month, years)."""
+        return tuple(
+            (*entry[:2], entry[2] if len(entry) > 2 else ALWAYS) for entry in self.fixed
+        )
+
+    def easter_dates(self) -> Tuple[Tuple[int, Years], ...]:
+        """Easter holidays as (offset, years)."""
+        return tuple(
+            (entry, ALWAYS) if isinstance(entry, int) else entry
+            for entry in self.easter_offsets
+        )
+
+
+REGIONS: Dict[str, HolidayCalendar] = {
+    "PL": HolidayCalendar(
+        fixed=(
+            (1, 1),  # New Year's Day
+            (6, 1, Years(first=2011)),  # Epiphany
+            (1, 5),  # Labour Day
+            (3, 5),  # Constitution Day
+            (15, 8),  # Assumption
+            (1, 11),  # All Saints' Day
+            (11, 11),  # Independence Day
+            (24, 12, Years(first=2025)),  # Christmas Eve
+            (25, 12),  # Christmas Day
+            (26, 12),  # Second Day of Christmas
+        ),
+        easter_offsets=(
+            0,  # Easter Sunday
+            1,  # Easter Monday
+            49,  # Pentecost Sunday
+            60,  # Corpus Christi
+        ),
+    ),
+}
+
+
+def day_month_ordinals(years: NDArray, days: NDArray, months: NDArray) -> NDArray:
+    """
+    Convert day, month and year arrays to `date.toordinal` values.
+
+    Arguments are broadcast against each other.
+
+    Args:
+        years: Gregorian years.
+        days: Days of the month (1-based).
+        months: Months (1-based).
+
+    Returns:
+        Ordinal of every date.
+
+    Raises:
+        ValueError: If a day does not exist in its month.
+    """
+    years, days, months = np.broadcast_arrays(
+        np.asarray(years), np.asarray(days), np.asarray(months)
+    )
+    if np.any((months < 1) | (months > 12)):
+        raise ValueError("Months must be between 1 and 12.")
+
+    month_starts = (years - 1970).astype("datetime64[Y]").astype("datetime64[M]")
+    month_starts = month_starts + (months - 1)
+    first_days = month_starts.astype("datetime64[D]")
+    lengths = ((month_starts + 1).astype("datetime64[D]") - first_days).astype(int)
+    if np.any((days < 1) | (days > lengths)):
+        raise ValueError("Day does not exist in its month.")
+
+    return (first_days + (days - 1) - _ORDINAL_EPOCH).astype(np.int64) + 1
+
+
+def easter_sundays(years: NDArray) -> NDArray:
+    """
+    Compute the Gregorian Easter Sunday of every year.
+
+    Uses the anonymous Gregorian (Meeus/Jones/Butcher) algorithm on whole
+    arrays of years.
+
+    Args:
+        years: Gregorian years.
+
+    Returns:
+        Ordinal of Easter Sunday in every year.
+    """
+    years = np.asarray(years, dtype=np.int64)
+    a = years % 19
+    b, c = np.divmod(years, 100)
+    d, e = np.divmod(b, 4)
+    g = (b - (b + 8) // 25 + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = np.divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = np.divmod(h + l - 7 * m + 114, 31)
+    return day_month_ordinals(years, day + 1, month)
+
+
+def holiday_ordinals(calendar: HolidayCalendar, years: NDArray) -> NDArray:
+    """
+    Compute the holidays of a calendar over a set of years.
+
+    Args:
+        calendar: Holiday calendar.
+        years: Gregorian years.
+
+    Returns:
+        Sorted, unique ordinals of every holiday.
+    """
+    years = np.asarray(years, dtype=np.int64)
+    parts = []
+    if calendar.fixed:
+        days, months, spans = zip(*calendar.fixed_dates())
+        ordinals = day_month_ordinals(years[:, None], np.array(days), np.array(months))
+        observed = np.stack([span.contains(years) for span in spans], axis=1)
+        parts.append(ordinals[observed])
+    if calendar.easter_offsets:
+        offsets, spans = zip(*calendar.easter_dates())
+        ordinals = easter_sundays(years)[:, None] + np.array(offsets)
+        observed = np.stack([span.contains(years) for span in spans], axis=1)
+        parts.append(ordinals[observed])
+    if not parts:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(parts))
+
+
+@lru_cache(maxsize=None)
+def get_holiday_table(region: str) -> NDArray:
+    """
+    Get the precomputed holiday ordinals of a region.
+
+    The table covers `FIRST_YEAR` to `LAST_YEAR` and is built once per
+    region on first use.
+
+    Args:
+        region: Key of `REGIONS`.
+
+    Returns:
+        Read-only sorted array of holiday ordinals.
+
+    Raises:
+        ValueError: If the region is unknown.
+    """
+    if region not in REGIONS:
+        raise ValueError(f"Unknown holiday region: {region}")
+    table = holiday_ordinals(REGIONS[region], np.arange(FIRST_YEAR, LAST_YEAR + 1))
+    table.flags.writeable = False
+    return table
+
+
+def holiday_day_indices(region: str, year: int) -> NDArray:
+    """
+    Get the holidays of a region in one year as day-of-year indices.
+
+    Args:
+        region: Key of `REGIONS`.
+        year: Year between `FIRST_YEAR` and `LAST_YEAR`.
+
+    Returns:
+        Sorted 1-based day-of-year indices.
+
+    Raises:
+        ValueError: If the region is unknown or the year outside the table.
+    """
+    if not FIRST_YEAR <= year <= LAST_YEAR:
+        raise ValueError(f"Year must be between {FIRST_YEAR} and {LAST_YEAR}.")
+
+    table = get_holiday_table(region)
+    first = date(year, 1, 1).toordinal()
+    following = date(year + 1, 1, 1).toordinal()
+    start, end = np.searchsorted(table, [first, following])
+    return table[start:end] - first + 1
+
+
+def date_string_day_indices(year: int, date_strings: Sequence[str]) -> NDArray:
+    """
+    Convert DD/MM date strings to day-of-year indices of one year.
+
+    Args:
+        year: Gregorian year.
+        date_strings: Dates formatted as DD/MM.
+
+    Returns:
+        1-based day-of-year index of every date.
+
+    Raises:
+        ValueError: If a string is malformed or the date does not exist.
+    """
+    if not date_strings:
+        return np.empty(0, dtype=np.int64)
+    try:
+        days, months = np.array(
+            [[int(part) for part in text.split("/")] for text in date_strings]
+        ).T
+    except ValueError as error:
+        raise ValueError(f"Dates must be formatted as DD/MM: {date_strings}") from error
+
+    first = date(year, 1, 1).toordinal()
+    return day_month_ordinals(year, days, months) - first + 1
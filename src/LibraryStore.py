@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.CreateClusters import (
+    ClusterConfig,
+    ClusterLibrary,
+    get_cluster_library,
+    pack_clusters,
+    unpack_clusters,
+)
+from src.Holidays import REGIONS
+
+# Bumped whenever the file layout or the generated clusters change
+LIBRARY_FORMAT_VERSION = 2
+
+# First bytes of every library file, followed by the header length
+MAGIC = b"CLUSTLIB"
+
+# Alignment of the header end and of every year's packed matrix, in bytes
+ALIGNMENT = 64
+
+
+def library_fingerprint(config: ClusterConfig, years: Sequence[int]) -> str:
+    """
+    Compute the fingerprint of the cluster libraries of a range of years.
+
+    The fingerprint covers the format version, the weekday names, the extra
+    holidays, the definition of the region's holiday calendar and the members
+    of every cluster family, all through their `key()` tuples, so editing a
+    region's calendar also invalidates stored files. Holiday dates are not resolved, which keeps opening a file
+    cheaper than building the libraries. `config.year` is ignored.
+
+    Args:
+        config: Cluster configuration.
+        years: Years stored together.
+
+    Returns:
+        Hex digest identifying the libraries.
+    """
+    key = hashlib.blake2b(digest_size=20)
+    key.update(f"{LIBRARY_FORMAT_VERSION}|{list(years)}|".encode())
+    key.update(json.dumps([config.weekdays, config.holidays, config.region]).encode())
+    calendar = REGIONS.get(config.region)
+    key.update(json.dumps(calendar.key() if calendar else None).encode())
+    for family in config.families:
+        members = [(name, condition.key()) for name, condition in family.members()]
+        key.update(json.dumps(members).encode())
+    return key.hexdigest()
+
+
+def compile_cluster_store(
+    path: str, config: ClusterConfig, years: Sequence[int]
+) -> None:
+    """
+    Write the cluster libraries of a range of years to a binary file.
+
+    The file starts with `MAGIC`, the header length and a JSON header with
+    the format version, fingerprint, cluster names and the offset of every
+    year, followed by each year's `pack_clusters` matrix. The file is written
+    next to its destination and moved into place, so readers never see a
+    partial file.
+
+    Args:
+        path: Destination file.
+        config: Cluster configuration; `config.year` is ignored.
+        years: Years to compile.
+
+    Raises:
+        ValueError: If no years are given.
+    """
+    years = sorted(set(years))
+    if not years:
+        raise ValueError("At least one year must be compiled.")
+
+    matrices: List[NDArray] = []
+    entries: Dict[str, Dict[str, int]] = {}
+    offset = 0
+    for year in years:
+        library = get_cluster_library(replace(config, year=year))
+        matrices.append(pack_clusters(library.clusters))
+        entries[str(year)] = {"offset": offset, "days": len(library.day_indices)}
+        offset += _aligned(matrices[-1].nbytes)
+
+    header = json.dumps(
+        {
+            "version": LIBRARY_FORMAT_VERSION,
+            "fingerprint": library_fingerprint(config, years),
+            "names": list(library.names),
+            "years": entries,
+        }
+    ).encode()
+    header += b" " * (
+        _aligned(len(MAGIC) + 8 + len(header)) - len(MAGIC) - 8 - len(header)
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(MAGIC)
+            file.write(len(header).to_bytes(8, "little"))
+            file.write(header)
+            for matrix in matrices:
+                file.write(matrix.tobytes())
+                file.write(b"\0" * (_aligned(matrix.nbytes) - matrix.nbytes))
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class ClusterStore:
+    """
+    Cluster libraries of several years, memory-mapped from a compiled file.
+
+    The packed matrices are mapped read-only with `np.memmap`, so processes
+    opening the same file share its pages. Libraries are unpacked on request.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a compiled library file.
+
+        Args:
+            path: File written by `compile_cluster_store`.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is malformed or of another format version.
+        """
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a cluster library file: {path}")
+            length = int.from_bytes(file.read(8), "little")
+            try:
+                header = json.loads(file.read(length))
+            except ValueError:
+                raise ValueError(f"Corrupted cluster library header: {path}")
+        if header.get("version") != LIBRARY_FORMAT_VERSION:
+            raise ValueError(
+                f"Cluster library format {header.get('version')} is not "
+                f"{LIBRARY_FORMAT_VERSION}: {path}"
+            )
+
+        self.path = path
+        self.fingerprint: str = header["fingerprint"]
+        self.names = tuple(header["names"])
+        self.years = sorted(int(year) for year in header["years"])
+        self._entries = {int(year): entry for year, entry in header["years"].items()}
+        self._matches: Dict[Tuple[object, ...], bool] = {}
+
+        data_offset = len(MAGIC) + 8 + length
+        self._data = np.memmap(path, dtype=np.uint8, mode="r", offset=data_offset)
+        last = self._entries[self.years[-1]]
+        row_bytes = (last["days"] + 7) // 8
+        if len(self._data) < last["offset"] + len(self.names) * row_bytes:
+            raise ValueError(f"Truncated cluster library file: {path}")
+
+    def packed(self, year: int) -> NDArray:
+        """
+        Get the packed cluster matrix of a year.
+
+        Args:
+            year: Stored year.
+
+        Returns:
+            Read-only C×B view of the mapped file.
+
+        Raises:
+            KeyError: If the year is not stored.
+        """
+        entry = self._entries[year]
+        row_bytes = (entry["days"] + 7) // 8
+        size = len(self.names) * row_bytes
+        data = self._data[entry["offset"] : entry["offset"] + size]
+        return data.reshape(len(self.names), row_bytes)
+
+    def library(self, year: int) -> ClusterLibrary:
+        """
+        Unpack the cluster library of a year.
+
+        Args:
+            year: Stored year.
+
+        Returns:
+            Read-only library equal to the one built by `ClusterGenerator`.
+
+        Raises:
+            KeyError: If the year is not stored.
+        """
+        days = self._entries[year]["days"]
+        clusters = unpack_clusters(self.packed(year), days)
+        day_indices = np.arange(1, days + 1)
+        clusters.flags.writeable = False
+        day_indices.flags.writeable = False
+        return ClusterLibrary(clusters, self.names, day_indices)
+
+    def matches(self, config: ClusterConfig) -> bool:
+        """Whether the stored libraries were compiled from this configuration."""
+        key = (
+            tuple(config.weekdays),
+            tuple(config.holidays),
+            config.region,
+            tuple(config.families),
+        )
+        if key not in self._matches:
+            fingerprint = library_fingerprint(config, self.years)
+            self._matches[key] = fingerprint == self.fingerprint
+        return self._matches[key]
+
+    def find(self, config: ClusterConfig) -> Optional[ClusterLibrary]:
+        """
+        Get the library of a configuration if this file stores it.
+
+        Args:
+            config: Cluster configuration, including the year.
+
+        Returns:
+            The library, or None if the year or configuration differs.
+        """
+        if config.year not in self._entries or not self.matches(config):
+            return None
+        return self.library(config.year)
+
+
+def open_cluster_store(
+    path: str, config: ClusterConfig, years: Sequence[int]
+) -> ClusterStore:
+    """
+    Open a compiled library file, compiling it first if missing or stale.
+
+    A file is stale when it is malformed, of another format version, lacks
+    one of the years, or its fingerprint differs from the configuration.
+
+    Args:
+        path: Library file.
+        config: Cluster configuration; `config.year` is ignored.
+        years: Years the file must store.
+
+    Returns:
+        The opened store.
+    """
+    years = sorted(set(years))
+    try:
+        store = ClusterStore(path)
+        if set(years) <= set(store.years) and store.matches(config):
+            return store
+    except (OSError, ValueError, KeyError):
+        pass  # Missing or malformed, rebuilt below
+
+    compile_cluster_store(path, config, years)
+    return ClusterStore(path)
+
+
+def _aligned(size: int) -> int:
+    """Round a size up to a multiple of `ALIGNMENT`."""
+    return -(-size // ALIGNMENT) * ALIGNMENT
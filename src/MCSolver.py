@@ -1,6 +1,15 @@
-from typing import List, Set, Optional
+import heapq
+import threading
+import time
+from collections import Counter
+from fractions import Fraction
+from typing import Callable, Dict, Hashable, Iterator, List, Set, Optional, Tuple
 from dataclasses import dataclass
 
+ENGINES = ("set", "bitset")
+SELECTIONS = ("scan", "lazy", "inverted")
+MODES = ("greedy", "exact")
+
 
 @dataclass
 class SolverConfig:
@@ -9,6 +18,46 @@ class SolverConfig:
     missing_weight: float = 1.0  # Weight for elements missing from parent
     extra_weight: float = 1.0  # Weight for extra elements not in parent
     max_iterations: int = 1000  # Maximum iterations to prevent infinite loops
+    engine: str = "set"  # "set" for Python sets, "bitset" for packed int bitmasks
+    selection: str = "scan"  # "scan" rescores every candidate, "lazy" uses a heap,
+    # "inverted" keeps overlap counters updated through an element index
+    mode: str = "greedy"  # "greedy" heuristic or "exact" branch-and-bound search
+    set_weight: float = 1.0  # Weight for each selected set in the exact objective
+    time_budget: float = 1.0  # Wall-clock seconds available to the exact search
+    repair_tolerance: float = 0.25  # Allowed relative cost drift of local repairs
+    timeout: Optional[float] = None  # Wall-clock seconds per solve, None for no limit
+    segment_weight: float = 2.0  # Cost of each timetable period of a segmented cover
+    min_segment_days: int = 7  # Shortest timetable period of a segmented cover
+
+
+@dataclass
+class SolverStats:
+    """Measurements of a single `SetCoverSolver.solve` call."""
+
+    validation_time: float = 0.0  # Seconds spent validating the inputs
+    greedy_time: float = 0.0  # Seconds spent selecting greedy candidates
+    optimize_time: float = 0.0  # Seconds spent removing redundant sets
+    exact_time: float = 0.0  # Seconds spent in the exact search
+    cost_evaluations: int = 0  # Candidate costs computed
+    iterations: int = 0  # Greedy selection rounds
+    candidates_considered: int = 0  # Candidates examined while selecting
+    exact_nodes: int = 0  # Branch-and-bound nodes visited
+
+
+class CancellationToken:
+    """Thread-safe flag that asks a running solve to stop early."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation of every solve using this token."""
+        self._event.set()
 
 
 class SetCoverSolver:
@@ -17,20 +66,70 @@ class SetCoverSolver:
     Utilizes a greedy approach with cost-based optimization and set merging.
     """
 
-    def __init__(self, config: Optional[SolverConfig] = None):
+    def __init__(
+        self,
+        config: Optional[SolverConfig] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        stats_callback: Optional[Callable[[SolverStats], None]] = None,
+        index: Optional["InvertedIndex"] = None,
+    ):
         """
         Initialize the SetCoverSolver with an optional configuration.
 
+        Instrumentation is enabled by passing `stats_callback`; it then receives
+        the `SolverStats` of every successful solve, which are also kept in
+        `stats`. Without a callback nothing is measured.
+
         Args:
             config (Optional[SolverConfig]): Configuration settings for the solver.
+            cancel_token (Optional[CancellationToken]): Token that stops a solve early.
+            stats_callback (Optional[Callable[[SolverStats], None]]): Receives the
+                measurements after every solve.
+            index (Optional[InvertedIndex]): Index of the candidate list, shared
+                by solvers over the same list, e.g. a cluster library.
         """
         self.config = config or SolverConfig()
+        self.cancel_token = cancel_token
+        self.stats_callback = stats_callback
+        self.stats: Optional[SolverStats] = None
         self.original_parent: Optional[Set[int]] = None
+        self.proven_optimal: Optional[bool] = None
+        self.partial: bool = False
+        self._deadline: Optional[float] = None
+        self._index = index
+
+        # Bitmasks of the candidates, kept for the `sets` list they encode
+        self._encoded: Optional[List[Set[int]]] = None
+        self._positions: Dict[Hashable, int] = {}
+        self._masks: List[int] = []
+
+        if self.config.engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine '{self.config.engine}', expected one of {ENGINES}."
+            )
+        if self.config.selection not in SELECTIONS:
+            raise ValueError(
+                f"Unknown selection '{self.config.selection}', "
+                f"expected one of {SELECTIONS}."
+            )
+        if self.config.mode not in MODES:
+            raise ValueError(
+                f"Unknown mode '{self.config.mode}', expected one of {MODES}."
+            )
 
     def solve(self, parent: Set[int], sets: List[Set[int]]) -> List[Set[int]]:
         """
         Solve the set cover problem to find minimal sets covering the parent set.
 
+        In exact mode the greedy cover is improved by a branch-and-bound search
+        and `proven_optimal` tells whether the search finished within budget.
+
+        When `SolverConfig.timeout` expires or the cancellation token is
+        tripped, the best feasible cover found so far is returned and
+        `partial` is set: an unfinished greedy pass is completed with the
+        first candidates covering the remaining elements, and the redundancy
+        and exact phases stop where they are.
+
         Args:
             parent (Set[int]): The set that needs to be covered.
             sets (List[Set[int]]): List of available sets to use for covering.
@@ -42,21 +141,86 @@ class SetCoverSolver:
             ValueError: If inputs are invalid.
             RuntimeError: If a solution cannot be found within the maximum iterations.
         """
+        stats = SolverStats() if self.stats_callback is not None else None
+        self.stats = stats
+        if stats is not None:
+            start = time.perf_counter()
+
         self._validate_inputs(parent, sets)
 
         # Initialize variables
         self.original_parent = parent.copy()
+        self.proven_optimal = None
+        self.partial = False
+        self._deadline = None
+        if self.config.timeout is not None:
+            self._deadline = time.perf_counter() + self.config.timeout
+
+        if stats is not None:
+            now = time.perf_counter()
+            stats.validation_time = now - start
+            start = now
+
+        results = self._solve_greedy(parent, sets)
+
+        if stats is not None:
+            now = time.perf_counter()
+            stats.greedy_time = now - start - stats.optimize_time
+            start = now
+
+        if self.config.mode == "exact" and not self.partial:
+            results = self._solve_exact(parent, sets, results)
+
+        if stats is not None:
+            stats.exact_time = time.perf_counter() - start
+            self.stats_callback(stats)
+        return results
+
+    def _solve_greedy(self, parent: Set[int], sets: List[Set[int]]) -> List[Set[int]]:
+        """
+        Run the greedy heuristic with the configured engine and selection.
+
+        Args:
+            parent (Set[int]): The set that needs to be covered.
+            sets (List[Set[int]]): List of available sets to use for covering.
+
+        Returns:
+            List[Set[int]]: List of sets covering the parent set.
+
+        Raises:
+            RuntimeError: If a solution cannot be found within the maximum iterations.
+        """
+        if self.config.selection == "inverted":
+            return self._solve_inverted(parent, sets)
+        if self.config.engine == "bitset" or self.config.selection == "lazy":
+            return self._solve_indexed(parent, sets)
+
         results: List[Set[int]] = []
         union_result: Set[int] = set()
         available_sets: List[Set[int]] = sets.copy()
         remaining_parent: Set[int] = parent.copy()
         iteration: int = 0
+        stats = self.stats
 
         while not self.original_parent.issubset(union_result):
             if iteration >= self.config.max_iterations:
                 raise RuntimeError("Failed to find solution within iteration limit.")
 
+            if self._interrupted():
+                # Complete the cover with the first useful candidates
+                self.partial = True
+                for candidate_set in available_sets:
+                    if remaining_parent & candidate_set:
+                        results.append(candidate_set)
+                        union_result |= candidate_set
+                        remaining_parent -= candidate_set
+                break
+
             best_set = self._select_best_set(remaining_parent, available_sets)
+            if stats is not None:
+                stats.iterations += 1
+                stats.cost_evaluations += len(available_sets)
+                stats.candidates_considered += len(available_sets)
 
             if best_set is None:
                 break  # No suitable set found; exit loop.
@@ -71,8 +235,428 @@ class SetCoverSolver:
         if not self.original_parent.issubset(union_result):
             raise RuntimeError("Unable to find solution: incomplete coverage.")
 
+        if self.partial:
+            return results
         return self._optimize_solution(results)
 
+    def _solve_indexed(self, parent: Set[int], sets: List[Set[int]]) -> List[Set[int]]:
+        """
+        Run the greedy search over candidate indices.
+
+        Used by the bitset engine, where every element is mapped to a bit
+        position and the cost of a candidate becomes an ANDNOT followed by a
+        popcount, and by lazy selection. Tracking candidates by index keeps the
+        tie-breaking of the set engine and lets the original set objects be
+        returned. Candidate bitmasks are encoded once per `sets` list by
+        `_encode_sets`.
+
+        Args:
+            parent (Set[int]): The set that needs to be covered.
+            sets (List[Set[int]]): List of available sets to use for covering.
+
+        Returns:
+            List[Set[int]]: List of sets that optimally cover the parent set.
+
+        Raises:
+            RuntimeError: If a solution cannot be found within the maximum iterations.
+        """
+        bitset = self.config.engine == "bitset"
+        if bitset:
+            self._encode_sets(sets)
+            parent_mask = self._encode_parent(parent)
+            masks = self._masks
+            remaining = parent_mask
+            # The extra elements of a candidate never change during the search
+            extra_counts = [(mask & ~parent_mask).bit_count() for mask in masks]
+        else:
+            remaining = parent.copy()
+            extra_counts = [len(candidate_set - parent) for candidate_set in sets]
+
+        missing_weight = self.config.missing_weight
+        extra_weight = self.config.extra_weight
+
+        def lazy_key(index: int) -> float:
+            # Cost minus the constant missing_weight * len(remaining) term
+            if bitset:
+                overlap = (remaining & masks[index]).bit_count()
+            else:
+                overlap = len(remaining & sets[index])
+            return extra_weight * extra_counts[index] - missing_weight * overlap
+
+        def scan_cost(index: int) -> float:
+            # Same expression as the scan, used to settle near-ties of the key
+            if bitset:
+                missing = (remaining & ~masks[index]).bit_count()
+            else:
+                missing = len(remaining - sets[index])
+            return missing_weight * missing + extra_weight * extra_counts[index]
+
+        stats = self.stats
+
+        def counted_key(index: int) -> float:
+            stats.cost_evaluations += 1
+            return lazy_key(index)
+
+        key_fn = counted_key if stats is not None else lazy_key
+
+        if self.config.selection == "lazy":
+            queue = LazyCandidateQueue(
+                [key_fn(i) for i in range(len(sets))],
+                self._tie_tolerance(len(parent), extra_counts),
+            )
+        else:
+            available: List[int] = list(range(len(sets)))
+
+        results: List[int] = []
+        iteration = 0
+
+        while remaining:
+            if iteration >= self.config.max_iterations:
+                raise RuntimeError("Failed to find solution within iteration limit.")
+
+            if self._interrupted():
+                # Complete the cover with the first useful candidates
+                self.partial = True
+                chosen = set(results)
+                for index in range(len(sets)):
+                    if index in chosen:
+                        continue
+                    if bitset and remaining & masks[index]:
+                        results.append(index)
+                        remaining &= ~masks[index]
+                    elif not bitset and remaining & sets[index]:
+                        results.append(index)
+                        remaining -= sets[index]
+                break
+
+            if self.config.selection == "lazy":
+                evaluated = stats.cost_evaluations if stats is not None else 0
+                best_index = queue.pop_best(key_fn, scan_cost)
+                if stats is not None:
+                    stats.candidates_considered += stats.cost_evaluations - evaluated
+            else:
+                best_index = self._select_best_mask(
+                    remaining, masks, extra_counts, available
+                )
+                if stats is not None:
+                    stats.cost_evaluations += len(available)
+                    stats.candidates_considered += len(available)
+            if stats is not None:
+                stats.iterations += 1
+
+            if best_index is None:
+                break  # No suitable set found; exit loop.
+
+            results.append(best_index)
+            if bitset:
+                remaining &= ~masks[best_index]
+            else:
+                remaining -= sets[best_index]
+            if self.config.selection != "lazy":
+                available.remove(best_index)
+            iteration += 1
+
+        if remaining:
+            raise RuntimeError("Unable to find solution: incomplete coverage.")
+
+        if self.partial:
+            return [sets[index] for index in results]
+        if not bitset:
+            return self._optimize_solution([sets[index] for index in results])
+
+        optimized = self._optimize_bitset_solution(parent_mask, masks, results)
+        return [sets[index] for index in optimized]
+
+    def _encode_sets(self, sets: List[Set[int]]) -> None:
+        """
+        Encode the candidates as bitmasks in `_masks`, once per `sets` list.
+
+        Elements get bit positions in order of first appearance among the
+        candidates. As with the inverted index, the masks are reused while the
+        same `sets` list is passed, which must not be modified in between.
+
+        Args:
+            sets (List[Set[int]]): List of available sets to use for covering.
+        """
+        if sets is self._encoded:
+            return
+        self._positions = {}
+        for candidate_set in sets:
+            for element in candidate_set:
+                self._positions.setdefault(element, len(self._positions))
+        _, self._masks = encode_bitsets(set(), sets, list(self._positions))
+        self._encoded = sets
+
+    def _encode_parent(self, parent: Set[int]) -> int:
+        """
+        Encode a parent set over the bit positions of `_encode_sets`.
+
+        Elements outside every candidate get bits after the candidates' ones,
+        so they stay uncovered.
+
+        Args:
+            parent (Set[int]): The set that needs to be covered.
+
+        Returns:
+            int: The parent bitmask.
+        """
+        bits = [self._positions.get(element, -1) for element in parent]
+        next_bit = len(self._positions)
+        buffer = bytearray((next_bit + bits.count(-1) + 7) // 8)
+        for bit in bits:
+            if bit < 0:
+                bit, next_bit = next_bit, next_bit + 1
+            buffer[bit >> 3] |= 1 << (bit & 7)
+        return int.from_bytes(buffer, "little")
+
+    def _solve_inverted(self, parent: Set[int], sets: List[Set[int]]) -> List[Set[int]]:
+        """
+        Run the greedy search with overlap counters kept by an inverted index.
+
+        Every candidate holds the number of remaining parent elements it
+        contains. When a candidate is selected, only the candidates listed
+        under its newly covered elements are decremented, so the work per
+        round is proportional to the overlap instead of the number of
+        candidates. Counters only decrease, so the keys are served by a
+        `LazyCandidateQueue` and the cover matches the scan selection.
+
+        The index given to the constructor, or else built on the first solve,
+        is reused while the same `sets` list is passed, which must not be
+        modified in between.
+
+        Args:
+            parent (Set[int]): The set that needs to be covered.
+            sets (List[Set[int]]): List of available sets to use for covering.
+
+        Returns:
+            List[Set[int]]: List of sets that optimally cover the parent set.
+
+        Raises:
+            RuntimeError: If a solution cannot be found within the maximum iterations.
+        """
+        if self._index is None or self._index.sets is not sets:
+            self._index = InvertedIndex(sets)
+        index = self._index
+
+        overlaps = index.overlap_counts(parent)
+        extra_counts = [size - overlap for size, overlap in zip(index.sizes, overlaps)]
+        missing_weight = self.config.missing_weight
+        extra_weight = self.config.extra_weight
+
+        stats = self.stats
+
+        def key_fn(candidate: int) -> float:
+            # Cost minus the constant missing_weight * len(remaining) term
+            if stats is not None:
+                stats.cost_evaluations += 1
+            return (
+                extra_weight * extra_counts[candidate]
+                - missing_weight * overlaps[candidate]
+            )
+
+        def scan_cost(candidate: int) -> float:
+            # Same expression as the scan, used to settle near-ties of the key
+            missing = len(remaining) - overlaps[candidate]
+            return missing_weight * missing + extra_weight * extra_counts[candidate]
+
+        queue = LazyCandidateQueue(
+            [key_fn(i) for i in range(len(sets))],
+            self._tie_tolerance(len(parent), extra_counts),
+        )
+        remaining = parent.copy()
+        results: List[int] = []
+        iteration = 0
+
+        while remaining:
+            if iteration >= self.config.max_iterations:
+                raise RuntimeError("Failed to find solution within iteration limit.")
+
+            if self._interrupted():
+                # Complete the cover with the first useful candidates
+                self.partial = True
+                chosen = set(results)
+                for candidate in range(len(sets)):
+                    if candidate not in chosen and overlaps[candidate]:
+                        results.append(candidate)
+                        covered = remaining & sets[candidate]
+                        remaining -= covered
+                        index.discount(covered, overlaps)
+                break
+
+            evaluated = stats.cost_evaluations if stats is not None else 0
+            best_index = queue.pop_best(key_fn, scan_cost)
+            if stats is not None:
+                stats.candidates_considered += stats.cost_evaluations - evaluated
+                stats.iterations += 1
+
+            if best_index is None:
+                break  # No suitable set found; exit loop.
+
+            results.append(best_index)
+            covered = remaining & sets[best_index]
+            remaining -= covered
+            index.discount(covered, overlaps)
+            iteration += 1
+
+        if remaining:
+            raise RuntimeError("Unable to find solution: incomplete coverage.")
+
+        if self.partial:
+            return [sets[candidate] for candidate in results]
+        return self._optimize_solution([sets[candidate] for candidate in results])
+
+    def _solve_exact(
+        self, parent: Set[int], sets: List[Set[int]], greedy: List[Set[int]]
+    ) -> List[Set[int]]:
+        """
+        Improve a greedy cover with a time-bounded branch-and-bound search.
+
+        Args:
+            parent (Set[int]): The set that needs to be covered.
+            sets (List[Set[int]]): List of available sets to use for covering.
+            greedy (List[Set[int]]): Greedy cover used as the initial upper bound.
+
+        Returns:
+            List[Set[int]]: The cheapest cover found, in candidate order.
+        """
+        parent_mask, masks = encode_bitsets(parent, sets)
+        index_of = {id(candidate_set): i for i, candidate_set in enumerate(sets)}
+        greedy_indices = [index_of[id(candidate_set)] for candidate_set in greedy]
+
+        search = ExactCoverSearch(parent_mask, masks, self.config, self._interrupted)
+        best, self.proven_optimal = search.run(greedy_indices)
+        self.partial = self._interrupted()
+        if self.stats is not None:
+            self.stats.exact_nodes = search.nodes
+
+        if best == greedy_indices:
+            return greedy
+        return [sets[index] for index in sorted(best)]
+
+    def _select_best_mask(
+        self,
+        remaining_mask: int,
+        masks: List[int],
+        extra_counts: List[int],
+        available: List[int],
+    ) -> Optional[int]:
+        """
+        Select the index of the best candidate bitmask based on minimal cost.
+
+        Args:
+            remaining_mask (int): Bitmask of the elements left to cover.
+            masks (List[int]): Bitmasks of all candidate sets.
+            extra_counts (List[int]): Number of extra elements of each candidate.
+            available (List[int]): Indices of the candidates still available.
+
+        Returns:
+            Optional[int]: Index of the best candidate or None if none is available.
+        """
+        missing_weight = self.config.missing_weight
+        extra_weight = self.config.extra_weight
+        best_index: Optional[int] = None
+        best_cost: float = float("inf")
+
+        for index in available:
+            missing_elements = (remaining_mask & ~masks[index]).bit_count()
+            cost = (
+                missing_weight * missing_elements + extra_weight * extra_counts[index]
+            )
+
+            if cost < best_cost:
+                best_cost = cost
+                best_index = index
+
+        return best_index
+
+    def _optimize_bitset_solution(
+        self, parent_mask: int, masks: List[int], results: List[int]
+    ) -> List[int]:
+        """
+        Remove redundant candidates from a bitmask solution.
+
+        Mirrors `_optimize_solution`, with the coverage counts kept per bit
+        position of the parent.
+
+        Args:
+            parent_mask (int): Bitmask of the set to be covered.
+            masks (List[int]): Bitmasks of all candidate sets.
+            results (List[int]): Indices of the selected candidates.
+
+        Returns:
+            List[int]: Indices of the candidates kept in the solution.
+        """
+        if self.stats is not None:
+            start = time.perf_counter()
+
+        coverage = [0] * parent_mask.bit_length()
+        union_mask = 0
+        for index in results:
+            union_mask |= masks[index]
+            for bit in iter_bits(masks[index] & parent_mask):
+                coverage[bit] += 1
+        if parent_mask & ~union_mask:
+            return results.copy()
+
+        optimized: List[int] = results.copy()
+        for index in results:
+            if self._interrupted():
+                self.partial = True
+                break
+
+            parent_bits = list(iter_bits(masks[index] & parent_mask))
+            if any(coverage[bit] < 2 for bit in parent_bits):
+                continue  # Keep the candidate set
+
+            # Remove the first selected candidate with the same content
+            position = next(
+                i for i, kept in enumerate(optimized) if masks[kept] == masks[index]
+            )
+            del optimized[position]
+            for bit in parent_bits:
+                coverage[bit] -= 1
+
+        if self.stats is not None:
+            self.stats.optimize_time = time.perf_counter() - start
+        return optimized
+
+    def _tie_tolerance(
+        self, parent_size: int, extra_counts: List[int]
+    ) -> Optional[float]:
+        """
+        Bound the rounding difference between the lazy key and the scan cost.
+
+        Both are sums of two weighted counts, each off by a few ulps of the
+        largest cost, so a relative margin of 1e-9 is ample. When every
+        weighted count and sum is exact in float64, e.g. for integer or
+        half-integer weights, the key and the scan cost order candidates alike
+        and no margin is needed.
+
+        Args:
+            parent_size (int): Number of elements to cover.
+            extra_counts (List[int]): Number of extra elements of each candidate.
+
+        Returns:
+            Optional[float]: Key distance below which candidates are compared
+            by scan cost, or None if the costs are exact.
+        """
+        max_extra = max(extra_counts, default=0)
+        weights = [
+            Fraction(abs(self.config.missing_weight)),
+            Fraction(abs(self.config.extra_weight)),
+        ]
+        scale = max(weight.denominator for weight in weights)
+        largest = weights[0] * parent_size + weights[1] * max_extra
+        if largest * scale < 2**53:
+            return None  # All costs are multiples of 1 / scale below 2**53
+        return 1e-9 * float(largest)
+
+    def _interrupted(self) -> bool:
+        """Check whether the solve was cancelled or ran past its timeout."""
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            return True
+        return self._deadline is not None and time.perf_counter() > self._deadline
+
     def _validate_inputs(self, parent: Set[int], sets: List[Set[int]]) -> None:
         """
         Validate the solver inputs.
@@ -142,29 +726,621 @@ class SetCoverSolver:
         """
         Optimize the solution by removing redundant sets to minimize the number of sets used.
 
+        Sets are visited left to right. A per-element coverage count of the
+        parent is kept, so a set is redundant when every parent element it
+        contains is covered at least twice.
+
         Args:
             results (List[Set[int]]): Current list of selected sets.
 
         Returns:
             List[Set[int]]: Optimized list of sets.
         """
+        if self.stats is not None:
+            start = time.perf_counter()
+
+        coverage: Counter = Counter()
+        for candidate_set in results:
+            coverage.update(candidate_set & self.original_parent)
+        if len(coverage) < len(self.original_parent):
+            return results.copy()  # Coverage is already broken
+
         optimized_results: List[Set[int]] = results.copy()
         for candidate_set in results:
-            temp_results = optimized_results.copy()
-            temp_results.remove(candidate_set)
+            if self._interrupted():
+                self.partial = True
+                break
+
+            parent_elements = candidate_set & self.original_parent
 
             # Check if removing this set breaks coverage
-            union_result = set().union(*temp_results)
-            if not self.original_parent.issubset(union_result):
+            if any(coverage[element] < 2 for element in parent_elements):
                 continue  # Keep the candidate set
 
-            optimized_results = temp_results  # Remove the redundant set
+            optimized_results.remove(candidate_set)  # Remove the redundant set
+            coverage.subtract(parent_elements)
 
+        if self.stats is not None:
+            self.stats.optimize_time = time.perf_counter() - start
         return optimized_results
 
 
+class IncrementalSetCoverSolver(SetCoverSolver):
+    """
+    Set cover solver that keeps its state between single-element edits.
+
+    After a full `solve`, `add_day` and `remove_day` change the parent by one
+    element and repair the cover locally: the cheapest candidate is added for
+    an uncovered element, and sets that became redundant are dropped in
+    selection order. The state holds the selected candidates, per-element
+    coverage counts and the current `cover_cost`. Every edit may move the
+    optimum by one exception, so when the cost exceeds the last full solve by
+    more than `repair_tolerance` plus `extra_weight` per edit since then, the
+    cover is solved again from scratch.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SolverConfig] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        stats_callback: Optional[Callable[[SolverStats], None]] = None,
+    ):
+        """
+        Initialize the IncrementalSetCoverSolver with an optional configuration.
+
+        Args:
+            config (Optional[SolverConfig]): Configuration settings for the solver.
+            cancel_token (Optional[CancellationToken]): Token that stops full solves early.
+            stats_callback (Optional[Callable[[SolverStats], None]]): Receives the
+                measurements after every full solve.
+        """
+        super().__init__(config, cancel_token, stats_callback)
+        self.sets: List[Set[int]] = []
+        self.selected: List[int] = []
+        self.cost: float = 0.0
+        self.baseline_cost: float = 0.0
+        self.edits: int = 0
+        self.full_solves: int = 0
+
+        self._element_candidates: List[List[int]] = []
+        self._coverage: List[int] = []
+        self._parent_mask: int = 0
+        self._extra_count: int = 0
+
+    @property
+    def cover(self) -> List[Set[int]]:
+        """Sets of the current cover, in selection order."""
+        return [self.sets[index] for index in self.selected]
+
+    def solve(self, parent: Set[int], sets: List[Set[int]]) -> List[Set[int]]:
+        """
+        Solve from scratch and record the state used by later repairs.
+
+        Args:
+            parent (Set[int]): The set that needs to be covered.
+            sets (List[Set[int]]): List of available sets to use for covering.
+
+        Returns:
+            List[Set[int]]: List of sets that optimally cover the parent set.
+
+        Raises:
+            ValueError: If inputs are invalid.
+            RuntimeError: If a solution cannot be found within the maximum iterations.
+        """
+        results = super().solve(parent, sets)
+
+        if sets is not self.sets:
+            self.sets = sets
+            self._encode_sets(sets)
+            self._element_candidates = [[] for _ in self._positions]
+            for index, mask in enumerate(self._masks):
+                for bit in iter_bits(mask):
+                    self._element_candidates[bit].append(index)
+
+        index_of = {id(candidate_set): i for i, candidate_set in enumerate(sets)}
+        self.selected = [index_of[id(candidate_set)] for candidate_set in results]
+        self._parent_mask = self._encode_parent(parent)
+        self._coverage = [0] * len(self._positions)
+        for index in self.selected:
+            for bit in iter_bits(self._masks[index]):
+                self._coverage[bit] += 1
+        self._extra_count = sum(
+            1
+            for bit, count in enumerate(self._coverage)
+            if count and not self._parent_mask >> bit & 1
+        )
+
+        self._update_cost()
+        self.baseline_cost = self.cost
+        self.edits = 0
+        self.full_solves += 1
+        return results
+
+    def add_day(self, day: Hashable) -> List[Set[int]]:
+        """
+        Add an element to the parent and repair the cover.
+
+        Args:
+            day (Hashable): Element that must now be covered.
+
+        Returns:
+            List[Set[int]]: The repaired cover.
+
+        Raises:
+            RuntimeError: If no candidate contains the element.
+        """
+        bit = self._positions.get(day)
+        if bit is None:
+            raise RuntimeError("Unable to find solution: incomplete coverage.")
+        if self._parent_mask >> bit & 1:
+            return self.cover
+
+        self._parent_mask |= 1 << bit
+        self.original_parent.add(day)
+        if self._coverage[bit]:
+            self._extra_count -= 1  # A former exception is now a running day
+        else:
+            self._select(self._cheapest_candidate(bit))
+            self._drop_redundant()
+
+        return self._check_quality()
+
+    def remove_day(self, day: Hashable) -> List[Set[int]]:
+        """
+        Remove an element from the parent and repair the cover.
+
+        Args:
+            day (Hashable): Element that no longer has to be covered.
+
+        Returns:
+            List[Set[int]]: The repaired cover.
+        """
+        bit = self._positions.get(day)
+        if bit is None or not self._parent_mask >> bit & 1:
+            return self.cover
+
+        self._parent_mask &= ~(1 << bit)
+        self.original_parent.discard(day)
+        if self._coverage[bit]:
+            self._extra_count += 1  # The covered day becomes an exception
+        self._drop_redundant()
+
+        return self._check_quality()
+
+    def _cheapest_candidate(self, bit: int) -> int:
+        """Candidate containing the element that adds the fewest extra elements."""
+        best_index = -1
+        best_extra = 0
+        uncovered_extra = ~self._parent_mask
+        for index in self._element_candidates[bit]:
+            extra = 0
+            for other in iter_bits(self._masks[index] & uncovered_extra):
+                if not self._coverage[other]:
+                    extra += 1
+            if best_index < 0 or extra < best_extra:
+                best_index, best_extra = index, extra
+        return best_index
+
+    def _select(self, index: int) -> None:
+        """Add a candidate to the cover and update the coverage counts."""
+        self.selected.append(index)
+        for bit in iter_bits(self._masks[index]):
+            if not self._coverage[bit] and not self._parent_mask >> bit & 1:
+                self._extra_count += 1
+            self._coverage[bit] += 1
+
+    def _drop_redundant(self) -> None:
+        """Remove sets whose parent elements are all covered twice, in order."""
+        for index in self.selected.copy():
+            parent_bits = iter_bits(self._masks[index] & self._parent_mask)
+            if any(self._coverage[bit] < 2 for bit in parent_bits):
+                continue
+
+            self.selected.remove(index)
+            for bit in iter_bits(self._masks[index]):
+                self._coverage[bit] -= 1
+                if not self._coverage[bit] and not self._parent_mask >> bit & 1:
+                    self._extra_count -= 1
+
+    def _update_cost(self) -> None:
+        """Recompute the cost of the current cover from the state counters."""
+        self.cost = (
+            self.config.set_weight * len(self.selected)
+            + self.config.extra_weight * self._extra_count
+        )
+
+    def _check_quality(self) -> List[Set[int]]:
+        """Fall back to a full solve when repairs exceed the quality bound."""
+        self._update_cost()
+        self.edits += 1
+        bound = (
+            self.baseline_cost * (1 + self.config.repair_tolerance)
+            + self.config.extra_weight * self.edits
+        )
+        if self.cost > bound and self.original_parent:
+            return self.solve(self.original_parent.copy(), self.sets)
+        return self.cover
+
+
+class ExactCoverSearch:
+    """
+    Branch-and-bound search for a minimum-cost cover over bitmasks.
+
+    The objective is `cover_cost`: `set_weight` per selected set plus
+    `extra_weight` per element outside the parent. The search branches on the
+    uncovered element with the fewest candidates, and a candidate explored in
+    one branch is excluded from its later siblings, so each cover is visited
+    once. Nodes are pruned with two lower bounds: the remaining elements
+    divided by the largest remaining coverage, and the cheapest candidate
+    covering the branching element.
+    """
+
+    def __init__(
+        self,
+        parent_mask: int,
+        masks: List[int],
+        config: SolverConfig,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ):
+        """
+        Initialize the search.
+
+        Args:
+            parent_mask (int): Bitmask of the set to be covered.
+            masks (List[int]): Bitmasks of all candidate sets.
+            config (SolverConfig): Weights and time budget of the search.
+            should_stop (Optional[Callable[[], bool]]): Polled to stop the
+                search early, e.g. on cancellation.
+        """
+        self.parent_mask = parent_mask
+        self.masks = masks
+        self.config = config
+        self.should_stop = should_stop
+        self.extra_masks = [mask & ~parent_mask for mask in masks]
+
+        # Only the first of identical candidates can improve a cover
+        seen: Set[int] = set()
+        self.candidates: List[int] = []
+        for index, mask in enumerate(masks):
+            if mask & parent_mask and mask not in seen:
+                seen.add(mask)
+                self.candidates.append(index)
+
+        self.element_candidates: Dict[int, List[int]] = {
+            bit: [i for i in self.candidates if masks[i] >> bit & 1]
+            for bit in iter_bits(parent_mask)
+        }
+        self.element_order = sorted(
+            self.element_candidates, key=lambda bit: len(self.element_candidates[bit])
+        )
+
+        self.best_cost = float("inf")
+        self.best_cover: List[int] = []
+        self.deadline = 0.0
+        self.nodes = 0
+        self.timed_out = False
+
+    def run(self, initial_cover: List[int]) -> Tuple[List[int], bool]:
+        """
+        Search for a cover cheaper than the initial one.
+
+        Args:
+            initial_cover (List[int]): Indices of a feasible cover (upper bound).
+
+        Returns:
+            Tuple[List[int], bool]: Indices of the best cover found and whether
+            it is proven optimal.
+        """
+        self.best_cover = initial_cover.copy()
+        self.best_cost = self._cost(initial_cover)
+        self.deadline = time.perf_counter() + self.config.time_budget
+        self.nodes = 0
+        self.timed_out = False
+
+        self._search([], 0, 0, 0.0, 0)
+        return self.best_cover, not self.timed_out
+
+    def _cost(self, cover: List[int]) -> float:
+        """Objective value of a feasible cover given by candidate indices."""
+        extra_mask = 0
+        for index in cover:
+            extra_mask |= self.extra_masks[index]
+        return (
+            self.config.set_weight * len(cover)
+            + self.config.extra_weight * extra_mask.bit_count()
+        )
+
+    def _search(
+        self,
+        chosen: List[int],
+        covered: int,
+        extra_mask: int,
+        cost: float,
+        excluded: int,
+    ) -> None:
+        """Explore the subtree of covers extending `chosen`."""
+        self.nodes += 1
+        if self.nodes & 63 == 1 and (
+            time.perf_counter() > self.deadline
+            or self.should_stop is not None
+            and self.should_stop()
+        ):
+            self.timed_out = True
+        if self.timed_out:
+            return
+
+        uncovered = self.parent_mask & ~covered
+        if not uncovered:
+            if cost < self.best_cost:
+                self.best_cost = cost
+                self.best_cover = chosen.copy()
+            return
+
+        element = next(bit for bit in self.element_order if uncovered >> bit & 1)
+        branch = [i for i in self.element_candidates[element] if not excluded >> i & 1]
+        if not branch:
+            return
+
+        max_coverage = max(
+            (self.masks[i] & uncovered).bit_count()
+            for i in self.candidates
+            if not excluded >> i & 1
+        )
+        new_extras = {
+            i: (self.extra_masks[i] & ~extra_mask).bit_count() for i in branch
+        }
+        set_weight = self.config.set_weight
+        extra_weight = self.config.extra_weight
+        sets_needed = -(-uncovered.bit_count() // max_coverage)
+        lower_bound = cost + max(
+            set_weight * sets_needed,
+            set_weight + extra_weight * min(new_extras.values()),
+        )
+        if lower_bound >= self.best_cost:
+            return
+
+        # Cheapest increment per newly covered element first
+        branch.sort(
+            key=lambda i: (set_weight + extra_weight * new_extras[i])
+            / (self.masks[i] & uncovered).bit_count()
+        )
+        for index in branch:
+            chosen.append(index)
+            self._search(
+                chosen,
+                covered | self.masks[index],
+                extra_mask | self.extra_masks[index],
+                cost + set_weight + extra_weight * new_extras[index],
+                excluded,
+            )
+            chosen.pop()
+            excluded |= 1 << index
+            if self.timed_out:
+                return
+
+
+class InvertedIndex:
+    """
+    Mapping from every element to the candidates containing it.
+
+    Built once for a list of candidate sets, e.g. a cluster library, and
+    shared by every solve over that list.
+    """
+
+    def __init__(self, sets: List[Set[Hashable]]):
+        """
+        Build the index of a list of candidate sets.
+
+        Args:
+            sets (List[Set[Hashable]]): Candidate sets, indexed by position.
+        """
+        self.sets = sets
+        self.sizes: List[int] = [len(candidate_set) for candidate_set in sets]
+        self.postings: Dict[Hashable, List[int]] = {}
+        for index, candidate_set in enumerate(sets):
+            for element in candidate_set:
+                self.postings.setdefault(element, []).append(index)
+
+    def overlap_counts(self, elements: Set[Hashable]) -> List[int]:
+        """
+        Count the given elements contained in every candidate.
+
+        Args:
+            elements (Set[Hashable]): Elements to count.
+
+        Returns:
+            List[int]: Number of the elements in each candidate, by index.
+        """
+        counts = [0] * len(self.sets)
+        for element in elements:
+            for index in self.postings.get(element, ()):
+                counts[index] += 1
+        return counts
+
+    def discount(self, elements: Set[Hashable], counts: List[int]) -> None:
+        """
+        Remove covered elements from per-candidate overlap counts.
+
+        Only the candidates containing one of the elements are touched.
+
+        Args:
+            elements (Set[Hashable]): Elements that are no longer counted.
+            counts (List[int]): Overlap count of each candidate, updated in place.
+        """
+        for element in elements:
+            for index in self.postings.get(element, ()):
+                counts[index] -= 1
+
+
+class LazyCandidateQueue:
+    """
+    Priority queue of candidates keyed by their last computed cost.
+
+    Keys must never decrease between two pops, which holds for the greedy key
+    `extra_weight * extra - missing_weight * overlap` because the remaining
+    parent only shrinks. Stale keys are therefore lower bounds, and only the
+    top entries have to be rescored. The key rounds differently from the scan
+    cost `missing_weight * missing + extra_weight * extra`, so candidates whose
+    keys are within `tolerance` of the best are compared by their scan cost.
+    Ties are broken by the lower candidate index, as in a left-to-right scan.
+    """
+
+    def __init__(self, keys: List[float], tolerance: Optional[float] = None):
+        """
+        Initialize the queue with the initial key of every candidate.
+
+        Args:
+            keys (List[float]): Initial key of each candidate, by index.
+            tolerance (Optional[float]): Key distance below which candidates are
+                compared by their scan cost, at least the rounding error of both;
+                None when keys order candidates exactly like the scan.
+        """
+        self.heap: List[Tuple[float, int]] = [(key, i) for i, key in enumerate(keys)]
+        self.tolerance = tolerance
+        heapq.heapify(self.heap)
+
+    def pop_best(
+        self,
+        key_fn: Callable[[int], float],
+        cost_fn: Optional[Callable[[int], float]] = None,
+    ) -> Optional[int]:
+        """
+        Remove and return the candidate with the lowest current cost.
+
+        Args:
+            key_fn (Callable[[int], float]): Computes the current key of a candidate.
+            cost_fn (Optional[Callable[[int], float]]): Computes the scan cost of a
+                candidate, used to settle keys within `tolerance`. Without it or a
+                tolerance the lowest key wins.
+
+        Returns:
+            Optional[int]: Index of the best candidate or None if the queue is empty.
+        """
+        while self.heap:
+            stale_key, index = self.heap[0]
+            key = key_fn(index)
+            if key <= stale_key:
+                break
+            heapq.heapreplace(self.heap, (key, index))
+        else:
+            return None
+
+        if cost_fn is None or self.tolerance is None:
+            heapq.heappop(self.heap)
+            return index
+
+        # Entries with stale keys within tolerance form a subtree at the top
+        # of the heap; rescore them in place and restore the heap afterwards
+        heap = self.heap
+        bound = key + self.tolerance
+        best, best_cost, best_position = index, cost_fn(index), 0
+        stack = [1, 2]
+        while stack:
+            position = stack.pop()
+            if position >= len(heap) or heap[position][0] > bound:
+                continue
+            other = heap[position][1]
+            other_key = key_fn(other)
+            heap[position] = (other_key, other)
+            stack += (2 * position + 1, 2 * position + 2)
+            if other_key <= bound:
+                cost = cost_fn(other)
+                if cost < best_cost or (cost == best_cost and other < best):
+                    best, best_cost, best_position = other, cost, position
+
+        heap[best_position] = heap[-1]
+        heap.pop()
+        heapq.heapify(heap)
+        return best
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """
+    Iterate over the positions of the set bits of a bitmask, lowest first.
+
+    Args:
+        mask (int): Non-negative bitmask.
+
+    Yields:
+        int: Position of each set bit.
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def encode_bitsets(
+    parent: Set[Hashable],
+    sets: List[Set[Hashable]],
+    elements: Optional[List[Hashable]] = None,
+) -> Tuple[int, List[int]]:
+    """
+    Pack a parent set and its candidate sets into integer bitmasks.
+
+    Each distinct element gets a bit position, by default in order of first
+    appearance starting with the elements of the parent.
+
+    Args:
+        parent (Set[Hashable]): The set that needs to be covered.
+        sets (List[Set[Hashable]]): List of available sets.
+        elements (Optional[List[Hashable]]): Explicit element order, which
+            must contain every element of the parent and the sets.
+
+    Returns:
+        Tuple[int, List[int]]: The parent bitmask and one bitmask per set.
+    """
+    positions: Dict[Hashable, int]
+    if elements is not None:
+        positions = {element: bit for bit, element in enumerate(elements)}
+    else:
+        positions = {}
+        for collection in (parent, *sets):
+            for element in collection:
+                if element not in positions:
+                    positions[element] = len(positions)
+
+    num_bytes = (len(positions) + 7) // 8
+
+    def encode(collection: Set[Hashable]) -> int:
+        buffer = bytearray(num_bytes)
+        for element in collection:
+            bit = positions[element]
+            buffer[bit >> 3] |= 1 << (bit & 7)
+        return int.from_bytes(buffer, "little")
+
+    return encode(parent), [encode(candidate) for candidate in sets]
+
+
+def cover_cost(
+    parent: Set[int], cover: List[Set[int]], config: Optional[SolverConfig] = None
+) -> float:
+    """
+    Description cost of a cover: one unit per set plus its exceptions.
+
+    Args:
+        parent (Set[int]): The set that needs to be covered.
+        cover (List[Set[int]]): Selected sets.
+        config (Optional[SolverConfig]): Weights of sets, missing and extra elements.
+
+    Returns:
+        float: The weighted cost of the cover.
+    """
+    config = config or SolverConfig()
+    union_result = set().union(*cover)
+    return (
+        config.set_weight * len(cover)
+        + config.missing_weight * len(parent - union_result)
+        + config.extra_weight * len(union_result - parent)
+    )
+
+
 def solve_set_cover(
-    parent: Set[int], sets: List[Set[int]], config: Optional[SolverConfig] = None
+    parent: Set[int],
+    sets: List[Set[int]],
+    config: Optional[SolverConfig] = None,
+    cancel_token: Optional[CancellationToken] = None,
+    index: Optional[InvertedIndex] = None,
 ) -> List[Set[int]]:
     """
     Convenience function to solve the set cover problem.
@@ -173,9 +1349,12 @@ def solve_set_cover(
         parent (Set[int]): The set that needs to be covered.
         sets (List[Set[int]]): List of available sets to use for covering.
         config (Optional[SolverConfig]): Optional solver configuration.
+        cancel_token (Optional[CancellationToken]): Token that stops the solve early.
+        index (Optional[InvertedIndex]): Prebuilt `InvertedIndex(sets)` for
+            inverted selection, so repeated calls do not rebuild it.
 
     Returns:
         List[Set[int]]: List of sets that optimally cover the parent set.
     """
-    solver = SetCoverSolver(config)
+    solver = SetCoverSolver(config, cancel_token, index=index)
     return solver.solve(parent, sets)
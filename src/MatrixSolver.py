@@ -0,0 +1,578 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.MCSolver import SolverConfig
+
+ClusterData = Tuple[NDArray, List[str], NDArray]
+
+
+@dataclass
+class PrunedClusters:
+    """
+    Result of the candidate pre-pass.
+
+    Attributes:
+        clusters: Kept clusters, each named after its first duplicate
+        aliases: All names of each kept cluster, duplicates included
+        source_indices: Row index of each kept cluster in the original matrix
+    """
+
+    clusters: ClusterData
+    aliases: List[List[str]]
+    source_indices: NDArray
+
+
+def prune_clusters(
+    clusters: ClusterData,
+    running_days: Optional[NDArray] = None,
+    config: Optional[SolverConfig] = None,
+) -> PrunedClusters:
+    """
+    Merge duplicate clusters and drop dominated ones.
+
+    Rows are hashed to merge identical clusters, which is common once the
+    full-year library is sliced to a short range; the first name is kept for
+    display and all names stay in `aliases`. When running days are given, a
+    cluster is also dropped if another one covers at least the same running
+    days with no more extra days, so under the configured weights its greedy
+    cost can never be lower.
+
+    Args:
+        clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+        running_days (Optional[NDArray]): Boolean vector, True on days with
+            service, or None to only merge duplicates.
+        config (Optional[SolverConfig]): Weights deciding which counts matter.
+
+    Returns:
+        PrunedClusters: The reduced candidate set.
+    """
+    config = config or SolverConfig()
+    clusters_array, names, day_indices = clusters
+    matrix = np.asarray(clusters_array) != 0
+
+    first_of: Dict[bytes, int] = {}
+    aliases: List[List[str]] = []
+    kept: List[int] = []
+    for index, row in enumerate(np.packbits(matrix, axis=1)):
+        key = row.tobytes()
+        if key in first_of:
+            aliases[first_of[key]].append(names[index])
+            continue
+        first_of[key] = len(kept)
+        aliases.append([names[index]])
+        kept.append(index)
+
+    source_indices = np.array(kept, dtype=np.intp)
+    if running_days is not None:
+        running = np.asarray(running_days, dtype=bool)
+        unique = matrix[source_indices]
+        covered = (unique & running).astype(np.float32)
+        extra = (unique & ~running).sum(axis=1)
+
+        # not_within[a, b]: running days of a that b does not cover
+        not_within = covered @ (1 - covered).T
+        dominates = not_within.T == 0
+        if config.extra_weight > 0:
+            dominates &= extra[:, None] <= extra[None, :]
+        np.fill_diagonal(dominates, False)
+
+        # Mutually dominating clusters keep the first one
+        strictly = dominates & ~dominates.T
+        earlier = np.triu(dominates & dominates.T, k=1)
+        dropped = (strictly | earlier).any(axis=0)
+
+        source_indices = source_indices[~dropped]
+        aliases = [group for group, drop in zip(aliases, dropped) if not drop]
+
+    pruned = (
+        np.asarray(clusters_array)[source_indices],
+        [group[0] for group in aliases],
+        day_indices,
+    )
+    return PrunedClusters(pruned, aliases, source_indices)
+
+
+@dataclass
+class WindowCounts:
+    """
+    Day counts of every cluster over a window.
+
+    Each attribute has one entry per cluster, or C×W entries when several
+    windows are queried at once.
+
+    Attributes:
+        days: Days of the cluster inside the window
+        covered: Running days of the window the cluster contains
+        missing: Running days of the window the cluster misses
+        extra: Days of the cluster in the window without service
+    """
+
+    days: NDArray
+    covered: NDArray
+    missing: NDArray
+    extra: NDArray
+
+
+class ClusterRangeIndex:
+    """
+    Cumulative day counts of every cluster, answering window queries.
+
+    Keeps per-cluster prefix sums of cluster days and of running days
+    covered, plus the prefix sum of the running days. The counts of any
+    window `[start_idx, end_idx]` are then two lookups per cluster, so
+    candidates are re-costed for a new date range without touching the
+    day-level matrix.
+    """
+
+    def __init__(self, clusters: ClusterData, running_days: Optional[NDArray] = None):
+        """
+        Build the index of a cluster matrix.
+
+        Args:
+            clusters (ClusterData): Output of `ClusterGenerator.create_clusters`
+                or `create_range_clusters`, over the widest range of interest.
+            running_days (Optional[NDArray]): Boolean vector, True on days with
+                service; all False if None.
+        """
+        clusters_array, names, day_indices = clusters
+        self.matrix = np.asarray(clusters_array) != 0
+        self.names = list(names)
+        self.day_indices = np.asarray(day_indices)
+
+        self.day_prefix = self._prefix(self.matrix)
+        self.covered_prefix = np.zeros_like(self.day_prefix)
+        self.running_prefix = np.zeros(self.matrix.shape[1] + 1, dtype=np.int32)
+        if running_days is not None:
+            self.update_running_days(running_days)
+
+    def update_running_days(self, running_days: NDArray) -> None:
+        """
+        Replace the running days counted by the index.
+
+        Args:
+            running_days (NDArray): Boolean vector, True on days with service.
+
+        Raises:
+            ValueError: If the vector does not match the cluster columns.
+        """
+        running = np.asarray(running_days, dtype=bool)
+        if running.shape != (self.matrix.shape[1],):
+            raise ValueError("Running days must have one entry per cluster column.")
+        self.covered_prefix = self._prefix(self.matrix & running)
+        self.running_prefix = self._prefix(running)
+
+    def columns(
+        self, start_idx: Union[int, NDArray], end_idx: Union[int, NDArray]
+    ) -> Tuple[NDArray, NDArray]:
+        """
+        Convert day indices to half-open prefix positions.
+
+        Args:
+            start_idx (Union[int, NDArray]): First day index of each window.
+            end_idx (Union[int, NDArray]): Last day index of each window.
+
+        Returns:
+            Tuple[NDArray, NDArray]: Prefix positions of the window starts and
+            ends.
+
+        Raises:
+            ValueError: If a window is empty or reaches outside the index.
+        """
+        start_idx = np.asarray(start_idx)
+        end_idx = np.asarray(end_idx)
+        if np.any(start_idx > end_idx):
+            raise ValueError("Window start must not be after its end.")
+        if np.any(start_idx < self.day_indices[0]) or np.any(
+            end_idx > self.day_indices[-1]
+        ):
+            raise ValueError("Window reaches outside the indexed days.")
+        low = np.searchsorted(self.day_indices, start_idx, side="left")
+        high = np.searchsorted(self.day_indices, end_idx, side="right")
+        return low, high
+
+    def counts(
+        self, start_idx: Union[int, NDArray], end_idx: Union[int, NDArray]
+    ) -> WindowCounts:
+        """
+        Count the days of every cluster over one or many windows.
+
+        Args:
+            start_idx (Union[int, NDArray]): First day index of each window.
+            end_idx (Union[int, NDArray]): Last day index of each window.
+
+        Returns:
+            WindowCounts: Counts per cluster, with a trailing window axis when
+            arrays of windows are given.
+        """
+        low, high = self.columns(start_idx, end_idx)
+        days = self.day_prefix[:, high] - self.day_prefix[:, low]
+        covered = self.covered_prefix[:, high] - self.covered_prefix[:, low]
+        running = self.running_prefix[high] - self.running_prefix[low]
+        return WindowCounts(days, covered, running - covered, days - covered)
+
+    def costs(
+        self,
+        start_idx: Union[int, NDArray],
+        end_idx: Union[int, NDArray],
+        config: Optional[SolverConfig] = None,
+    ) -> NDArray:
+        """
+        Greedy cost of every cluster as the only selected one, per window.
+
+        Matches the first round of `MatrixSetCoverSolver.solve` on the
+        window's columns.
+
+        Args:
+            start_idx (Union[int, NDArray]): First day index of each window.
+            end_idx (Union[int, NDArray]): Last day index of each window.
+            config (Optional[SolverConfig]): Weights of missing and extra days.
+
+        Returns:
+            NDArray: Weighted missing plus extra days per cluster (and window).
+        """
+        config = config or SolverConfig()
+        counts = self.counts(start_idx, end_idx)
+        return (
+            config.missing_weight * counts.missing + config.extra_weight * counts.extra
+        )
+
+    def window(self, start_idx: int, end_idx: int) -> ClusterData:
+        """
+        Slice the clusters of a window, e.g. to solve it.
+
+        Args:
+            start_idx (int): First day index of the window.
+            end_idx (int): Last day index of the window.
+
+        Returns:
+            ClusterData: Zero-copy views of the window's clusters.
+        """
+        low, high = self.columns(start_idx, end_idx)
+        return self.matrix[:, low:high], self.names.copy(), self.day_indices[low:high]
+
+    @staticmethod
+    def _prefix(matrix: NDArray) -> NDArray:
+        """Cumulative counts along the last axis, with a leading zero column."""
+        prefix = np.zeros(matrix.shape[:-1] + (matrix.shape[-1] + 1,), dtype=np.int32)
+        np.cumsum(matrix, axis=-1, out=prefix[..., 1:])
+        return prefix
+
+
+class MatrixSetCoverSolver:
+    """
+    Set cover solver working directly on the cluster matrix.
+
+    Consumes the `(clusters_array, names, day_indices)` tuple produced by
+    `ClusterGenerator.create_clusters` and scores every candidate at once with
+    NumPy on each greedy step. Selection order, tie-breaking and redundancy
+    elimination follow `SetCoverSolver`, so the chosen clusters are the same.
+    """
+
+    def __init__(self, config: Optional[SolverConfig] = None):
+        """
+        Initialize the MatrixSetCoverSolver with an optional configuration.
+
+        Args:
+            config (Optional[SolverConfig]): Configuration settings for the solver.
+        """
+        self.config = config or SolverConfig()
+
+    def solve(self, clusters: ClusterData, running_days: NDArray) -> List[int]:
+        """
+        Select the clusters that cover the running days.
+
+        Args:
+            clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+            running_days (NDArray): Boolean vector, True on days with service.
+
+        Returns:
+            List[int]: Row indices of the selected clusters.
+
+        Raises:
+            ValueError: If inputs are invalid.
+            RuntimeError: If a solution cannot be found within the maximum iterations.
+        """
+        matrix, running = self._validate_inputs(clusters, running_days)
+
+        counts = matrix.astype(np.int32)
+        extra_costs = self.config.extra_weight * (matrix & ~running).sum(axis=1)
+        available = np.ones(len(matrix), dtype=bool)
+        remaining = running.copy()
+        results: List[int] = []
+        iteration = 0
+
+        while remaining.any():
+            if iteration >= self.config.max_iterations:
+                raise RuntimeError("Failed to find solution within iteration limit.")
+
+            if not available.any():
+                break  # No suitable set found; exit loop.
+
+            missing = remaining.sum() - counts @ remaining
+            costs = self.config.missing_weight * missing + extra_costs
+            costs = np.where(available, costs, np.inf)
+            best_index = int(np.argmin(costs))
+
+            results.append(best_index)
+            remaining &= ~matrix[best_index]
+            available[best_index] = False
+            iteration += 1
+
+        if remaining.any():
+            raise RuntimeError("Unable to find solution: incomplete coverage.")
+
+        return self._optimize_solution(matrix, running, results)
+
+    def solve_window(
+        self, index: ClusterRangeIndex, start_idx: int, end_idx: int
+    ) -> List[int]:
+        """
+        Select the clusters that cover the index's running days in a window.
+
+        Clusters without a running day in the window are dropped from the
+        index's counts before the window is sliced. The greedy rounds could
+        only pick them as no-ops that `_optimize_solution` removes again, so
+        the cover is the one `solve` returns on the whole window.
+
+        Args:
+            index (ClusterRangeIndex): Index holding the running days.
+            start_idx (int): First day index of the window.
+            end_idx (int): Last day index of the window.
+
+        Returns:
+            List[int]: Row indices of the selected clusters in the index.
+
+        Raises:
+            ValueError: If the window is invalid or has no running days.
+            RuntimeError: If a solution cannot be found within the maximum iterations.
+        """
+        low, high = index.columns(start_idx, end_idx)
+        running = np.diff(index.running_prefix[low : high + 1]) != 0
+        if not running.any():
+            raise ValueError("Running days cannot be empty.")
+        candidates = np.flatnonzero(index.counts(start_idx, end_idx).covered)
+        if len(candidates) == 0:
+            raise RuntimeError("Unable to find solution: incomplete coverage.")
+
+        matrix, names, day_indices = index.window(start_idx, end_idx)
+        cover = self.solve(
+            (matrix[candidates], [names[i] for i in candidates], day_indices),
+            running,
+        )
+        return candidates[cover].tolist()
+
+    def solve_batch(self, clusters: ClusterData, services: NDArray) -> List[List[int]]:
+        """
+        Select clusters for many services at once.
+
+        All services advance through the greedy rounds in lockstep: every round
+        scores all active services against all clusters with one matrix
+        product, and services leave the active mask once they are covered.
+        Each cover is the one `solve` returns for that service alone.
+
+        Args:
+            clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+            services (NDArray): Boolean S×D matrix, one running-day row per service.
+
+        Returns:
+            List[List[int]]: Row indices of the selected clusters, per service.
+
+        Raises:
+            ValueError: If inputs are invalid.
+            RuntimeError: If a service cannot be covered within the maximum iterations.
+        """
+        matrix, running = self._validate_inputs(clusters, services, batch=True)
+
+        # Day counts stay integral and weights are applied in float64 as in
+        # `solve`, so equal costs round the same way and ties break alike
+        counts_t = matrix.T.astype(np.int32)
+        extra_costs = self.config.extra_weight * (
+            (~running).astype(np.int32) @ counts_t
+        )
+        available = np.ones((len(running), len(matrix)), dtype=bool)
+        remaining = running.copy()
+        active = np.ones(len(running), dtype=bool)
+        rounds: List[NDArray] = []
+
+        while active.any():
+            if len(rounds) >= self.config.max_iterations:
+                raise RuntimeError("Failed to find solution within iteration limit.")
+
+            services_idx = np.flatnonzero(active)
+            if not available[services_idx].any(axis=1).all():
+                raise RuntimeError("Unable to find solution: incomplete coverage.")
+
+            remaining_active = remaining[services_idx]
+            missing = remaining_active.sum(axis=1, keepdims=True) - (
+                remaining_active.astype(np.int32) @ counts_t
+            )
+            costs = self.config.missing_weight * missing + extra_costs[services_idx]
+            costs = np.where(available[services_idx], costs, np.inf)
+            best = np.argmin(costs, axis=1)
+
+            picks = np.full(len(running), -1)
+            picks[services_idx] = best
+            rounds.append(picks)
+
+            remaining[services_idx] &= ~matrix[best]
+            available[services_idx, best] = False
+            active[services_idx] = remaining[services_idx].any(axis=1)
+
+        return self._optimize_batch(matrix, running, np.stack(rounds, axis=1))
+
+    def _validate_inputs(
+        self, clusters: ClusterData, running_days: NDArray, batch: bool = False
+    ) -> Tuple[NDArray, NDArray]:
+        """
+        Validate the solver inputs and convert them to boolean arrays.
+
+        Args:
+            clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+            running_days (NDArray): Boolean vector, True on days with service,
+                or one such row per service when `batch` is set.
+            batch (bool): Whether `running_days` holds several services.
+
+        Returns:
+            Tuple[NDArray, NDArray]: Boolean cluster matrix and running days.
+
+        Raises:
+            ValueError: If any input is invalid.
+        """
+        clusters_array, names, day_indices = clusters
+        matrix = np.asarray(clusters_array) != 0
+        running = np.asarray(running_days, dtype=bool)
+
+        if matrix.ndim != 2 or matrix.shape[0] == 0:
+            raise ValueError("Clusters must be a non-empty 2D array.")
+        if len(names) != matrix.shape[0]:
+            raise ValueError("Cluster names must match the number of clusters.")
+        if batch and (running.ndim != 2 or len(running) == 0):
+            raise ValueError("Services must be a non-empty 2D array.")
+        if not batch and running.ndim != 1:
+            raise ValueError("Running days must be a 1D array.")
+        if running.shape[-1] != matrix.shape[1] or len(day_indices) != matrix.shape[1]:
+            raise ValueError("Running days must have one entry per cluster column.")
+        if not running.any(axis=-1).all():
+            raise ValueError("Running days cannot be empty.")
+
+        return matrix, running
+
+    def _optimize_solution(
+        self, matrix: NDArray, running: NDArray, results: List[int]
+    ) -> List[int]:
+        """
+        Remove redundant clusters, mirroring `SetCoverSolver._optimize_solution`.
+
+        Args:
+            matrix (NDArray): Boolean cluster matrix.
+            running (NDArray): Boolean running-day vector.
+            results (List[int]): Row indices of the selected clusters.
+
+        Returns:
+            List[int]: Row indices of the clusters kept in the solution.
+        """
+        selected = matrix[results] & running
+        coverage = selected.sum(axis=0)
+        if (running & (coverage == 0)).any():
+            return results.copy()
+
+        optimized: List[int] = results.copy()
+        for index, parent_days in zip(results, selected):
+            if (coverage[parent_days] < 2).any():
+                continue  # Keep the candidate cluster
+
+            # Remove the first selected cluster with the same content
+            position = next(
+                i
+                for i, kept in enumerate(optimized)
+                if np.array_equal(matrix[kept], matrix[index])
+            )
+            del optimized[position]
+            coverage[parent_days] -= 1
+
+        return optimized
+
+    def _optimize_batch(
+        self, matrix: NDArray, running: NDArray, picks: NDArray
+    ) -> List[List[int]]:
+        """
+        Remove redundant clusters of all services in lockstep.
+
+        Applies the left-to-right pass of `_optimize_solution` position by
+        position across services, with one coverage-count row per service.
+
+        Args:
+            matrix (NDArray): Boolean cluster matrix.
+            running (NDArray): Boolean S×D running-day matrix.
+            picks (NDArray): S×K selected cluster indices, -1 after a service ends.
+
+        Returns:
+            List[List[int]]: Row indices of the clusters kept, per service.
+        """
+        # Identical clusters share a content id, used to remove the first copy
+        _, content_ids = np.unique(matrix, axis=0, return_inverse=True)
+        content_ids = np.append(content_ids.ravel(), -1)
+        pick_ids = content_ids[picks]
+
+        kept = picks >= 0
+        coverage = np.zeros(running.shape, dtype=np.int32)
+        for position in range(picks.shape[1]):
+            coverage += matrix[picks[:, position]] & running & kept[:, [position]]
+
+        for position in range(picks.shape[1]):
+            valid = picks[:, position] >= 0
+            parent_days = matrix[picks[:, position]] & running
+            redundant = valid & ~(parent_days & (coverage < 2)).any(axis=1)
+            if not redundant.any():
+                continue
+
+            same = kept & (pick_ids == pick_ids[:, [position]])
+            first = np.argmax(same, axis=1)
+            services_idx = np.flatnonzero(redundant)
+            kept[services_idx, first[services_idx]] = False
+            coverage[services_idx] -= parent_days[services_idx]
+
+        return [row[mask].tolist() for row, mask in zip(picks, kept)]
+
+
+def solve_cluster_cover(
+    clusters: ClusterData,
+    running_days: NDArray,
+    config: Optional[SolverConfig] = None,
+) -> List[int]:
+    """
+    Convenience function to cover running days with generated clusters.
+
+    Args:
+        clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+        running_days (NDArray): Boolean vector, True on days with service.
+        config (Optional[SolverConfig]): Optional solver configuration.
+
+    Returns:
+        List[int]: Row indices of the selected clusters.
+    """
+    solver = MatrixSetCoverSolver(config)
+    return solver.solve(clusters, running_days)
+
+
+def solve_cluster_cover_batch(
+    clusters: ClusterData,
+    services: NDArray,
+    config: Optional[SolverConfig] = None,
+) -> List[List[int]]:
+    """
+    Convenience function to cover many services with generated clusters.
+
+    Args:
+        clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+        services (NDArray): Boolean S×D matrix, one running-day row per service.
+        config (Optional[SolverConfig]): Optional solver configuration.
+
+    Returns:
+        List[List[int]]: Row indices of the selected clusters, per service.
+    """
+    solver = MatrixSetCoverSolver(config)
+    return solver.solve_batch(clusters, services)
@@ -0,0 +1,171 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.MCSolver import InvertedIndex, SolverConfig, solve_set_cover
+from src.MatrixSolver import ClusterData
+
+# Per-process state of pool workers, filled by `_init_worker`
+_worker_state: Dict[str, object] = {}
+
+
+@dataclass
+class ParallelConfig:
+    """Configuration for parallel batch solving."""
+
+    max_workers: Optional[int] = None  # Worker processes, defaults to the CPU count
+    chunk_size: int = 64  # Services sent to a worker per task
+
+
+def _init_worker(
+    shm_name: str,
+    shape: Tuple[int, int],
+    day_indices: NDArray,
+    config: Optional[SolverConfig],
+) -> None:
+    """
+    Attach a pool worker to the shared cluster matrix.
+
+    The candidate sets, and their inverted index for inverted selection, are
+    built once per worker from the shared pages.
+
+    Args:
+        shm_name: Name of the shared memory block holding the cluster matrix.
+        shape: Shape of the cluster matrix.
+        day_indices: Day index of every cluster column.
+        config: Solver configuration used for every service.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+
+    matrix = np.ndarray(shape, dtype=np.bool_, buffer=shm.buf)
+    sets = [set(day_indices[row].tolist()) for row in matrix]
+
+    _worker_state["shm"] = shm
+    _worker_state["day_indices"] = day_indices
+    _worker_state["sets"] = sets
+    _worker_state["index_of"] = {id(s): i for i, s in enumerate(sets)}
+    _worker_state["inverted"] = (
+        InvertedIndex(sets)
+        if config is not None and config.selection == "inverted"
+        else None
+    )
+    _worker_state["config"] = config
+
+
+def _solve_chunk(services: NDArray) -> List[List[int]]:
+    """
+    Solve a chunk of services in a pool worker.
+
+    Args:
+        services: Boolean running-day rows of the services in the chunk.
+
+    Returns:
+        Row indices of the selected clusters, per service.
+    """
+    day_indices = _worker_state["day_indices"]
+    sets = _worker_state["sets"]
+    index_of = _worker_state["index_of"]
+    config = _worker_state["config"]
+    inverted = _worker_state["inverted"]
+
+    results = []
+    for running in services:
+        parent = set(day_indices[running].tolist())
+        cover = solve_set_cover(parent, sets, config, index=inverted)
+        results.append([index_of[id(s)] for s in cover])
+    return results
+
+
+def solve_set_cover_parallel(
+    clusters: ClusterData,
+    services: NDArray,
+    config: Optional[SolverConfig] = None,
+    parallel_config: Optional[ParallelConfig] = None,
+) -> Iterator[List[int]]:
+    """
+    Solve many services with `solve_set_cover` on a process pool.
+
+    The cluster matrix is published once through shared memory, so workers
+    attach to it without copying. Services are dispatched in chunks and the
+    covers are yielded in input order as soon as they are available.
+
+    Inputs are validated when the function is called; the pool starts on
+    the first `next()`.
+
+    Args:
+        clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+        services (NDArray): Boolean S×D matrix, one running-day row per service.
+        config (Optional[SolverConfig]): Optional solver configuration.
+        parallel_config (Optional[ParallelConfig]): Worker count and chunk size.
+
+    Returns:
+        Iterator[List[int]]: Row indices of the selected clusters, per service.
+
+    Raises:
+        ValueError: If inputs are invalid.
+    """
+    parallel_config = parallel_config or ParallelConfig()
+    clusters_array, _, day_indices = clusters
+    matrix = np.asarray(clusters_array) != 0
+    services = np.asarray(services, dtype=bool)
+
+    if matrix.ndim != 2 or services.ndim != 2:
+        raise ValueError("Clusters and services must be 2D arrays.")
+    if services.shape[1] != matrix.shape[1]:
+        raise ValueError("Services must have one entry per cluster column.")
+    if not services.any(axis=1).all():
+        raise ValueError("Every service must run on at least one day.")
+    if parallel_config.chunk_size < 1:
+        raise ValueError("Chunk size must be positive.")
+
+    return _solve_parallel(
+        matrix, np.asarray(day_indices), services, config, parallel_config
+    )
+
+
+def _solve_parallel(
+    matrix: NDArray,
+    day_indices: NDArray,
+    services: NDArray,
+    config: Optional[SolverConfig],
+    parallel_config: ParallelConfig,
+) -> Iterator[List[int]]:
+    """
+    Yield the covers of validated services from a process pool.
+
+    Args:
+        matrix: Boolean cluster matrix.
+        day_indices: Day index of every cluster column.
+        services: Boolean S×D running-day matrix.
+        config: Solver configuration used for every service.
+        parallel_config: Worker count and chunk size.
+
+    Yields:
+        Row indices of the selected clusters, per service.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    try:
+        np.ndarray(matrix.shape, dtype=np.bool_, buffer=shm.buf)[:] = matrix
+
+        chunks = [
+            services[start : start + parallel_config.chunk_size]
+            for start in range(0, len(services), parallel_config.chunk_size)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=parallel_config.max_workers,
+            initializer=_init_worker,
+            initargs=(shm.name, matrix.shape, day_indices, config),
+        ) as executor:
+            try:
+                for chunk_results in executor.map(_solve_chunk, chunks):
+                    yield from chunk_results
+            finally:
+                # Drop chunks not yet started if the caller stops early
+                executor.shutdown(cancel_futures=True)
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,306 @@
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from src.MCSolver import (
+    CancellationToken,
+    SetCoverSolver,
+    SolverConfig,
+    SolverStats,
+    encode_bitsets,
+)
+
+CachedSolution = Tuple[List[int], Optional[bool]]
+
+# SolverConfig fields that change the returned cover; the engine, selection,
+# timeout and repair settings only change how fast it is found
+RESULT_FIELDS = ("missing_weight", "extra_weight", "mode")
+
+# Fields that only change the cover of the exact search
+EXACT_FIELDS = ("set_weight", "time_budget")
+
+
+class CandidateFingerprint:
+    """
+    Canonical element order and digest of a candidate list.
+
+    Computed once per list, e.g. a cluster library, and shared by the keys of
+    every problem over that list, so a lookup only encodes the parent.
+    """
+
+    def __init__(self, sets: List[Set[Hashable]]):
+        """
+        Fingerprint a list of candidate sets.
+
+        Args:
+            sets (List[Set[Hashable]]): List of available sets, which must not
+                be modified while the fingerprint is used.
+        """
+        self.sets = sets
+        elements = _canonical_order(set().union(*sets))
+        self.positions: Dict[Hashable, int] = {
+            element: bit for bit, element in enumerate(elements)
+        }
+        _, masks = encode_bitsets(set(), sets, elements)
+
+        candidates = hashlib.blake2b(digest_size=16)
+        for mask in masks:
+            candidates.update(f"{mask:x};".encode())
+        self.digest = candidates.digest()
+
+    def parent_key(self, parent: Set[Hashable]) -> str:
+        """
+        Encode a parent set over the candidate elements.
+
+        Args:
+            parent (Set[Hashable]): The set that needs to be covered.
+
+        Returns:
+            str: Hex bitmask of the parent, followed by the elements no
+            candidate contains.
+        """
+        buffer = bytearray((len(self.positions) + 7) // 8)
+        outside = []
+        for element in parent:
+            bit = self.positions.get(element)
+            if bit is None:
+                outside.append(element)
+            else:
+                buffer[bit >> 3] |= 1 << (bit & 7)
+        key = f"{int.from_bytes(buffer, 'little'):x}"
+        if outside:
+            key += repr(_canonical_order(outside))
+        return key
+
+
+def solution_key(
+    parent: Set[Hashable],
+    sets: List[Set[Hashable]],
+    config: SolverConfig,
+    fingerprint: Optional[CandidateFingerprint] = None,
+) -> str:
+    """
+    Compute the cache key of a set cover problem.
+
+    The key hashes the parent bitmask, the fingerprint of the candidate
+    bitmasks and the `RESULT_FIELDS` of the solver configuration, plus the
+    `EXACT_FIELDS` in exact mode. Elements are ordered canonically, so the
+    same problem gets the same key in every process.
+
+    Args:
+        parent (Set[Hashable]): The set that needs to be covered.
+        sets (List[Set[Hashable]]): List of available sets.
+        config (SolverConfig): Solver configuration.
+        fingerprint (Optional[CandidateFingerprint]): Fingerprint of `sets`,
+            computed here if None or made for another list.
+
+    Returns:
+        str: Hex digest identifying the problem.
+    """
+    if fingerprint is None or fingerprint.sets is not sets:
+        fingerprint = CandidateFingerprint(sets)
+
+    names = RESULT_FIELDS + (EXACT_FIELDS if config.mode == "exact" else ())
+    fields = {name: getattr(config, name) for name in names}
+
+    key = hashlib.blake2b(digest_size=20)
+    key.update(f"{fingerprint.parent_key(parent)}|".encode())
+    key.update(fingerprint.digest)
+    key.update(json.dumps(fields, sort_keys=True).encode())
+    return key.hexdigest()
+
+
+def _canonical_order(elements: Iterable[Hashable]) -> List[Hashable]:
+    """Sort elements, by their repr if they are not mutually comparable."""
+    try:
+        return sorted(elements)
+    except TypeError:
+        return sorted(elements, key=repr)
+
+
+class SolutionCache:
+    """
+    Two-tier cache of set cover solutions.
+
+    Solutions are stored as candidate indices. The memory tier is a bounded
+    LRU; the optional disk tier is an SQLite database that survives restarts
+    and is consulted on memory misses.
+    """
+
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of solutions kept in memory.
+            path (Optional[str]): SQLite file of the disk tier, None to disable it.
+
+        Raises:
+            ValueError: If max_entries is not positive.
+        """
+        if max_entries < 1:
+            raise ValueError("Cache size must be positive.")
+
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, CachedSolution]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self.connection: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self.connection = sqlite3.connect(path)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions "
+                "(key TEXT PRIMARY KEY, solution TEXT NOT NULL)"
+            )
+            self.connection.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered by either tier."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: str) -> Optional[CachedSolution]:
+        """
+        Look up a solution, promoting disk hits to the memory tier.
+
+        Args:
+            key (str): Key from `solution_key`.
+
+        Returns:
+            Optional[CachedSolution]: Candidate indices and proven-optimal flag,
+            or None on a miss.
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        if self.connection is not None:
+            row = self.connection.execute(
+                "SELECT solution FROM solutions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                cover, proven_optimal = json.loads(row[0])
+                self._remember(key, (cover, proven_optimal))
+                self.hits += 1
+                self.disk_hits += 1
+                return cover, proven_optimal
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, solution: CachedSolution, persist: bool = True) -> None:
+        """
+        Store a solution in the memory tier and, if persisted, the disk tier.
+
+        Args:
+            key (str): Key from `solution_key`.
+            solution (CachedSolution): Candidate indices and proven-optimal flag.
+            persist (bool): Whether to write the solution to the disk tier.
+        """
+        self._remember(key, solution)
+        if persist and self.connection is not None:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO solutions (key, solution) VALUES (?, ?)",
+                (key, json.dumps(list(solution))),
+            )
+            self.connection.commit()
+
+    def clear(self) -> None:
+        """Drop every stored solution and reset the counters."""
+        self.entries.clear()
+        self.hits = self.misses = self.disk_hits = 0
+        if self.connection is not None:
+            self.connection.execute("DELETE FROM solutions")
+            self.connection.commit()
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _remember(self, key: str, solution: CachedSolution) -> None:
+        """Insert into the memory tier, evicting the least recently used entry."""
+        self.entries[key] = solution
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class CachedSetCoverSolver(SetCoverSolver):
+    """SetCoverSolver answering repeated problems from a SolutionCache."""
+
+    def __init__(
+        self,
+        config: Optional[SolverConfig] = None,
+        cache: Optional[SolutionCache] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        stats_callback: Optional[Callable[[SolverStats], None]] = None,
+    ):
+        """
+        Initialize the solver with an optional configuration and cache.
+
+        Args:
+            config (Optional[SolverConfig]): Configuration settings for the solver.
+            cache (Optional[SolutionCache]): Cache to use, a new in-memory one if None.
+            cancel_token (Optional[CancellationToken]): Token that stops a solve early.
+            stats_callback (Optional[Callable[[SolverStats], None]]): Receives the
+                measurements after every solve that misses the cache.
+        """
+        super().__init__(config, cancel_token, stats_callback)
+        self.cache = cache if cache is not None else SolutionCache()
+        self._fingerprint: Optional[CandidateFingerprint] = None
+
+    def solve(self, parent: Set[int], sets: List[Set[int]]) -> List[Set[int]]:
+        """
+        Solve the set cover problem, reusing a cached solution when available.
+
+        The candidate fingerprint is computed once per `sets` list, which must
+        not be modified between calls. Partial covers of interrupted solves
+        are returned but never cached.
+        Exact covers whose search ran out of budget are kept in memory only,
+        so other processes search again instead of inheriting them.
+
+        Args:
+            parent (Set[int]): The set that needs to be covered.
+            sets (List[Set[int]]): List of available sets to use for covering.
+
+        Returns:
+            List[Set[int]]: List of sets that optimally cover the parent set.
+
+        Raises:
+            ValueError: If inputs are invalid.
+            RuntimeError: If a solution cannot be found within the maximum iterations.
+        """
+        SetCoverSolver._validate_inputs(self, parent, sets)
+
+        # The fingerprint is reused while the same `sets` list is passed
+        if self._fingerprint is None or self._fingerprint.sets is not sets:
+            self._fingerprint = CandidateFingerprint(sets)
+        key = solution_key(parent, sets, self.config, self._fingerprint)
+        cached = self.cache.get(key)
+        if cached is not None:
+            cover, self.proven_optimal = cached
+            self.original_parent = parent.copy()
+            self.partial = False
+            self.stats = None
+            return [sets[index] for index in cover]
+
+        results = super().solve(parent, sets)
+        if self.partial:
+            return results
+        index_of = {id(candidate_set): i for i, candidate_set in enumerate(sets)}
+        cover = [index_of[id(candidate_set)] for candidate_set in results]
+        self.cache.put(
+            key, (cover, self.proven_optimal), persist=self.proven_optimal is not False
+        )
+        return results
+
+    def _validate_inputs(self, parent: Set[int], sets: List[Set[int]]) -> None:
+        """Skip the check of `SetCoverSolver.solve`; `solve` validates first."""
@@ -0,0 +1,393 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.CreateClusters import weekday_cluster_table
+from src.MCSolver import SolverConfig
+from src.MatrixSolver import ClusterData
+
+# Built-in clusters that are not unions of weekdays, in flag bit order
+SPECIAL_CLUSTERS = ("Holidays", "Working days", "Days before Holidays")
+
+
+def _weekday_runs(subset: int) -> List[Tuple[int, int]]:
+    """
+    Split a weekday subset into maximal runs of consecutive days.
+
+    Runs wrap around the week, so Sunday and Monday are consecutive.
+
+    Args:
+        subset: Bitmask of weekdays, Monday in bit 0.
+
+    Returns:
+        First weekday and length of every run; one run of length 7 for the
+        whole week.
+    """
+    if subset == 0x7F:
+        return [(0, 7)]
+    runs = []
+    for first in range(7):
+        if subset >> first & 1 and not subset >> (first - 1) % 7 & 1:
+            length = 1
+            while subset >> (first + length) % 7 & 1:
+                length += 1
+            runs.append((first, length))
+    return runs
+
+
+@lru_cache(maxsize=None)
+def _weekly_unions() -> Tuple[NDArray, NDArray]:
+    """
+    Describe every union of weekday subset and special clusters.
+
+    Union `subset + 128 * flags` selects the days whose weekday is in the
+    subset or whose group shares a flag.
+
+    Returns:
+        Tuple[NDArray, NDArray]: Boolean 1024×56 day groups selected by
+        each union and the number of clusters it needs.
+    """
+    subsets = np.arange(128)
+    flags = np.arange(8)
+    group_weekday = np.arange(56) % 7
+    group_flags = np.arange(56) // 7
+
+    by_weekday = (subsets[:, None] >> group_weekday & 1).astype(bool)
+    by_flags = (flags[:, None] & group_flags) != 0
+    selected = (by_flags[:, None, :] | by_weekday[None, :, :]).reshape(1024, 56)
+
+    runs = np.array([len(_weekday_runs(subset)) for subset in subsets])
+    flag_counts = np.array([bin(flag).count("1") for flag in flags])
+    sizes = (flag_counts[:, None] + runs[None, :]).ravel()
+    selected.flags.writeable = False
+    sizes.flags.writeable = False
+    return selected, sizes
+
+
+@dataclass
+class Segment:
+    """Timetable period of a segmented range with its own cover."""
+
+    start: int  # First column of the period
+    end: int  # Last column of the period, inclusive
+    cover: List[int]  # Row indices of the selected clusters
+    cost: float  # `cover_cost` of the period, without `segment_weight`
+
+
+class WeeklyPeriodicitySolver:
+    """
+    Exact solver for covers built from weekday and holiday clusters.
+
+    Every union of the built-in clusters of `ClusterGenerator` is a weekday
+    subset together with some of `SPECIAL_CLUSTERS`, and a subset needs one
+    weekday cluster per run of consecutive weekdays ("All days" for the whole
+    week). Days are therefore grouped by weekday and holiday flags, and the
+    128 × 8 possible unions are scored at once from the running and idle day
+    counts of every group. The returned cover minimizes `cover_cost`:
+    `set_weight` per cluster plus the weighted missing and extra days.
+    Family clusters are not considered.
+    """
+
+    def __init__(self, config: Optional[SolverConfig] = None):
+        """
+        Initialize the WeeklyPeriodicitySolver with an optional configuration.
+
+        Args:
+            config (Optional[SolverConfig]): Weights of clusters, missing and
+                extra days.
+        """
+        self.config = config or SolverConfig()
+        self.cost: Optional[float] = None
+        self.costs: Optional[NDArray] = None
+
+    def solve(self, clusters: ClusterData, running_days: NDArray) -> List[int]:
+        """
+        Select the cheapest union of built-in clusters for the running days.
+
+        Args:
+            clusters (ClusterData): Output of `ClusterGenerator.create_clusters`,
+                not pruned, so every built-in cluster name is present.
+            running_days (NDArray): Boolean vector, True on days with service.
+
+        Returns:
+            List[int]: Row indices of the selected clusters, in row order.
+
+        Raises:
+            ValueError: If inputs are invalid.
+        """
+        running = np.asarray(running_days)
+        if running.ndim != 1:
+            raise ValueError("Running days must be a 1D array.")
+        cover = self.solve_batch(clusters, running[None, :])[0]
+        self.cost = float(self.costs[0])
+        return cover
+
+    def solve_batch(self, clusters: ClusterData, services: NDArray) -> List[List[int]]:
+        """
+        Select the cheapest union of built-in clusters for many services.
+
+        Args:
+            clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+            services (NDArray): Boolean S×D matrix, one running-day row per service.
+
+        Returns:
+            List[List[int]]: Row indices of the selected clusters, per service.
+            Their costs are kept in `costs`.
+
+        Raises:
+            ValueError: If inputs are invalid.
+        """
+        clusters_array, names, _ = clusters
+        matrix = np.asarray(clusters_array) != 0
+        running = np.asarray(services, dtype=bool)
+        if running.ndim != 2 or running.shape[1] != matrix.shape[1]:
+            raise ValueError("Running days must have one entry per cluster column.")
+        if not running.any(axis=1).all():
+            raise ValueError("Running days cannot be empty.")
+
+        rows = self._cluster_rows(names)
+        groups = self._day_groups(matrix, rows)
+        unions, selected, sizes = self._distinct_unions(groups)
+
+        # Running and idle days of every service in each of the 56 groups
+        one_hot = self._one_hot(groups)
+        costs = self._union_costs(running @ one_hot, (~running) @ one_hot, selected)
+        costs += self.config.set_weight * sizes
+
+        best = self._cheapest(costs, sizes)
+        self.costs = costs[np.arange(len(costs)), best]
+        return [self._cover(int(unions[union]), rows) for union in best]
+
+    def solve_segmented(
+        self, clusters: ClusterData, running_days: NDArray
+    ) -> List[Segment]:
+        """
+        Split the range into timetable periods, each with its own cover.
+
+        Dynamic programming chooses the periods minimizing the sum of their
+        covers' `cover_cost` plus `segment_weight` per period, with every
+        period at least `min_segment_days` long. Running and idle day counts
+        of every day group are kept as prefix sums, and so are the costs of
+        every union. The cheapest opening of a last period is carried per
+        union from one end column to the next, so the search is linear in the
+        number of days.
+
+        Args:
+            clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+            running_days (NDArray): Boolean vector, True on days with service.
+
+        Returns:
+            List[Segment]: Consecutive periods covering every column. The
+            total cost, including the period weights, is kept in `cost`.
+
+        Raises:
+            ValueError: If inputs are invalid.
+        """
+        clusters_array, names, _ = clusters
+        matrix = np.asarray(clusters_array) != 0
+        running = np.asarray(running_days, dtype=bool)
+        if running.ndim != 1 or len(running) != matrix.shape[1]:
+            raise ValueError("Running days must have one entry per cluster column.")
+        if not running.any():
+            raise ValueError("Running days cannot be empty.")
+        if self.config.min_segment_days < 1:
+            raise ValueError("Periods must be at least one day long.")
+
+        rows = self._cluster_rows(names)
+        groups = self._day_groups(matrix, rows)
+        unions, selected, sizes = self._distinct_unions(groups)
+
+        num_days = len(running)
+        one_hot = self._one_hot(groups)
+        prefix_running = np.zeros((num_days + 1, 56))
+        prefix_idle = np.zeros((num_days + 1, 56))
+        np.cumsum(one_hot * running[:, None], axis=0, out=prefix_running[1:])
+        np.cumsum(one_hot * ~running[:, None], axis=0, out=prefix_idle[1:])
+        prefix_costs = self._union_costs(prefix_running, prefix_idle, selected)
+        set_costs = self.config.set_weight * sizes
+
+        # best[end]: cheapest segmentation of the first `end` columns. A last
+        # period [start, end) covered by union u costs best[start] +
+        # prefix_costs[end, u] - prefix_costs[start, u], so the cheapest
+        # best[start] - prefix_costs[start, u] over the allowed starts is kept
+        # per union and extended by one start per end column.
+        min_days = min(self.config.min_segment_days, num_days)
+        best = np.full(num_days + 1, np.inf)
+        best[0] = 0.0
+        starts = np.zeros(num_days + 1, dtype=int)
+        open_costs = np.full(len(unions), np.inf)
+        open_starts = np.zeros(len(unions), dtype=int)
+        for end in range(min_days, num_days + 1):
+            start = end - min_days
+            candidate = best[start] - prefix_costs[start]
+            better = candidate < open_costs
+            open_costs[better] = candidate[better]
+            open_starts[better] = start
+
+            totals = open_costs + prefix_costs[end] + set_costs
+            lowest = totals.min()
+            # Among equally cheap periods, the earliest start as before
+            start = int(open_starts[totals == lowest].min())
+            best[end] = lowest + self.config.segment_weight
+            starts[end] = start
+
+        bounds = []
+        end = num_days
+        while end > 0:
+            bounds.append((starts[end], end))
+            end = starts[end]
+
+        segments = []
+        for start, end in reversed(bounds):
+            costs = prefix_costs[end] - prefix_costs[start] + set_costs
+            union = self._cheapest(costs[None, :], sizes)[0]
+            cover = self._cover(int(unions[union]), rows)
+            segments.append(
+                Segment(int(start), int(end) - 1, cover, float(costs[union]))
+            )
+        self.cost = float(best[num_days])
+        return segments
+
+    def _union_costs(
+        self, running_counts: NDArray, idle_counts: NDArray, selected: NDArray
+    ) -> NDArray:
+        """Weighted missing and extra days of every union, per row of counts."""
+        missing = running_counts @ (~selected).T
+        extra = idle_counts @ selected.T
+        return self.config.missing_weight * missing + self.config.extra_weight * extra
+
+    @staticmethod
+    def _one_hot(groups: NDArray) -> NDArray:
+        """D×56 indicator matrix of the group of every day."""
+        one_hot = np.zeros((len(groups), 56))
+        one_hot[np.arange(len(groups)), groups] = 1.0
+        return one_hot
+
+    @staticmethod
+    def _distinct_unions(groups: NDArray) -> Tuple[NDArray, NDArray, NDArray]:
+        """
+        Drop unions selecting the same days as a union of fewer clusters.
+
+        Unions that differ only on groups without days in the range are
+        equivalent, e.g. "Holidays" and "Sunday" when no holiday falls on
+        another day.
+
+        Args:
+            groups (NDArray): Output of `_day_groups`.
+
+        Returns:
+            Tuple[NDArray, NDArray, NDArray]: Ids of the kept unions in
+            increasing order, their selected groups and their sizes.
+        """
+        selected, sizes = _weekly_unions()
+        order = np.argsort(sizes, kind="stable")
+        keys = np.packbits(selected[order][:, np.unique(groups)], axis=1)
+        _, first = np.unique(keys, axis=0, return_index=True)
+        unions = np.sort(order[first])
+        return unions, selected[unions], sizes[unions]
+
+    @staticmethod
+    def _cheapest(costs: NDArray, sizes: NDArray) -> NDArray:
+        """Cheapest union per row of costs, then the one with the fewest clusters."""
+        cheapest = costs == costs.min(axis=1, keepdims=True)
+        return np.argmin(np.where(cheapest, sizes, np.inf), axis=1)
+
+    def _cluster_rows(self, names: List[str]) -> Dict[object, int]:
+        """
+        Map weekday bitmasks and special cluster names to matrix rows.
+
+        Args:
+            names (List[str]): Cluster names, weekday names first.
+
+        Returns:
+            Dict[object, int]: Row of every weekday subset that is a single
+            cluster, keyed by bitmask, and of every special cluster.
+
+        Raises:
+            ValueError: If a built-in cluster is missing.
+        """
+        table_names, table = weekday_cluster_table(tuple(names[:7]))
+        rows: Dict[object, int] = {}
+        try:
+            for name, membership in zip(table_names, table):
+                rows[int(membership @ (1 << np.arange(7)))] = names.index(name)
+            rows[0x7F] = names.index("All days")
+            for name in SPECIAL_CLUSTERS:
+                rows[name] = names.index(name)
+        except ValueError as error:
+            raise ValueError(f"Clusters lack a built-in cluster: {error}") from error
+        return rows
+
+    def _day_groups(self, matrix: NDArray, rows: Dict[object, int]) -> NDArray:
+        """
+        Group every day by weekday and special cluster membership.
+
+        Args:
+            matrix (NDArray): Boolean cluster matrix.
+            rows (Dict[object, int]): Output of `_cluster_rows`.
+
+        Returns:
+            NDArray: Group `weekday + 7 * flags` of every day, where bit k of
+            the flags is membership in `SPECIAL_CLUSTERS[k]`.
+        """
+        weekday = np.argmax(matrix[[rows[1 << day] for day in range(7)]], axis=0)
+        flags = sum(
+            matrix[rows[name]].astype(int) << bit
+            for bit, name in enumerate(SPECIAL_CLUSTERS)
+        )
+        return weekday + 7 * flags
+
+    def _cover(self, union: int, rows: Dict[object, int]) -> List[int]:
+        """Row indices of the clusters forming a union."""
+        flags, subset = divmod(union, 128)
+        cover = [
+            rows[sum(1 << (first + offset) % 7 for offset in range(length))]
+            for first, length in _weekday_runs(subset)
+        ]
+        cover += [
+            rows[name] for bit, name in enumerate(SPECIAL_CLUSTERS) if flags >> bit & 1
+        ]
+        return sorted(cover)
+
+
+def solve_weekly_cover(
+    clusters: ClusterData,
+    running_days: NDArray,
+    config: Optional[SolverConfig] = None,
+) -> List[int]:
+    """
+    Convenience function to find the exact weekly-periodic cover.
+
+    Args:
+        clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+        running_days (NDArray): Boolean vector, True on days with service.
+        config (Optional[SolverConfig]): Optional solver configuration.
+
+    Returns:
+        List[int]: Row indices of the selected clusters.
+    """
+    solver = WeeklyPeriodicitySolver(config)
+    return solver.solve(clusters, running_days)
+
+
+def solve_segmented_cover(
+    clusters: ClusterData,
+    running_days: NDArray,
+    config: Optional[SolverConfig] = None,
+) -> List[Segment]:
+    """
+    Convenience function to split a range into timetable periods.
+
+    Args:
+        clusters (ClusterData): Output of `ClusterGenerator.create_clusters`.
+        running_days (NDArray): Boolean vector, True on days with service.
+        config (Optional[SolverConfig]): Optional solver configuration.
+
+    Returns:
+        List[Segment]: Consecutive periods, each with its own cover.
+    """
+    solver = WeeklyPeriodicitySolver(config)
+    return solver.solve_segmented(clusters, running_days)
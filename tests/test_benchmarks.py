@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks.run_benchmarks import (
+    BenchmarkConfig,
+    PATTERNS,
+    main,
+    make_services,
+    run_benchmarks,
+)
+from src.CreateClusters import ClusterConfig, ClusterGenerator
+
+
+@pytest.fixture
+def small_config():
+    """Create a benchmark configuration that runs in well under a second."""
+    return BenchmarkConfig(
+        horizons=[7, 31], extra_candidates=[0, 10], services=3, repeats=2
+    )
+
+
+class TestBenchmarks:
+    def test_report_covers_every_case(self, small_config):
+        """Test that every horizon, candidate count and pattern is measured."""
+        report = run_benchmarks(small_config)
+        results = report["results"]
+
+        generation = [r for r in results if r["benchmark"] == "create_clusters"]
+        solving = [r for r in results if r["benchmark"] == "solve_set_cover"]
+        assert [(r["horizon"], r["library"]) for r in generation] == [
+            (7, "cold"),
+            (7, "warm"),
+            (7, "view"),
+            (31, "cold"),
+            (31, "warm"),
+            (31, "view"),
+        ]
+        assert len(solving) == 2 * 2 * len(PATTERNS)
+        assert {r["candidates"] for r in solving} == {46, 56}
+
+        for record in results:
+            latency = record["latency_ms"]
+            assert latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+            assert record["peak_memory_kib"] > 0
+        assert report["config"]["solver"]["engine"] == "set"
+
+    def test_service_patterns(self):
+        """Test that synthetic services are non-empty and follow their pattern."""
+        clusters_array, names, _ = ClusterGenerator(
+            ClusterConfig(year=2024)
+        ).create_clusters(1, 366)
+        clusters = clusters_array != 0
+        holidays = clusters[names.index("Holidays")]
+        rng = np.random.default_rng(0)
+
+        weekday = make_services(clusters, names, "weekday", 10, rng, 0.05)
+        assert weekday.any(axis=1).all()
+        assert all(any((row == c).all() for c in clusters) for row in weekday)
+
+        holiday = make_services(clusters, names, "holiday", 10, rng, 0.05)
+        assert holiday.any(axis=1).all()
+        assert 0 < (holiday & holidays).sum() < holidays.sum() * 10
+
+        with pytest.raises(ValueError):
+            make_services(clusters, names, "unknown", 10, rng, 0.05)
+
+    def test_main_writes_json(self, tmp_path, capsys):
+        """Test that the command line saves a readable JSON report."""
+        output = tmp_path / "results.json"
+        main(
+            [
+                "--output",
+                str(output),
+                "--horizons",
+                "7",
+                "--extra-candidates",
+                "0",
+                "--services",
+                "2",
+                "--repeats",
+                "2",
+            ]
+        )
+        report = json.loads(output.read_text())
+        assert len(report["results"]) == 3 + len(PATTERNS)
+        assert "commit" in report["metadata"]
+        assert "create_clusters" in capsys.readouterr().out
@@ -0,0 +1,218 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from src.ClusterFamilies import (
+    EVERY_SECOND_WEEKDAY,
+    NTH_WEEKDAY_OF_MONTH,
+    WORKING_DAY_OF_MONTH,
+    CalendarDays,
+    DateRanges,
+    DayCondition,
+    EveryNthWeek,
+    Months,
+    NthWeekdayOfMonth,
+    NthWorkingDayOfMonth,
+    Weekday,
+    WorkingDays,
+    cluster_family,
+    school_term_weekdays,
+    weekdays_in_months,
+)
+from src.CreateClusters import ClusterConfig, ClusterGenerator, create_range_clusters
+
+
+@pytest.fixture
+def days():
+    """Create the calendar days of 2024 with Polish holidays."""
+    generator = ClusterGenerator(ClusterConfig(year=2024))
+    clusters, names, indices = generator.create_clusters(1, 366, "bool")
+    return CalendarDays(
+        ordinals=indices + date(2023, 12, 31).toordinal(),
+        holidays=clusters[names.index("Holidays")],
+        working_days=clusters[names.index("Working days")],
+    )
+
+
+def selected_dates(mask, days):
+    """Convert a day mask to dates."""
+    return [date.fromordinal(int(o)) for o in days.ordinals[mask]]
+
+
+class TestCalendarDays:
+    def test_attributes_match_datetime(self, days):
+        """Test vectorized calendar attributes against datetime."""
+        dates = [date.fromordinal(int(o)) for o in days.ordinals]
+        assert days.weekday.tolist() == [d.weekday() for d in dates]
+        assert days.month.tolist() == [d.month for d in dates]
+        assert days.day.tolist() == [d.day for d in dates]
+        assert np.diff(days.week).tolist() == [int(d.weekday() == 0) for d in dates[1:]]
+
+
+class TestConditions:
+    def test_every_second_weekday(self, days):
+        """Test alternating weekdays on odd weeks."""
+        mask = (Weekday("Monday") & EveryNthWeek(2, 1)).mask(days)
+        result = selected_dates(mask, days)
+        assert result[:3] == [date(2024, 1, 1), date(2024, 1, 15), date(2024, 1, 29)]
+        assert all(b - a == timedelta(14) for a, b in zip(result, result[1:]))
+
+    def test_every_second_weekday_across_years(self):
+        """Test that alternation survives a year with 53 ISO weeks (2020)."""
+        config = ClusterConfig(year=2021, families=(EVERY_SECOND_WEEKDAY,))
+        clusters, names, indices = create_range_clusters(
+            date(2020, 12, 1), date(2021, 12, 31), config
+        )
+        for name in ("every 2nd Friday (odd weeks)", "every 2nd Friday (even weeks)"):
+            result = [
+                date.fromordinal(int(o))
+                for o in indices[clusters[names.index(name)] != 0]
+            ]
+            assert all(b - a == timedelta(14) for a, b in zip(result, result[1:]))
+        odd = clusters[names.index("every 2nd Friday (odd weeks)")]
+        ordinals = indices[odd != 0].tolist()
+        assert date(2021, 1, 1).toordinal() not in ordinals  # ISO week 53
+        assert date(2021, 1, 8).toordinal() in ordinals
+
+    def test_fridays_in_summer(self, days):
+        """Test weekdays restricted to a month range."""
+        result = selected_dates((Weekday(4) & Months(7, 8)).mask(days), days)
+        assert len(result) == 9
+        assert all(d.weekday() == 4 and d.month in (7, 8) for d in result)
+
+    def test_month_range_wraps_year_end(self, days):
+        """Test that a November–February range wraps around the year end."""
+        result = selected_dates(Months(11, 2).mask(days), days)
+        assert {d.month for d in result} == {11, 12, 1, 2}
+        assert str(Months(11, 2)) == "November–February"
+
+    def test_nth_weekday_of_month(self, days):
+        """Test first and last weekday occurrences in a month."""
+        first = selected_dates((Weekday(0) & NthWeekdayOfMonth(1)).mask(days), days)
+        last = selected_dates((Weekday(0) & NthWeekdayOfMonth(-1)).mask(days), days)
+        assert len(first) == len(last) == 12
+        assert all(d.day <= 7 for d in first)
+        assert all((d + timedelta(7)).month != d.month for d in last)
+
+    def test_working_days_of_month(self, days):
+        """Test first and last working days, skipping holidays."""
+        first = selected_dates(NthWorkingDayOfMonth(1).mask(days), days)
+        last = selected_dates(NthWorkingDayOfMonth(-1).mask(days), days)
+        assert first[0] == date(2024, 1, 2)  # 1 January is a holiday
+        assert first[4] == date(2024, 5, 2)  # 1 May is a holiday
+        assert last[1] == date(2024, 2, 29)
+        assert len(first) == len(last) == 12
+
+    def test_condition_is_abstract(self):
+        """Test that a condition must implement mask."""
+        with pytest.raises(TypeError):
+            DayCondition()
+
+    def test_composition(self, days):
+        """Test that conditions compose with and, or and not."""
+        weekend = Weekday(5) | Weekday(6)
+        np.testing.assert_array_equal((~weekend).mask(days), days.weekday < 5)
+        np.testing.assert_array_equal(
+            (WorkingDays() & weekend).mask(days), np.zeros(366, dtype=bool)
+        )
+
+    def test_key(self):
+        """Test that keys are plain tuples following the condition's fields."""
+        condition = (Weekday("Friday") & Months(6, 8)) | ~WorkingDays()
+        assert condition.key() == (
+            "AnyOf",
+            (
+                ("AllOf", (("Weekday", "Friday"), ("Months", 6, 8))),
+                ("Not", ("WorkingDays",)),
+            ),
+        )
+        assert (
+            condition.key()
+            == ((Weekday("Friday") & Months(6, 8)) | ~WorkingDays()).key()
+        )
+        assert DateRanges(((date(2024, 9, 2), date(2024, 12, 20)),)).key() == (
+            "DateRanges",
+            (("2024-09-02", "2024-12-20"),),
+            "date ranges",
+        )
+
+    def test_key_needs_dataclass(self):
+        """Test that conditions without fields to key must define key()."""
+
+        class Everyday(DayCondition):
+            def mask(self, days):
+                return np.ones(len(days.ordinals), dtype=bool)
+
+        with pytest.raises(NotImplementedError):
+            Everyday().key()
+
+
+class TestClusterFamily:
+    def test_name_templates(self, days):
+        """Test that members are named from their grid values."""
+        names, clusters = weekdays_in_months(Months(7, 8)).build(days)
+        assert names[4] == "Fridays in July–August"
+        assert clusters.shape == (7, 366)
+
+        names, _ = EVERY_SECOND_WEEKDAY.build(days)
+        assert names[:2] == [
+            "every 2nd Monday (odd weeks)",
+            "every 2nd Monday (even weeks)",
+        ]
+        names, _ = NTH_WEEKDAY_OF_MONTH.build(days)
+        assert "last Sunday of the month" in names
+        names, _ = WORKING_DAY_OF_MONTH.build(days)
+        assert names == [
+            "first working day of the month",
+            "last working day of the month",
+        ]
+
+    def test_school_term_weekdays(self, days):
+        """Test weekdays inside school terms."""
+        terms = [
+            (date(2024, 1, 8), date(2024, 6, 21)),
+            (date(2024, 9, 2), date(2024, 12, 20)),
+        ]
+        names, clusters = school_term_weekdays(terms).build(days)
+        assert names[0] == "Mondays in school term"
+        assert names[-1] == "working days in school term"
+        result = selected_dates(clusters[-1], days)
+        assert result[0] == date(2024, 1, 8)
+        assert date(2024, 7, 15) not in result
+        assert date(2024, 11, 11) not in result  # Holiday
+
+    def test_custom_family(self, days):
+        """Test a user-defined family built from a condition factory."""
+        family = cluster_family(
+            "{days} except the {nth} one",
+            lambda days, nth: days & ~nth,
+            days=[Weekday(6)],
+            nth=[NthWeekdayOfMonth(1), NthWeekdayOfMonth(-1)],
+        )
+        names, clusters = family.build(days)
+        assert names == ["Sundays except the first one", "Sundays except the last one"]
+        assert clusters.sum(axis=1).tolist() == [52 - 12, 52 - 12]
+
+    def test_generator_appends_families(self):
+        """Test that configured families extend the cluster library."""
+        config = ClusterConfig(
+            year=2024, families=(weekdays_in_months(Months(7, 8)), WORKING_DAY_OF_MONTH)
+        )
+        clusters, names, _ = ClusterGenerator(config).create_clusters(1, 31)
+        assert len(names) == 46 + 7 + 2
+        assert names[45] == "All days"
+        assert clusters[names.index("Fridays in July–August")].sum() == 0
+        assert clusters[names.index("first working day of the month")].tolist()[1] == 1
+
+    def test_thousands_of_candidates(self, days):
+        """Test that large families are generated in one pass."""
+        family = weekdays_in_months(
+            *[Months(a, b) for a in range(1, 13) for b in range(1, 13)]
+        )
+        names, clusters = family.build(days)
+        assert len(names) == 7 * 144
+        assert clusters.shape == (1008, 366)
+        np.testing.assert_array_equal(
+            clusters[names.index("Mondays in January–December")], days.weekday == 0
+        )
@@ -1,6 +1,6 @@
 import pytest
 import numpy as np
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 import os
 import sys
@@ -8,7 +8,20 @@ import sys
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
-from src.CreateClusters import ClusterGenerator, ClusterConfig
+from src.CreateClusters import (
+    ClusterGenerator,
+    ClusterConfig,
+    LIBRARY_CACHE_SIZE,
+    _load_cluster_library,
+    clear_cluster_library_cache,
+    create_range_clusters,
+    get_cluster_library,
+    intersection_counts,
+    iter_range_clusters,
+    pack_clusters,
+    popcount,
+    unpack_clusters,
+)
 
 
 @pytest.fixture
@@ -62,6 +75,30 @@ class TestClusterGenerator:
         assert len(triples) == 7
         assert all("from" in name and "to" in name for name in triples.keys())
 
+    def test_weekday_masks_match_calendar(self, leap_year_generator):
+        """Test that vectorized weekday masks agree with datetime."""
+        clusters = leap_year_generator._create_single_day_clusters()
+        for day_index, day_name in enumerate(leap_year_generator.config.weekdays):
+            expected = [
+                (datetime(2020, 1, 1) + timedelta(days=i)).weekday() == day_index
+                for i in range(366)
+            ]
+            np.testing.assert_array_equal(clusters[day_name], expected)
+
+    def test_multi_day_clusters_wrap_around_week(self, default_generator):
+        """Test that consecutive-day clusters sum their weekday masks circularly."""
+        singles = default_generator._create_single_day_clusters()
+        quadruples = default_generator._create_multi_day_clusters(4)
+
+        np.testing.assert_array_equal(
+            quadruples["from Saturday to Tuesday"],
+            singles["Saturday"]
+            + singles["Sunday"]
+            + singles["Monday"]
+            + singles["Tuesday"],
+        )
+        assert "Sunday and Monday" in default_generator._create_multi_day_clusters(2)
+
     def test_special_clusters(self, default_generator):
         """Test creation of special clusters."""
         working_days = np.ones(365)
@@ -154,3 +191,209 @@ class TestClusterGenerator:
         assert clusters.shape[1] == 365
         assert indices[0] == 1
         assert indices[-1] == 365
+
+
+class TestClusterLibrary:
+
+    def test_library_built_once_per_year(self):
+        """Test that many ranges over several years build each library once."""
+        clear_cluster_library_cache()
+        for year in range(2020, 2025):
+            generator = ClusterGenerator(ClusterConfig(year=year))
+            for start in range(1, 300, 7):
+                generator.create_clusters(start, start + 30)
+            ClusterGenerator(ClusterConfig(year=year)).create_clusters(1, 10)
+
+        assert _load_cluster_library.cache_info().misses == 5
+
+    def test_slices_are_read_only_views(self, default_generator):
+        """Test that create_clusters returns zero-copy read-only views."""
+        library = get_cluster_library(default_generator.config)
+        clusters, names, indices = default_generator.create_clusters(32, 59)
+
+        assert np.shares_memory(clusters, library.float_clusters)
+        assert np.shares_memory(indices, library.day_indices)
+        assert not clusters.flags.writeable
+        with pytest.raises(ValueError):
+            clusters[0, 0] = 1
+        names.append("Extra")
+        assert "Extra" not in library.names
+
+    def test_library_keyed_by_holidays(self, default_generator):
+        """Test that a different holiday list gets its own library."""
+        first = get_cluster_library(default_generator.config)
+        default_generator.config.holidays = ["01/01"]
+        second = get_cluster_library(default_generator.config)
+
+        assert first is not second
+        assert first is get_cluster_library(ClusterConfig(year=2021))
+
+    def test_library_cache_is_bounded(self):
+        """Test that the least recently used libraries are evicted."""
+        clear_cluster_library_cache()
+        for year in range(2000, 2001 + LIBRARY_CACHE_SIZE):
+            get_cluster_library(ClusterConfig(year=year))
+
+        assert _load_cluster_library.cache_info().currsize == LIBRARY_CACHE_SIZE
+
+    def test_bool_and_packed_layouts(self, default_generator):
+        """Test that every layout holds the same days."""
+        floats, names, _ = default_generator.create_clusters(10, 100)
+        bools, bool_names, _ = default_generator.create_clusters(10, 100, "bool")
+        packed, _, indices = default_generator.create_clusters(10, 100, "packed")
+
+        assert bools.dtype == np.bool_ and packed.dtype == np.uint8
+        assert packed.shape == (len(names), 12)
+        assert bool_names == names
+        np.testing.assert_array_equal(bools, floats != 0)
+        np.testing.assert_array_equal(unpack_clusters(packed, len(indices)), bools)
+        with pytest.raises(ValueError):
+            default_generator.create_clusters(1, 10, "sparse")
+
+    def test_packed_popcount_intersections(self, default_generator):
+        """Test popcount helpers against the unpacked matrix."""
+        clusters, _, _ = default_generator.create_clusters(1, 365, "bool")
+        packed = pack_clusters(clusters)
+        rng = np.random.default_rng(0)
+        services = rng.random((5, 365)) < 0.3
+
+        np.testing.assert_array_equal(popcount(packed), clusters.sum(axis=1))
+        np.testing.assert_array_equal(
+            intersection_counts(packed, pack_clusters(services[0])),
+            (clusters & services[0]).sum(axis=1),
+        )
+        np.testing.assert_array_equal(
+            intersection_counts(packed, pack_clusters(services)),
+            clusters.astype(int) @ services.T.astype(int),
+        )
+
+
+class TestClusterView:
+
+    @pytest.mark.parametrize("year", [2021, 2024])
+    @pytest.mark.parametrize(
+        "start,end", [(1, 7), (59, 62), (100, 160), (359, 365), (1, 365)]
+    )
+    @pytest.mark.parametrize("layout", ["float", "bool", "packed"])
+    def test_matches_create_clusters(self, year, start, end, layout):
+        """Test that views generate the same clusters as the library."""
+        config = ClusterConfig(year=year, holidays=["24/12", "31/12"])
+        generator = ClusterGenerator(config)
+        expected = generator.create_clusters(start, end, layout)
+        clusters, names, indices = generator.create_cluster_view(
+            start, end
+        ).materialize(layout)
+
+        assert names == expected[1]
+        assert clusters.dtype == expected[0].dtype
+        np.testing.assert_array_equal(clusters, expected[0])
+        np.testing.assert_array_equal(indices, expected[2])
+
+    def test_does_not_build_library(self, default_generator):
+        """Test that a short view generates only its own columns."""
+        clear_cluster_library_cache()
+        view = default_generator.create_cluster_view(1, 7)
+        clusters, names, _ = view.materialize("bool")
+
+        assert clusters.shape == view.shape == (len(names), 7)
+        assert _load_cluster_library.cache_info().currsize == 0
+        np.testing.assert_array_equal(
+            view.row("Holidays"), [1, 0, 1, 0, 0, 1, 0]  # 3 Jan is a Sunday
+        )
+        np.testing.assert_array_equal(view.row("Days before Holidays"), clusters[-2])
+        with pytest.raises(KeyError):
+            view.row("Leap days")
+
+    def test_invalid_view(self, default_generator):
+        """Test that views validate their range and layout."""
+        with pytest.raises(ValueError):
+            default_generator.create_cluster_view(0, 7)
+        with pytest.raises(ValueError):
+            default_generator.create_cluster_view(1, 7).materialize("sparse")
+
+
+class TestRangeClusters:
+
+    def test_cross_year_range_matches_year_slices(self):
+        """Test that a December-to-December range joins the yearly clusters."""
+        config = ClusterConfig(year=2021)
+        clusters, names, ordinals = create_range_clusters(
+            date(2020, 12, 1), date(2021, 12, 31), config
+        )
+        first, _, _ = ClusterGenerator(ClusterConfig(year=2020)).create_clusters(
+            336, 366
+        )
+        second, _, _ = ClusterGenerator(ClusterConfig(year=2021)).create_clusters(
+            1, 365
+        )
+
+        assert clusters.shape == (46, 396)
+        np.testing.assert_array_equal(clusters, np.hstack([first, second]))
+        assert ordinals[0] == date(2020, 12, 1).toordinal()
+        np.testing.assert_array_equal(np.diff(ordinals), 1)
+        assert names == ClusterGenerator(config).create_clusters(1, 1)[1]
+
+    def test_holidays_resolved_per_year(self):
+        """Test that fixed-date holidays and Sundays follow each year."""
+        config = ClusterConfig(year=2021, holidays=["11/11"], region=None)
+        clusters, names, ordinals = create_range_clusters(
+            date(2019, 1, 1), date(2023, 12, 31), config, "bool"
+        )
+        holidays = {
+            date.fromordinal(day)
+            for day in ordinals[clusters[names.index("Holidays")]].tolist()
+        }
+
+        for year in range(2019, 2024):
+            assert date(year, 11, 11) in holidays
+        assert all(
+            day.weekday() == 6 or (day.month, day.day) == (11, 11) for day in holidays
+        )
+
+    def test_streams_one_chunk_per_year(self):
+        """Test that generation is streamed year by year."""
+        chunks = list(
+            iter_range_clusters(
+                date(2020, 12, 30), date(2030, 1, 2), ClusterConfig(year=2021)
+            )
+        )
+        assert len(chunks) == 11
+        assert [len(ordinals) for _, _, ordinals in chunks[:2]] == [2, 365]
+        assert chunks[-1][2][-1] == date(2030, 1, 2).toordinal()
+
+    def test_day_before_holidays_crosses_new_year(self):
+        """Test that 31 December looks at 1 January of the following year."""
+        config = ClusterConfig(year=2022, holidays=["25/12"], region=None)
+        clusters, names, _ = create_range_clusters(
+            date(2022, 12, 30), date(2023, 1, 2), config
+        )
+        # 1 January 2023 is a Sunday, 1 January 2022 was not a holiday
+        np.testing.assert_array_equal(
+            clusters[names.index("Days before Holidays")], [0, 1, 0, 0]
+        )
+
+        packed, _, _ = create_range_clusters(
+            date(2022, 12, 30), date(2023, 1, 2), config, "packed"
+        )
+        np.testing.assert_array_equal(unpack_clusters(packed, 4), clusters != 0)
+
+    def test_year_end_skips_following_library(self):
+        """Test that 1 January is resolved without the next year's library."""
+        config = ClusterConfig(year=2024, holidays=["01/01"], region=None)
+        clear_cluster_library_cache()
+        clusters, names, _ = create_range_clusters(
+            date(2024, 12, 30), date(2024, 12, 31), config
+        )
+        # 1 January 2025 is a Wednesday, a holiday through `config.holidays`
+        np.testing.assert_array_equal(
+            clusters[names.index("Days before Holidays")], [0, 1]
+        )
+        assert _load_cluster_library.cache_info().currsize == 1
+
+    def test_invalid_range(self):
+        """Test validation of reversed ranges and unknown layouts."""
+        config = ClusterConfig(year=2021)
+        with pytest.raises(ValueError):
+            create_range_clusters(date(2021, 2, 1), date(2021, 1, 1), config)
+        with pytest.raises(ValueError):
+            create_range_clusters(date(2021, 1, 1), date(2021, 2, 1), config, "int")
@@ -0,0 +1,152 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from src.CreateClusters import ClusterConfig, ClusterGenerator
+from src.Holidays import (
+    HolidayCalendar,
+    Years,
+    date_string_day_indices,
+    easter_sundays,
+    get_holiday_table,
+    holiday_day_indices,
+    holiday_ordinals,
+)
+
+
+def easter_reference(year):
+    """Compute Easter Sunday with the same algorithm on plain integers."""
+    a, b, c = year % 19, year // 100, year % 100
+    h = (19 * a + b - b // 4 - (b - (b + 8) // 25 + 1) // 3 + 15) % 30
+    l = (32 + 2 * (b % 4) + 2 * (c // 4) - h - c % 4) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    return date(year, (h + l - 7 * m + 114) // 31, (h + l - 7 * m + 114) % 31 + 1)
+
+
+class TestHolidays:
+    @pytest.mark.parametrize(
+        "year,expected",
+        [
+            (2021, date(2021, 4, 4)),
+            (2024, date(2024, 3, 31)),
+            (2025, date(2025, 4, 20)),
+            (2038, date(2038, 4, 25)),
+            (2285, date(2285, 3, 22)),
+        ],
+    )
+    def test_easter_sunday(self, year, expected):
+        """Test Easter Sunday against known dates, including the extremes."""
+        assert date.fromordinal(int(easter_sundays(np.array([year]))[0])) == expected
+
+    def test_easter_is_vectorized(self):
+        """Test that a whole range of years is computed at once."""
+        years = np.arange(1900, 2100)
+        result = easter_sundays(years)
+        assert [date.fromordinal(int(o)) for o in result] == [
+            easter_reference(int(y)) for y in years
+        ]
+        assert all(date.fromordinal(int(o)).weekday() == 6 for o in result)
+
+    def test_polish_holidays_2021(self):
+        """Test that the PL region reproduces the 2021 holiday list."""
+        expected = [
+            "01/01",
+            "06/01",
+            "04/04",
+            "05/04",
+            "01/05",
+            "03/05",
+            "23/05",
+            "03/06",
+            "15/08",
+            "01/11",
+            "11/11",
+            "25/12",
+            "26/12",
+        ]
+        np.testing.assert_array_equal(
+            holiday_day_indices("PL", 2021), date_string_day_indices(2021, expected)
+        )
+
+    @pytest.mark.parametrize(
+        "year,epiphany,christmas_eve",
+        [(2010, False, False), (2024, True, False), (2025, True, True)],
+    )
+    def test_polish_holidays_by_law(self, year, epiphany, christmas_eve):
+        """Test that Epiphany counts from 2011 and Christmas Eve from 2025."""
+        days = holiday_day_indices("PL", year).tolist()
+        epiphany_day, christmas_eve_day = date_string_day_indices(
+            year, ["06/01", "24/12"]
+        ).tolist()
+        assert (epiphany_day in days) == epiphany
+        assert (christmas_eve_day in days) == christmas_eve
+        assert len(days) == 12 + epiphany + christmas_eve
+
+    def test_year_ranges(self):
+        """Test holidays observed in a range of years only."""
+        calendar = HolidayCalendar(
+            fixed=((1, 1), (2, 1, Years(first=2023, last=2023))),
+            easter_offsets=(0, (1, Years(last=2022))),
+        )
+        result = holiday_ordinals(calendar, np.array([2022, 2023]))
+        assert [date.fromordinal(int(o)) for o in result] == [
+            date(2022, 1, 1),
+            date(2022, 4, 17),
+            date(2022, 4, 18),
+            date(2023, 1, 1),
+            date(2023, 1, 2),
+            date(2023, 4, 9),
+        ]
+
+    def test_movable_feasts_follow_easter(self):
+        """Test that Easter Monday and Corpus Christi move with Easter."""
+        for year in (2022, 2024, 2030):
+            easter = easter_reference(year)
+            days = {
+                date(year, 1, 1) + timedelta(days=int(i) - 1)
+                for i in holiday_day_indices("PL", year)
+            }
+            assert easter + timedelta(days=1) in days
+            assert easter + timedelta(days=60) in days
+
+    def test_table_is_cached_and_read_only(self):
+        """Test that each region's table is built once and cannot be changed."""
+        table = get_holiday_table("PL")
+        assert get_holiday_table("PL") is table
+        assert not table.flags.writeable
+        with pytest.raises(ValueError):
+            get_holiday_table("XX")
+        with pytest.raises(ValueError):
+            holiday_day_indices("PL", 1000)
+
+    def test_calendar_without_easter(self):
+        """Test a calendar with fixed holidays only."""
+        calendar = HolidayCalendar(fixed=((25, 12), (1, 1)))
+        result = holiday_ordinals(calendar, np.array([2023, 2024]))
+        assert [date.fromordinal(int(o)) for o in result] == [
+            date(2023, 1, 1),
+            date(2023, 12, 25),
+            date(2024, 1, 1),
+            date(2024, 12, 25),
+        ]
+
+    def test_invalid_date_strings(self):
+        """Test that malformed or impossible dates are rejected."""
+        with pytest.raises(ValueError):
+            date_string_day_indices(2021, ["29/02"])
+        with pytest.raises(ValueError):
+            date_string_day_indices(2021, ["1-1"])
+        assert date_string_day_indices(2024, ["29/02"]).tolist() == [60]
+
+    def test_special_clusters_use_region(self):
+        """Test that the Holidays cluster follows the region in every year."""
+        generator = ClusterGenerator(ClusterConfig(year=2024))
+        clusters, names, _ = generator.create_clusters(1, 366)
+        holidays = clusters[names.index("Holidays")]
+
+        assert holidays[date(2024, 4, 1).timetuple().tm_yday - 1] == 1  # Easter Monday
+        assert holidays[date(2024, 4, 5).timetuple().tm_yday - 1] == 0  # 2021's date
+        assert (
+            holidays[date(2024, 5, 30).timetuple().tm_yday - 1] == 1
+        )  # Corpus Christi
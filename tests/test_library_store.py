@@ -0,0 +1,171 @@
+import os
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.ClusterFamilies import WORKING_DAY_OF_MONTH, school_term_weekdays
+from src.CreateClusters import (
+    ClusterConfig,
+    _load_cluster_library,
+    attach_cluster_store,
+    clear_cluster_library_cache,
+    detach_cluster_stores,
+    get_cluster_library,
+)
+from src.LibraryStore import (
+    ALIGNMENT,
+    MAGIC,
+    ClusterStore,
+    compile_cluster_store,
+    library_fingerprint,
+    open_cluster_store,
+)
+
+YEARS = range(2023, 2026)
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def config():
+    """Create a cluster configuration with an extra holiday and a family."""
+    return ClusterConfig(
+        year=2024, holidays=["24/12"], families=(WORKING_DAY_OF_MONTH,)
+    )
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    """Path of a library file in a temporary directory."""
+    return str(tmp_path / "clusters.bin")
+
+
+@pytest.fixture(autouse=True)
+def no_attached_stores():
+    """Detach compiled files after every test."""
+    yield
+    detach_cluster_stores()
+
+
+class TestLibraryStore:
+
+    def test_round_trip(self, config, store_path):
+        """Test that stored libraries equal the built ones."""
+        compile_cluster_store(store_path, config, YEARS)
+        store = ClusterStore(store_path)
+
+        assert store.years == list(YEARS)
+        for year in YEARS:
+            built = get_cluster_library(ClusterConfig(**{**vars(config), "year": year}))
+            loaded = store.library(year)
+            assert loaded.names == built.names
+            np.testing.assert_array_equal(loaded.clusters, built.clusters)
+            np.testing.assert_array_equal(loaded.day_indices, built.day_indices)
+            assert not loaded.clusters.flags.writeable
+
+    def test_memory_mapped_and_aligned(self, config, store_path):
+        """Test that packed matrices are aligned views of the mapped file."""
+        compile_cluster_store(store_path, config, YEARS)
+        store = ClusterStore(store_path)
+        packed = store.packed(2024)
+
+        assert isinstance(packed.base, np.memmap) or isinstance(packed, np.memmap)
+        assert not packed.flags.writeable
+        assert packed.shape == (len(store.names), 46)
+        with open(store_path, "rb") as file:
+            assert file.read(len(MAGIC)) == MAGIC
+            header_end = len(MAGIC) + 8 + int.from_bytes(file.read(8), "little")
+        assert header_end % ALIGNMENT == 0
+
+    def test_attached_store_replaces_building(self, config, store_path, monkeypatch):
+        """Test that attached files answer library misses without building."""
+        attach_cluster_store(open_cluster_store(store_path, config, YEARS))
+        clear_cluster_library_cache()
+        monkeypatch.setattr(
+            "src.CreateClusters.ClusterGenerator.build_library",
+            lambda self: pytest.fail("library was built"),
+        )
+
+        library = get_cluster_library(config)
+        assert "first working day of the month" in library.names
+        assert _load_cluster_library.cache_info().misses == 1
+
+    def test_other_configuration_is_built(self, config, store_path):
+        """Test that files only answer the configuration they were built from."""
+        attach_cluster_store(open_cluster_store(store_path, config, YEARS))
+        clear_cluster_library_cache()
+
+        other = get_cluster_library(ClusterConfig(year=2024))
+        assert "first working day of the month" not in other.names
+        assert get_cluster_library(ClusterConfig(**{**vars(config), "year": 2030}))
+
+    def test_stale_files_are_rebuilt(self, config, store_path):
+        """Test that changed configurations, years and formats trigger a rebuild."""
+        fingerprint = open_cluster_store(store_path, config, YEARS).fingerprint
+        assert open_cluster_store(store_path, config, YEARS).fingerprint == fingerprint
+
+        changed = ClusterConfig(year=2024, holidays=["31/12"])
+        store = open_cluster_store(store_path, changed, YEARS)
+        assert store.fingerprint == library_fingerprint(changed, YEARS)
+        assert store.fingerprint != fingerprint
+
+        store = open_cluster_store(store_path, changed, range(2020, 2027))
+        assert store.years == list(range(2020, 2027))
+
+        with open(store_path, "r+b") as file:
+            file.write(b"garbage!")
+        with pytest.raises(ValueError):
+            ClusterStore(store_path)
+        assert open_cluster_store(store_path, changed, YEARS).years == list(YEARS)
+
+    def test_truncated_file_is_rejected(self, config, store_path):
+        """Test that a file cut short is detected."""
+        compile_cluster_store(store_path, config, YEARS)
+        with open(store_path, "r+b") as file:
+            file.truncate(300)
+        with pytest.raises(ValueError):
+            ClusterStore(store_path)
+
+    def test_fingerprint_is_stable(self):
+        """Test that another interpreter computes the same fingerprint."""
+        script = (
+            "from datetime import date\n"
+            "from src.ClusterFamilies import WORKING_DAY_OF_MONTH, school_term_weekdays\n"
+            "from src.CreateClusters import ClusterConfig\n"
+            "from src.LibraryStore import library_fingerprint\n"
+            "terms = [(date(2024, 9, 2), date(2024, 12, 20))]\n"
+            "families = (WORKING_DAY_OF_MONTH, school_term_weekdays(terms))\n"
+            "config = ClusterConfig(year=2024, families=families)\n"
+            f"print(library_fingerprint(config, {list(YEARS)}))\n"
+        )
+        fingerprints = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                capture_output=True,
+                check=True,
+                cwd=ROOT,
+                env={**os.environ, "PYTHONHASHSEED": seed},
+                text=True,
+            ).stdout.strip()
+            for seed in ("1", "2")
+        }
+        terms = [(date(2024, 9, 2), date(2024, 12, 20))]
+        families = (WORKING_DAY_OF_MONTH, school_term_weekdays(terms))
+        assert fingerprints == {
+            library_fingerprint(ClusterConfig(year=2024, families=families), YEARS)
+        }
+
+    def test_fingerprint_covers_inputs(self, config):
+        """Test that the fingerprint ignores the year but not the holidays."""
+        assert library_fingerprint(config, YEARS) == library_fingerprint(
+            ClusterConfig(**{**vars(config), "year": 1999}), YEARS
+        )
+        assert library_fingerprint(config, YEARS) != library_fingerprint(
+            ClusterConfig(**{**vars(config), "region": None}), YEARS
+        )
+        assert library_fingerprint(config, YEARS) != library_fingerprint(
+            config, range(2023, 2027)
+        )
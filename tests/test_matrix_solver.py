@@ -0,0 +1,320 @@
+import pytest
+import numpy as np
+
+from datetime import date
+
+from src.CreateClusters import ClusterGenerator, ClusterConfig, create_range_clusters
+from src.MCSolver import SetCoverSolver, SolverConfig
+from src.MatrixSolver import (
+    ClusterRangeIndex,
+    MatrixSetCoverSolver,
+    prune_clusters,
+    solve_cluster_cover,
+    solve_cluster_cover_batch,
+)
+
+
+def to_sets(clusters_array, day_indices):
+    """Convert a cluster matrix to the set representation used by SetCoverSolver."""
+    return [set(day_indices[row != 0].tolist()) for row in clusters_array]
+
+
+@pytest.fixture
+def clusters():
+    """Create the clusters of the first quarter of 2021."""
+    return ClusterGenerator(ClusterConfig(year=2021)).create_clusters(1, 90)
+
+
+class TestMatrixSetCoverSolver:
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize(
+        "missing_weight,extra_weight", [(1.0, 1.0), (1.0, 5.0), (3.0, 0.5)]
+    )
+    def test_matches_set_solver(self, clusters, seed, missing_weight, extra_weight):
+        """Test that the matrix solver selects the same clusters as SetCoverSolver."""
+        clusters_array, names, day_indices = clusters
+        rng = np.random.default_rng(seed)
+        weekdays = clusters_array[names.index("from Monday to Friday")] != 0
+        running = weekdays ^ (rng.random(len(day_indices)) < 0.05)
+        config = SolverConfig(missing_weight=missing_weight, extra_weight=extra_weight)
+
+        result = MatrixSetCoverSolver(config).solve(clusters, running)
+
+        sets = to_sets(clusters_array, day_indices)
+        expected = SetCoverSolver(config).solve(
+            set(day_indices[running].tolist()), sets
+        )
+        assert [sets[i] for i in result] == expected
+
+    def test_single_cluster_pattern(self, clusters):
+        """Test that an exact weekday pattern is covered by its cluster."""
+        clusters_array, names, _ = clusters
+        running = clusters_array[names.index("Saturday and Sunday")] != 0
+        result = solve_cluster_cover(clusters, running)
+        assert [names[i] for i in result] == ["Saturday and Sunday"]
+
+    def test_cross_year_range(self):
+        """Test solving over ordinal days spanning two years."""
+        clusters = create_range_clusters(
+            date(2020, 12, 1), date(2021, 12, 31), ClusterConfig(year=2021)
+        )
+        clusters_array, names, day_indices = clusters
+        running = clusters_array[names.index("Working days")] != 0
+
+        result = MatrixSetCoverSolver().solve(clusters, running)
+        assert [names[i] for i in result] == ["Working days"]
+        parent = set(day_indices[running].tolist())
+        cover = SetCoverSolver().solve(parent, to_sets(clusters_array, day_indices))
+        assert cover == [to_sets(clusters_array, day_indices)[i] for i in result]
+
+    def test_integer_weights(self, clusters):
+        """Test that integer weights give the same cover as SetCoverSolver."""
+        clusters_array, names, day_indices = clusters
+        weekdays = clusters_array[names.index("from Monday to Friday")] != 0
+        running = weekdays ^ (np.random.default_rng(0).random(len(day_indices)) < 0.05)
+        config = SolverConfig(missing_weight=1, extra_weight=1)
+
+        result = MatrixSetCoverSolver(config).solve(clusters, running)
+        batch = solve_cluster_cover_batch(clusters, running[None, :], config)
+
+        sets = to_sets(clusters_array, day_indices)
+        expected = SetCoverSolver(config).solve(
+            set(day_indices[running].tolist()), sets
+        )
+        assert [sets[i] for i in result] == expected
+        assert batch == [result]
+
+    def test_invalid_inputs(self, clusters):
+        """Test handling of invalid inputs."""
+        clusters_array, names, day_indices = clusters
+        with pytest.raises(ValueError):
+            solve_cluster_cover(clusters, np.zeros(len(day_indices), dtype=bool))
+        with pytest.raises(ValueError):
+            solve_cluster_cover(clusters, np.ones(3, dtype=bool))
+        with pytest.raises(ValueError):
+            solve_cluster_cover((clusters_array, names[:-1], day_indices), np.ones(90))
+
+    def test_no_solution_exists(self):
+        """Test that uncoverable days raise the same error as SetCoverSolver."""
+        clusters = (np.array([[1, 0, 0], [0, 1, 0]]), ["a", "b"], np.array([1, 2, 3]))
+        with pytest.raises(
+            RuntimeError, match="Unable to find solution: incomplete coverage."
+        ):
+            solve_cluster_cover(clusters, np.array([True, True, True]))
+
+
+class TestBatchSolver:
+    @pytest.mark.parametrize(
+        "missing_weight,extra_weight", [(1.0, 1.0), (1.0, 5.0), (3.0, 0.5)]
+    )
+    def test_matches_single_solver(self, clusters, missing_weight, extra_weight):
+        """Test that every batch cover equals the single-service cover."""
+        clusters_array, names, day_indices = clusters
+        rng = np.random.default_rng(42)
+        patterns = clusters_array[rng.integers(0, len(names), 40)] != 0
+        services = patterns ^ (rng.random(patterns.shape) < 0.05)
+        services[0] = True
+        services[1] = clusters_array[names.index("Holidays")] != 0
+        config = SolverConfig(missing_weight=missing_weight, extra_weight=extra_weight)
+
+        results = solve_cluster_cover_batch(clusters, services, config)
+
+        solver = MatrixSetCoverSolver(config)
+        assert results == [solver.solve(clusters, running) for running in services]
+
+    @pytest.mark.parametrize("missing_weight,extra_weight", [(0.7, 0.2), (0.1, 0.3)])
+    def test_non_dyadic_weights(self, missing_weight, extra_weight):
+        """Test that weights inexact in binary break ties like the single solver."""
+        clusters = ClusterGenerator(ClusterConfig(year=2024)).create_clusters(20, 80)
+        clusters_array, names, _ = clusters
+        rng = np.random.default_rng(0)
+        patterns = clusters_array[rng.integers(0, len(names), 300)] != 0
+        services = patterns ^ (rng.random(patterns.shape) < 0.1)
+        services[~services.any(axis=1), 0] = True
+        config = SolverConfig(missing_weight=missing_weight, extra_weight=extra_weight)
+
+        results = solve_cluster_cover_batch(clusters, services, config)
+
+        solver = MatrixSetCoverSolver(config)
+        assert results == [solver.solve(clusters, running) for running in services]
+
+    def test_duplicate_clusters(self):
+        """Test that redundant duplicates are removed like in SetCoverSolver."""
+        clusters_array = np.array([[1, 0, 0], [1, 0, 0], [0, 1, 1], [1, 1, 0]])
+        clusters = (clusters_array, ["a", "b", "c", "d"], np.array([1, 2, 3]))
+        services = np.array([[1, 1, 1], [1, 0, 0], [0, 1, 1]], dtype=bool)
+        config = SolverConfig(extra_weight=10.0)
+
+        results = solve_cluster_cover_batch(clusters, services, config)
+
+        solver = MatrixSetCoverSolver(config)
+        assert results == [solver.solve(clusters, running) for running in services]
+
+    def test_invalid_inputs(self, clusters):
+        """Test handling of invalid batch inputs."""
+        _, _, day_indices = clusters
+        with pytest.raises(ValueError):
+            solve_cluster_cover_batch(clusters, np.ones(len(day_indices), dtype=bool))
+        with pytest.raises(ValueError):
+            solve_cluster_cover_batch(clusters, np.zeros((2, len(day_indices))))
+
+    def test_no_solution_exists(self):
+        """Test that an uncoverable service raises the single-service error."""
+        clusters = (np.array([[1, 0, 0], [0, 1, 0]]), ["a", "b"], np.array([1, 2, 3]))
+        services = np.array([[1, 0, 0], [1, 1, 1]], dtype=bool)
+        with pytest.raises(
+            RuntimeError, match="Unable to find solution: incomplete coverage."
+        ):
+            solve_cluster_cover_batch(clusters, services)
+
+
+class TestPruneClusters:
+    def test_merges_duplicates(self):
+        """Test that identical clusters of a short range are merged."""
+        clusters = ClusterGenerator(ClusterConfig(year=2021)).create_clusters(4, 6)
+        pruned = prune_clusters(clusters)
+        clusters_array, names, day_indices = pruned.clusters
+
+        assert len(names) < len(clusters[1])
+        assert len(np.unique(clusters_array, axis=0)) == len(names)
+        assert sum(len(group) for group in pruned.aliases) == len(clusters[1])
+        assert [group[0] for group in pruned.aliases] == names
+        np.testing.assert_array_equal(day_indices, clusters[2])
+
+    def test_drops_dominated_clusters(self):
+        """Test that clusters beaten on coverage and extra days are dropped."""
+        clusters_array = np.array(
+            [[1, 0, 0, 0], [1, 1, 0, 0], [1, 1, 0, 1], [0, 0, 1, 1], [1, 0, 1, 0]]
+        )
+        clusters = (clusters_array, list("abcde"), np.arange(1, 5))
+        running = np.array([1, 1, 1, 0], dtype=bool)
+
+        pruned = prune_clusters(clusters, running)
+
+        assert pruned.clusters[1] == ["b", "e"]
+        np.testing.assert_array_equal(pruned.source_indices, [1, 4])
+
+    def test_solution_quality_preserved(self, clusters):
+        """Test that solving the pruned candidates gives a cover of equal cost."""
+        clusters_array, names, day_indices = clusters
+        rng = np.random.default_rng(3)
+        running = (clusters_array[names.index("from Monday to Friday")] != 0) ^ (
+            rng.random(len(day_indices)) < 0.05
+        )
+        config = SolverConfig(extra_weight=2.0)
+
+        pruned = prune_clusters(clusters, running, config)
+        result = solve_cluster_cover(pruned.clusters, running, config)
+        expected = solve_cluster_cover(clusters, running, config)
+
+        def cost(rows):
+            union = np.any(rows != 0, axis=0)
+            return len(rows) + 2.0 * (union & ~running).sum()
+
+        assert len(pruned.clusters[1]) < len(names)
+        assert cost(pruned.clusters[0][result]) == cost(clusters_array[expected])
+
+
+class TestClusterRangeIndex:
+    @pytest.fixture
+    def year_clusters(self):
+        """Create the bool clusters of 2024."""
+        return ClusterGenerator(ClusterConfig(year=2024)).create_clusters(
+            1, 366, "bool"
+        )
+
+    def test_counts_match_matrix(self, year_clusters):
+        """Test window counts against the sliced matrix."""
+        matrix, _, _ = year_clusters
+        rng = np.random.default_rng(0)
+        running = rng.random(366) < 0.4
+        index = ClusterRangeIndex(year_clusters, running)
+
+        for start, end in [(1, 1), (1, 366), (10, 40), (300, 366)]:
+            window = matrix[:, start - 1 : end]
+            days = running[start - 1 : end]
+            counts = index.counts(start, end)
+            np.testing.assert_array_equal(counts.days, window.sum(axis=1))
+            np.testing.assert_array_equal(counts.covered, (window & days).sum(axis=1))
+            np.testing.assert_array_equal(
+                counts.missing, days.sum() - (window & days).sum(axis=1)
+            )
+            np.testing.assert_array_equal(counts.extra, (window & ~days).sum(axis=1))
+
+    def test_sweep_many_windows(self, year_clusters):
+        """Test that arrays of windows are answered at once."""
+        running = year_clusters[0][year_clusters[1].index("Working days")]
+        index = ClusterRangeIndex(year_clusters, running)
+        starts = np.arange(1, 300)
+        config = SolverConfig(extra_weight=2.0)
+
+        costs = index.costs(starts, starts + 30, config)
+        assert costs.shape == (len(year_clusters[1]), len(starts))
+        np.testing.assert_array_equal(costs[:, 17], index.costs(18, 48, config))
+        assert (costs[year_clusters[1].index("Working days")] == 0).all()
+
+    def test_costs_match_first_greedy_round(self, year_clusters):
+        """Test that window costs equal the greedy costs of the sliced clusters."""
+        rng = np.random.default_rng(1)
+        running = year_clusters[0][rng.choice(46)] ^ (rng.random(366) < 0.05)
+        index = ClusterRangeIndex(year_clusters, running)
+        config = SolverConfig(missing_weight=2.0, extra_weight=0.5)
+
+        matrix, _, day_indices = index.window(60, 120)
+        days = running[59:120]
+        expected = config.missing_weight * (
+            days.sum() - (matrix & days).sum(axis=1)
+        ) + config.extra_weight * (matrix & ~days).sum(axis=1)
+        np.testing.assert_allclose(index.costs(60, 120, config), expected)
+        assert day_indices[0] == 60 and len(day_indices) == 61
+
+    def test_range_clusters_and_updates(self):
+        """Test ordinal windows of multi-year ranges and running-day updates."""
+        clusters = create_range_clusters(
+            date(2023, 12, 1), date(2024, 1, 31), ClusterConfig(year=2023), "bool"
+        )
+        index = ClusterRangeIndex(clusters)
+        first, last = date(2023, 12, 25).toordinal(), date(2024, 1, 7).toordinal()
+        assert index.counts(first, last).covered.sum() == 0
+
+        index.update_running_days(np.ones(62, dtype=bool))
+        counts = index.counts(first, last)
+        assert counts.days[clusters[1].index("All days")] == 14
+        assert counts.extra.sum() == 0
+        with pytest.raises(ValueError):
+            index.update_running_days(np.ones(10, dtype=bool))
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_solve_window_matches_solve(self, year_clusters, seed):
+        """Test that pruning through the index keeps the window's cover."""
+        matrix, _, _ = year_clusters
+        rng = np.random.default_rng(seed)
+        running = matrix[rng.choice(len(matrix), 2)].any(axis=0) ^ (
+            rng.random(366) < 0.1
+        )
+        index = ClusterRangeIndex(year_clusters, running)
+        config = SolverConfig(extra_weight=float(rng.choice([0.2, 1.0, 5.0])))
+        start = int(rng.integers(1, 300))
+        end = int(rng.integers(start + 7, 367))
+
+        solver = MatrixSetCoverSolver(config)
+        expected = solver.solve(index.window(start, end), running[start - 1 : end])
+        assert solver.solve_window(index, start, end) == expected
+
+    def test_solve_window_without_service(self, year_clusters):
+        """Test that a window without running days is rejected."""
+        running = np.zeros(366, dtype=bool)
+        running[200] = True
+        index = ClusterRangeIndex(year_clusters, running)
+        with pytest.raises(ValueError):
+            MatrixSetCoverSolver().solve_window(index, 1, 100)
+
+    def test_invalid_windows(self, year_clusters):
+        """Test that empty and out-of-range windows are rejected."""
+        index = ClusterRangeIndex(year_clusters)
+        with pytest.raises(ValueError):
+            index.counts(40, 10)
+        with pytest.raises(ValueError):
+            index.counts(0, 10)
+        with pytest.raises(ValueError):
+            index.counts(300, 367)
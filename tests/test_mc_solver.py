@@ -1,5 +1,17 @@
+import itertools
+import random
 import pytest
-from src.MCSolver import SetCoverSolver, SolverConfig, solve_set_cover
+from src.MCSolver import (
+    CancellationToken,
+    IncrementalSetCoverSolver,
+    InvertedIndex,
+    SetCoverSolver,
+    SolverConfig,
+    SolverStats,
+    cover_cost,
+    encode_bitsets,
+    solve_set_cover,
+)
 
 
 class TestSetCoverSolver:
@@ -437,3 +449,416 @@ class TestSetCoverSolver:
         # [{1,2,3}, {3,4,5}, {5,6}]
         # or [{1,4}, {2,5,6}, {3,4,5}]
         assert len(result) == 3, f"Expected 3 sets, but got {len(result)}: {result}"
+
+    def test_unknown_engine(self):
+        """Configuration Test: Unknown engines are rejected."""
+        with pytest.raises(ValueError):
+            SetCoverSolver(SolverConfig(engine="gpu"))
+
+    @pytest.mark.parametrize(
+        "missing_weight,extra_weight", [(1.0, 1.0), (1.0, 5.0), (2.0, 0.5)]
+    )
+    def test_bitset_engine_matches_set_engine(self, missing_weight, extra_weight):
+        """Engine Test: The bitset engine returns the same cover as the set engine."""
+        rng = random.Random(7)
+        for _ in range(50):
+            parent = set(rng.sample(range(1, 60), rng.randint(1, 40)))
+            sets = [
+                set(rng.sample(range(1, 70), rng.randint(0, 25))) for _ in range(30)
+            ]
+            sets.append(set(range(1, 70)))
+
+            config = SolverConfig(
+                missing_weight=missing_weight, extra_weight=extra_weight
+            )
+            expected = SetCoverSolver(config).solve(parent, sets)
+            config.engine = "bitset"
+            assert SetCoverSolver(config).solve(parent, sets) == expected
+
+    def test_bitset_engine_non_integer_elements(self):
+        """Engine Test: The bitset engine accepts any hashable elements."""
+        parent = {"apple", "banana", "cherry"}
+        sets = [{"apple", "banana"}, {"banana", "cherry"}, {"apple", "cherry"}]
+        result = SetCoverSolver(SolverConfig(engine="bitset")).solve(parent, sets)
+        assert parent.issubset(set().union(*result))
+        assert len(result) == 2
+
+    def test_bitset_engine_no_solution(self):
+        """Engine Test: The bitset engine reports incomplete coverage."""
+        solver = SetCoverSolver(SolverConfig(engine="bitset"))
+        with pytest.raises(
+            RuntimeError, match="Unable to find solution: incomplete coverage."
+        ):
+            solver.solve({1, 2, 3}, [{1}, {2}, {4}])
+
+    def test_bitset_masks_reused(self, monkeypatch):
+        """Engine Test: Candidate masks are encoded once per candidate list."""
+        calls = []
+        encode = encode_bitsets
+
+        def counted(*args):
+            calls.append(args)
+            return encode(*args)
+
+        monkeypatch.setattr("src.MCSolver.encode_bitsets", counted)
+        solver = SetCoverSolver(SolverConfig(engine="bitset"))
+        sets = [{1, 2}, {2, 3}, {3, 4}]
+        assert solver.solve({1, 2}, sets) == [{1, 2}]
+        assert solver.solve({3, 4, 5}, sets + [{5}]) == [{3, 4}, {5}]
+        assert solver.solve({2, 3}, sets) == [{2, 3}]
+        assert solver.solve({3, 4}, sets) == [{3, 4}]
+        assert len(calls) == 3
+        with pytest.raises(RuntimeError):
+            solver.solve({1, 6}, sets)
+
+    @pytest.mark.parametrize("engine", ["set", "bitset"])
+    @pytest.mark.parametrize(
+        "missing_weight,extra_weight",
+        [(1.0, 1.0), (1.0, 5.0), (2.0, 0.5), (0.1, 0.3), (0.7, 0.2)],
+    )
+    def test_lazy_selection_matches_scan(self, engine, missing_weight, extra_weight):
+        """Selection Test: Lazy greedy returns the same cover as a full scan."""
+        rng = random.Random(11)
+        for _ in range(300):
+            parent = set(rng.sample(range(1, 60), rng.randint(1, 40)))
+            sets = [
+                set(rng.sample(range(1, 70), rng.randint(0, 25))) for _ in range(40)
+            ]
+            sets.append(set(range(1, 70)))
+
+            config = SolverConfig(
+                missing_weight=missing_weight, extra_weight=extra_weight
+            )
+            expected = SetCoverSolver(config).solve(parent, sets)
+            config.engine = engine
+            config.selection = "lazy"
+            assert SetCoverSolver(config).solve(parent, sets) == expected
+
+    def test_lazy_selection_no_solution(self):
+        """Selection Test: Lazy greedy reports incomplete coverage."""
+        solver = SetCoverSolver(SolverConfig(selection="lazy"))
+        with pytest.raises(
+            RuntimeError, match="Unable to find solution: incomplete coverage."
+        ):
+            solver.solve({1, 2, 3}, [{1}, {2}, {4}])
+
+    @pytest.mark.parametrize(
+        "missing_weight,extra_weight",
+        [(1.0, 1.0), (1.0, 5.0), (2.0, 0.5), (0.1, 0.3), (0.7, 0.2)],
+    )
+    def test_inverted_selection_matches_scan(self, missing_weight, extra_weight):
+        """Selection Test: Inverted index counters return the scan cover."""
+        rng = random.Random(12)
+        config = SolverConfig(missing_weight=missing_weight, extra_weight=extra_weight)
+        for _ in range(300):
+            parent = set(rng.sample(range(1, 60), rng.randint(1, 40)))
+            sets = [
+                set(rng.sample(range(1, 70), rng.randint(0, 25))) for _ in range(40)
+            ]
+            sets.append(set(range(1, 70)))
+
+            expected = SetCoverSolver(config).solve(parent, sets)
+            inverted = SolverConfig(**{**vars(config), "selection": "inverted"})
+            assert SetCoverSolver(inverted).solve(parent, sets) == expected
+
+    def test_inverted_index_reused_per_library(self):
+        """Selection Test: The index is built once per candidate list."""
+        sets = [{1, 2}, {2, 3}, {3, 4}, {1, 2, 3, 4}]
+        solver = SetCoverSolver(SolverConfig(selection="inverted"))
+        solver.solve({1, 2}, sets)
+        index = solver._index
+        assert solver.solve({3, 4}, sets) == [{3, 4}]
+        assert solver._index is index
+
+        solver.solve({3, 4}, list(sets))
+        assert solver._index is not index
+
+    def test_inverted_index_passed_by_caller(self, monkeypatch):
+        """Selection Test: A prebuilt index is shared across convenience calls."""
+        sets = [{1, 2}, {2, 3}, {3, 4}, {1, 2, 3, 4}]
+        index = InvertedIndex(sets)
+        config = SolverConfig(selection="inverted")
+
+        def rebuild(_):
+            raise AssertionError("InvertedIndex rebuilt")
+
+        monkeypatch.setattr("src.MCSolver.InvertedIndex", rebuild)
+        assert solve_set_cover({3, 4}, sets, config, index=index) == [{3, 4}]
+        assert solve_set_cover({1, 2}, sets, config, index=index) == [{1, 2}]
+
+    def test_inverted_index_counts(self):
+        """Selection Test: Overlap counts only touch candidates sharing elements."""
+        index = InvertedIndex([{1, 2}, {2, 3}, {4}])
+        assert index.postings[2] == [0, 1]
+        counts = index.overlap_counts({1, 2, 3})
+        assert counts == [2, 2, 0]
+        index.discount({2}, counts)
+        assert counts == [1, 1, 0]
+
+    def test_inverted_selection_fewer_evaluations(self):
+        """Instrumentation Test: Inverted selection rescores fewer candidates."""
+        rng = random.Random(8)
+        parent = set(range(100))
+        sets = [set(rng.sample(range(120), 10)) for _ in range(300)]
+        sets.extend({element} for element in parent)
+
+        received = []
+        for selection in ("scan", "inverted"):
+            solver = SetCoverSolver(
+                SolverConfig(selection=selection, extra_weight=5.0),
+                stats_callback=received.append,
+            )
+            solver.solve(parent, sets)
+        scan, inverted = received
+        assert inverted.iterations == scan.iterations > 1
+        assert inverted.cost_evaluations < scan.cost_evaluations
+
+    def test_inverted_selection_no_solution(self):
+        """Selection Test: Inverted greedy reports incomplete coverage."""
+        solver = SetCoverSolver(SolverConfig(selection="inverted"))
+        with pytest.raises(
+            RuntimeError, match="Unable to find solution: incomplete coverage."
+        ):
+            solver.solve({1, 2, 3}, [{1}, {2}, {4}])
+
+    def test_unknown_selection(self):
+        """Configuration Test: Unknown selection modes are rejected."""
+        with pytest.raises(ValueError):
+            SetCoverSolver(SolverConfig(selection="random"))
+
+    def test_optimize_solution_matches_union_check(self, solver):
+        """Optimization Test: Redundancy removal keeps the left-to-right order."""
+
+        def reference(parent, results):
+            optimized = results.copy()
+            for candidate_set in results:
+                temp_results = optimized.copy()
+                temp_results.remove(candidate_set)
+                if parent.issubset(set().union(*temp_results)):
+                    optimized = temp_results
+            return optimized
+
+        rng = random.Random(5)
+        for _ in range(200):
+            parent = set(rng.sample(range(20), rng.randint(1, 15)))
+            results = [set(rng.sample(range(25), rng.randint(1, 8))) for _ in range(8)]
+            results += [results[rng.randrange(8)], set(range(25))]
+            rng.shuffle(results)
+
+            solver.original_parent = parent
+            assert solver._optimize_solution(results) == reference(parent, results)
+
+    def test_exact_mode_is_optimal(self):
+        """Exact Test: Branch-and-bound matches a brute-force optimum."""
+        rng = random.Random(3)
+        config = SolverConfig(mode="exact", extra_weight=0.5, time_budget=10.0)
+        for _ in range(30):
+            parent = set(rng.sample(range(12), rng.randint(1, 10)))
+            sets = [set(rng.sample(range(15), rng.randint(1, 6))) for _ in range(9)]
+            sets.append(set(range(15)))
+
+            solver = SetCoverSolver(config)
+            result = solver.solve(parent, sets)
+            best = min(
+                cover_cost(parent, list(cover), config)
+                for size in range(1, len(sets) + 1)
+                for cover in itertools.combinations(sets, size)
+                if parent.issubset(set().union(*cover))
+            )
+            assert parent.issubset(set().union(*result))
+            assert cover_cost(parent, result, config) == pytest.approx(best)
+            assert solver.proven_optimal is True
+
+    def test_exact_mode_improves_greedy(self):
+        """Exact Test: Exact mode beats the greedy cover when possible."""
+        parent = set(range(1, 9))
+        sets = [
+            {1, 2, 6, 7, 9},
+            {3, 4, 6, 7, 8},
+            {2, 3, 5, 7},
+            {5, 8, 9},
+            {1, 2, 3, 5, 9},
+        ]
+        greedy = SetCoverSolver().solve(parent, sets)
+        assert len(greedy) == 3
+
+        solver = SetCoverSolver(SolverConfig(mode="exact"))
+        result = solver.solve(parent, sets)
+        assert result == [{3, 4, 6, 7, 8}, {1, 2, 3, 5, 9}]
+        assert cover_cost(parent, result) < cover_cost(parent, greedy)
+        assert solver.proven_optimal is True
+
+    def test_exact_mode_time_budget(self):
+        """Exact Test: An exhausted budget returns the greedy cover, not proven."""
+        rng = random.Random(9)
+        parent = set(range(60))
+        sets = [set(rng.sample(range(60), 8)) for _ in range(60)] + [set(range(60))]
+        greedy = SetCoverSolver(SolverConfig(extra_weight=0.0)).solve(parent, sets)
+
+        solver = SetCoverSolver(SolverConfig(mode="exact", time_budget=0.0))
+        result = solver.solve(parent, sets)
+        assert result == greedy
+        assert solver.proven_optimal is False
+
+    @pytest.mark.parametrize(
+        "engine, selection",
+        [("set", "scan"), ("bitset", "scan"), ("set", "lazy"), ("set", "inverted")],
+    )
+    def test_cancelled_solve_returns_partial_cover(self, engine, selection):
+        """Anytime Test: A cancelled solve still returns a feasible cover."""
+        rng = random.Random(4)
+        parent = set(range(40))
+        sets = [set(rng.sample(range(40), 6)) for _ in range(50)] + [set(range(40))]
+        config = SolverConfig(engine=engine, selection=selection)
+        token = CancellationToken()
+
+        solver = SetCoverSolver(config, token)
+        solver.solve(parent, sets)
+        assert solver.partial is False
+
+        token.cancel()
+        result = solver.solve(parent, sets)
+        assert solver.partial is True
+        assert parent.issubset(set().union(*result))
+        assert result == [s for s in sets if s in result]
+
+    def test_timeout_returns_partial_cover(self):
+        """Anytime Test: An expired timeout marks the cover as partial."""
+        parent = set(range(1, 9))
+        sets = [{1, 2}, {3, 4}, {5, 6}, {7, 8}, {1, 2, 3, 4, 5, 6, 7, 8}]
+
+        solver = SetCoverSolver(SolverConfig(mode="exact", timeout=0.0))
+        result = solver.solve(parent, sets)
+        assert solver.partial is True
+        assert solver.proven_optimal is None
+        assert parent.issubset(set().union(*result))
+
+        result = solve_set_cover(parent, sets, SolverConfig(timeout=60.0))
+        assert result == [{1, 2, 3, 4, 5, 6, 7, 8}]
+
+    def test_cancelled_solve_without_cover(self):
+        """Anytime Test: Cancellation does not hide an infeasible problem."""
+        token = CancellationToken()
+        token.cancel()
+        with pytest.raises(RuntimeError):
+            solve_set_cover({1, 2, 3}, [{1}, {2}], cancel_token=token)
+
+    def test_stats_callback(self):
+        """Instrumentation Test: The callback receives the stats of every solve."""
+        parent = {1, 2, 3, 4, 5}
+        sets = [{1, 2}, {3, 4}, {5}, {1, 3, 5}, {2, 4}, {1, 2, 3, 4, 5, 6}]
+        received = []
+        solver = SetCoverSolver(stats_callback=received.append)
+
+        solver.solve(parent, sets)
+        solver.solve({1, 2}, sets)
+        assert len(received) == 2
+        assert received[-1] is solver.stats
+
+        stats = received[0]
+        assert isinstance(stats, SolverStats)
+        assert stats.iterations == 1
+        assert stats.cost_evaluations == stats.candidates_considered == len(sets)
+        assert stats.validation_time >= 0.0
+        assert stats.greedy_time >= 0.0
+        assert stats.optimize_time >= 0.0
+
+    def test_stats_disabled_by_default(self):
+        """Instrumentation Test: Nothing is measured without a callback."""
+        solver = SetCoverSolver()
+        solver.solve({1, 2, 3}, [{1, 2}, {3}])
+        assert solver.stats is None
+
+    def test_stats_lazy_and_exact(self):
+        """Instrumentation Test: Lazy selection considers fewer candidates."""
+        rng = random.Random(5)
+        parent = set(range(80))
+        sets = [set(rng.sample(range(100), 12)) for _ in range(200)]
+        sets.append(set(range(80)))
+
+        received = []
+        SetCoverSolver(stats_callback=received.append).solve(parent, sets)
+        config = SolverConfig(selection="lazy", mode="exact")
+        SetCoverSolver(config, stats_callback=received.append).solve(parent, sets)
+
+        scan, lazy = received
+        assert lazy.iterations == scan.iterations
+        assert lazy.candidates_considered < scan.candidates_considered
+        assert lazy.cost_evaluations >= len(sets)
+        assert scan.exact_nodes == 0
+        assert lazy.exact_nodes > 0
+
+    def test_unknown_mode(self):
+        """Configuration Test: Unknown solver modes are rejected."""
+        with pytest.raises(ValueError):
+            SetCoverSolver(SolverConfig(mode="anneal"))
+
+
+class TestIncrementalSetCoverSolver:
+    @pytest.fixture
+    def weekly_problem(self):
+        """Create a four-week problem with weekday-like sets."""
+        sets = [set(range(day, 29, 7)) for day in range(1, 8)]
+        sets += [
+            set(range(1, 29)),
+            {d for d in range(1, 29) if d % 7 in (1, 2, 3, 4, 5)},
+        ]
+        parent = {d for d in range(1, 29) if d % 7 in (1, 2, 3, 4, 5)}
+        return parent, sets
+
+    def test_repairs_keep_valid_cover(self, weekly_problem):
+        """Incremental Test: Every edit leaves a valid cover and consistent cost."""
+        parent, sets = weekly_problem
+        config = SolverConfig(repair_tolerance=0.5)
+        solver = IncrementalSetCoverSolver(config)
+        solver.solve(parent, sets)
+
+        rng = random.Random(2)
+        for _ in range(200):
+            day = rng.randint(1, 28)
+            if day in parent:
+                parent.discard(day)
+                cover = solver.remove_day(day)
+            else:
+                parent.add(day)
+                cover = solver.add_day(day)
+
+            assert parent.issubset(set().union(*cover))
+            assert solver.cost == pytest.approx(cover_cost(parent, cover, config))
+            assert solver.cost <= solver.baseline_cost * 1.5 + solver.edits
+
+        assert solver.full_solves > 1
+
+    def test_toggle_exception_day(self, weekly_problem):
+        """Incremental Test: Toggling a covered day only changes the exceptions."""
+        parent, sets = weekly_problem
+        solver = IncrementalSetCoverSolver()
+        cover = solver.solve(parent, sets)
+        cost = solver.cost
+
+        assert solver.remove_day(3) == cover
+        assert solver.cost == cost + 1
+        assert solver.add_day(3) == cover
+        assert solver.cost == cost
+        assert solver.full_solves == 1
+
+    def test_add_uncovered_day(self, weekly_problem):
+        """Incremental Test: An uncovered day pulls in the cheapest candidate."""
+        parent, sets = weekly_problem
+        solver = IncrementalSetCoverSolver(SolverConfig(repair_tolerance=10.0))
+        solver.solve(parent, sets)
+
+        cover = solver.add_day(6)
+        assert set(range(6, 29, 7)) in cover
+        assert solver.full_solves == 1
+
+    def test_add_unknown_day(self, weekly_problem):
+        """Incremental Test: A day outside every candidate cannot be covered."""
+        parent, sets = weekly_problem
+        solver = IncrementalSetCoverSolver()
+        cover = solver.solve(parent, sets)
+        with pytest.raises(
+            RuntimeError, match="Unable to find solution: incomplete coverage."
+        ):
+            solver.add_day(99)
+        assert solver.cover == cover
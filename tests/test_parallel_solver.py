@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+
+from src.CreateClusters import ClusterGenerator, ClusterConfig
+from src.MCSolver import SolverConfig
+from src.MatrixSolver import solve_cluster_cover_batch
+from src.ParallelSolver import ParallelConfig, solve_set_cover_parallel
+
+
+@pytest.fixture
+def clusters():
+    """Create the clusters of the first half of 2021."""
+    return ClusterGenerator(ClusterConfig(year=2021)).create_clusters(1, 181)
+
+
+@pytest.fixture
+def services(clusters):
+    """Create noisy weekday-based service patterns."""
+    clusters_array, names, _ = clusters
+    rng = np.random.default_rng(0)
+    patterns = clusters_array[rng.integers(0, len(names), 25)] != 0
+    return patterns ^ (rng.random(patterns.shape) < 0.05)
+
+
+class TestParallelSolver:
+    @pytest.mark.parametrize("selection", ["scan", "inverted"])
+    def test_matches_sequential_results(self, clusters, services, selection):
+        """Test that parallel covers equal the sequential ones, in input order."""
+        config = SolverConfig(extra_weight=2.0, selection=selection)
+        results = list(
+            solve_set_cover_parallel(
+                clusters, services, config, ParallelConfig(max_workers=2, chunk_size=4)
+            )
+        )
+        assert results == solve_cluster_cover_batch(clusters, services, config)
+
+    def test_invalid_inputs(self, clusters, services):
+        """Test handling of invalid inputs."""
+        with pytest.raises(ValueError):
+            solve_set_cover_parallel(clusters, services[:, :10])
+        with pytest.raises(ValueError):
+            solve_set_cover_parallel(
+                clusters, services, parallel_config=ParallelConfig(chunk_size=0)
+            )
+        idle = services.copy()
+        idle[1] = False
+        with pytest.raises(ValueError, match="at least one day"):
+            solve_set_cover_parallel(clusters, idle)
+
+    def test_stop_early(self, clusters, services):
+        """Test that closing the iterator after one cover drops the rest."""
+        covers = solve_set_cover_parallel(
+            clusters,
+            services,
+            parallel_config=ParallelConfig(max_workers=1, chunk_size=1),
+        )
+        first = next(covers)
+        covers.close()
+        assert first == solve_cluster_cover_batch(clusters, services[:1])[0]
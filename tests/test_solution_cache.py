@@ -0,0 +1,146 @@
+import random
+
+import pytest
+
+from src.MCSolver import CancellationToken, SetCoverSolver, SolverConfig
+from src.SolutionCache import CachedSetCoverSolver, SolutionCache, solution_key
+
+
+@pytest.fixture
+def problem():
+    """Create a simple test problem."""
+    return {
+        "parent": {1, 2, 3, 4, 5},
+        "sets": [{1, 2}, {3, 4}, {5}, {1, 3, 5}, {2, 4}, {1, 2, 3, 4, 5, 6}],
+    }
+
+
+class TestSolutionCache:
+    def test_hit_returns_same_cover(self, problem):
+        """Test that a repeated problem is answered from the cache."""
+        solver = CachedSetCoverSolver()
+        first = solver.solve(problem["parent"], problem["sets"])
+        second = solver.solve(set(problem["parent"]), problem["sets"])
+
+        assert first == second == SetCoverSolver().solve(**problem)
+        assert solver.cache.hits == 1
+        assert solver.cache.misses == 1
+        assert solver.cache.hit_rate == 0.5
+
+    def test_key_depends_on_inputs(self, problem):
+        """Test that parent, candidates and weights all change the key."""
+        config = SolverConfig()
+        key = solution_key(problem["parent"], problem["sets"], config)
+
+        assert key == solution_key(set(problem["parent"]), problem["sets"], config)
+        assert key != solution_key({1, 2, 3}, problem["sets"], config)
+        assert key != solution_key(problem["parent"], problem["sets"][:-1], config)
+        assert key != solution_key(
+            problem["parent"], problem["sets"], SolverConfig(extra_weight=2.0)
+        )
+
+    def test_key_ignores_speed_settings(self, problem):
+        """Test that settings not changing the cover share one key."""
+        key = solution_key(problem["parent"], problem["sets"], SolverConfig())
+        fast = SolverConfig(
+            engine="bitset",
+            selection="lazy",
+            timeout=0.5,
+            repair_tolerance=0.5,
+            segment_weight=4.0,
+            min_segment_days=14,
+            set_weight=2.0,
+            time_budget=5.0,
+        )
+        assert key == solution_key(problem["parent"], problem["sets"], fast)
+
+        exact = solution_key(
+            problem["parent"], problem["sets"], SolverConfig(mode="exact")
+        )
+        assert exact != key
+        for changed in (
+            SolverConfig(mode="exact", set_weight=2.0),
+            SolverConfig(mode="exact", time_budget=5.0),
+        ):
+            assert exact != solution_key(problem["parent"], problem["sets"], changed)
+
+    def test_fingerprint_reused_per_library(self, problem, monkeypatch):
+        """Test that lookups over the same list only encode the parent."""
+        solver = CachedSetCoverSolver()
+        expected = solver.solve(**problem)
+
+        def rebuild(_):
+            raise AssertionError("Candidate fingerprint rebuilt")
+
+        monkeypatch.setattr("src.SolutionCache.CandidateFingerprint", rebuild)
+        assert solver.solve(set(problem["parent"]), problem["sets"]) == expected
+        assert solver.solve({1, 2}, problem["sets"]) == [{1, 2}]
+        assert solver.cache.hits == 1
+
+    def test_parent_outside_candidates(self, problem):
+        """Test that parent elements no candidate contains change the key."""
+        config = SolverConfig()
+        key = solution_key({1, 2}, problem["sets"], config)
+        assert key != solution_key({1, 2, 99}, problem["sets"], config)
+        solver = CachedSetCoverSolver()
+        with pytest.raises(RuntimeError):
+            solver.solve({1, 99}, problem["sets"])
+        with pytest.raises(ValueError):
+            solver.solve(set(), problem["sets"])
+
+    def test_unproven_exact_cover_not_persisted(self, tmp_path):
+        """Test that budget-limited exact covers stay out of the disk tier."""
+        rng = random.Random(3)
+        parent = set(range(60))
+        sets = [set(rng.sample(range(70), 8)) for _ in range(80)]
+        sets.extend({element} for element in parent)
+        cache = SolutionCache(path=str(tmp_path / "solutions.db"))
+        solver = CachedSetCoverSolver(
+            SolverConfig(mode="exact", time_budget=0.0), cache=cache
+        )
+
+        first = solver.solve(parent, sets)
+        assert solver.proven_optimal is False
+        assert solver.solve(parent, sets) == first  # Memory tier
+        assert cache.connection.execute("SELECT * FROM solutions").fetchall() == []
+        cache.close()
+
+    def test_lru_eviction(self):
+        """Test that the memory tier keeps only the most recent entries."""
+        cache = SolutionCache(max_entries=2)
+        cache.put("a", ([0], None))
+        cache.put("b", ([1], None))
+        cache.get("a")
+        cache.put("c", ([2], None))
+
+        assert cache.get("b") is None
+        assert cache.get("a") == ([0], None)
+        assert cache.get("c") == ([2], None)
+
+    def test_disk_tier_survives_restart(self, problem, tmp_path):
+        """Test that solutions persist in the SQLite tier."""
+        path = str(tmp_path / "solutions.db")
+        cache = SolutionCache(path=path)
+        expected = CachedSetCoverSolver(cache=cache).solve(**problem)
+        cache.close()
+
+        cache = SolutionCache(path=path)
+        solver = CachedSetCoverSolver(cache=cache)
+        assert solver.solve(**problem) == expected
+        assert cache.disk_hits == 1
+        cache.close()
+
+    def test_partial_cover_not_cached(self, problem):
+        """Test that covers of cancelled solves are not stored."""
+        token = CancellationToken()
+        token.cancel()
+        solver = CachedSetCoverSolver(cancel_token=token)
+        solver.solve(**problem)
+
+        assert solver.partial is True
+        assert len(solver.cache.entries) == 0
+
+    def test_invalid_size(self):
+        """Test that a non-positive cache size is rejected."""
+        with pytest.raises(ValueError):
+            SolutionCache(max_entries=0)
@@ -0,0 +1,242 @@
+import itertools
+import time
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.ClusterFamilies import WORKING_DAY_OF_MONTH
+from src.CreateClusters import ClusterConfig, ClusterGenerator, create_range_clusters
+from src.MCSolver import SolverConfig, cover_cost
+from src.MatrixSolver import prune_clusters
+from src.WeeklySolver import (
+    WeeklyPeriodicitySolver,
+    _weekday_runs,
+    solve_segmented_cover,
+    solve_weekly_cover,
+)
+
+
+@pytest.fixture
+def clusters():
+    """Create the bool clusters of 2024."""
+    return ClusterGenerator(ClusterConfig(year=2024)).create_clusters(1, 366, "bool")
+
+
+def row(clusters, *names):
+    """Union of the named cluster rows."""
+    matrix, cluster_names, _ = clusters
+    return np.any([matrix[cluster_names.index(name)] for name in names], axis=0)
+
+
+def cost_of(clusters, running, cover, config):
+    """cover_cost of a cover given by row indices."""
+    matrix, _, day_indices = clusters
+    parent = set(day_indices[running].tolist())
+    sets = [set(day_indices[matrix[index]].tolist()) for index in cover]
+    return cover_cost(parent, sets, config)
+
+
+class TestWeeklyPeriodicitySolver:
+    def test_weekday_runs_wrap(self):
+        """Test that runs of consecutive weekdays wrap around the week."""
+        assert _weekday_runs(0b1000001) == [(6, 2)]
+        assert _weekday_runs(0b0010101) == [(0, 1), (2, 1), (4, 1)]
+        assert _weekday_runs(0b1111111) == [(0, 7)]
+        assert _weekday_runs(0) == []
+
+    @pytest.mark.parametrize(
+        "names,expected",
+        [
+            (("Working days",), ["Working days"]),
+            (("Saturday", "Holidays"), ["Saturday", "Holidays"]),
+            (("Friday", "Sunday", "Monday"), ["Friday", "Sunday and Monday"]),
+            (("Monday", "Tuesday", "Wednesday"), ["from Monday to Wednesday"]),
+            (("from Monday to Saturday", "Sunday"), ["All days"]),
+        ],
+    )
+    def test_named_patterns(self, clusters, names, expected):
+        """Test that pure patterns are expressed with the fewest clusters."""
+        solver = WeeklyPeriodicitySolver()
+        cover = solver.solve(clusters, row(clusters, *names))
+        assert sorted(clusters[1][index] for index in cover) == sorted(expected)
+        assert solver.cost == len(expected)
+
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize(
+        "missing_weight,extra_weight", [(1.0, 1.0), (1.0, 5.0), (3.0, 0.5)]
+    )
+    def test_exact_against_enumeration(
+        self, clusters, seed, missing_weight, extra_weight
+    ):
+        """Test that no union of up to three built-in clusters is cheaper."""
+        rng = np.random.default_rng(seed)
+        matrix, names, _ = clusters
+        config = SolverConfig(missing_weight=missing_weight, extra_weight=extra_weight)
+        running = matrix[rng.choice(46, 2)].any(axis=0) ^ (rng.random(366) < 0.05)
+
+        solver = WeeklyPeriodicitySolver(config)
+        cover = solver.solve(clusters, running)
+        assert cost_of(clusters, running, cover, config) == pytest.approx(solver.cost)
+
+        unions = {}
+        for size in range(4):
+            for combination in itertools.combinations(range(46), size):
+                key = matrix[list(combination)].any(axis=0).tobytes()
+                unions.setdefault(key, combination)
+        best = min(
+            cost_of(clusters, running, combination, config)
+            for combination in unions.values()
+        )
+        assert solver.cost <= best + 1e-9
+
+    def test_batch_matches_single(self, clusters):
+        """Test that batch solving returns every single-service cover."""
+        rng = np.random.default_rng(3)
+        services = rng.random((20, 366)) < 0.4
+        solver = WeeklyPeriodicitySolver()
+        covers = solver.solve_batch(clusters, services)
+        costs = solver.costs.copy()
+
+        for service, cover, cost in zip(services, covers, costs):
+            assert solve_weekly_cover(clusters, service) == cover
+            assert cost_of(clusters, service, cover, SolverConfig()) == cost
+
+    def test_ignores_family_rows(self):
+        """Test that libraries with cluster families are accepted."""
+        config = ClusterConfig(year=2024, families=(WORKING_DAY_OF_MONTH,))
+        clusters = ClusterGenerator(config).create_clusters(1, 60)
+        cover = solve_weekly_cover(clusters, row(clusters, "Working days"))
+        assert [clusters[1][index] for index in cover] == ["Working days"]
+
+    def test_invalid_inputs(self, clusters):
+        """Test that malformed inputs are rejected."""
+        with pytest.raises(ValueError):
+            solve_weekly_cover(clusters, np.zeros(366, dtype=bool))
+        with pytest.raises(ValueError):
+            solve_weekly_cover(clusters, np.ones(10, dtype=bool))
+        pruned = prune_clusters(
+            ClusterGenerator(ClusterConfig(year=2024)).create_clusters(1, 7)
+        )
+        with pytest.raises(ValueError, match="built-in cluster"):
+            solve_weekly_cover(pruned.clusters, np.ones(7, dtype=bool))
+
+
+class TestSegmentation:
+    def test_summer_timetable(self, clusters):
+        """Test that a seasonal pattern change becomes its own period."""
+        _, _, day_indices = clusters
+        running = row(clusters, "Working days")
+        summer = (day_indices >= 175) & (day_indices <= 244)
+        running[summer] = row(clusters, "Saturday", "Sunday")[summer]
+
+        solver = WeeklyPeriodicitySolver()
+        segments = solver.solve_segmented(clusters, running)
+        assert [(s.start, s.end) for s in segments] == [
+            (0, 173),
+            (174, 243),
+            (244, 365),
+        ]
+        assert [[clusters[1][i] for i in s.cover] for s in segments] == [
+            ["Working days"],
+            ["Saturday and Sunday"],
+            ["Working days"],
+        ]
+        assert solver.cost == 3 * (1 + solver.config.segment_weight)
+
+    def test_stable_pattern_is_one_period(self, clusters):
+        """Test that a regular service is not split."""
+        running = row(clusters, "Monday", "Friday")
+        segments = solve_segmented_cover(clusters, running)
+        assert len(segments) == 1
+        assert (segments[0].start, segments[0].end) == (0, 365)
+        assert segments[0].cover == solve_weekly_cover(clusters, running)
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_matches_recursive_segmentation(self, seed):
+        """Test the prefix-sum DP against per-period exact solves."""
+        clusters = ClusterGenerator(ClusterConfig(year=2021)).create_clusters(
+            100, 130, "bool"
+        )
+        matrix, names, day_indices = clusters
+        rng = np.random.default_rng(seed)
+        running = matrix[rng.choice(46, 3)].any(axis=0)
+        switch = rng.integers(5, 26)
+        running[switch:] = matrix[rng.choice(46), switch:]
+        running[0] = True
+        config = SolverConfig(segment_weight=1.5, min_segment_days=4, extra_weight=2.0)
+
+        period = WeeklyPeriodicitySolver(config)
+        memo = {}
+
+        def best_from(start):
+            if start == len(running):
+                return 0.0
+            if start not in memo:
+                options = []
+                for end in range(start + 4, len(running) + 1):
+                    if 0 < len(running) - end < 4:
+                        continue
+                    cost = 0.0  # The empty cover
+                    if running[start:end].any():
+                        part = (matrix[:, start:end], names, day_indices[start:end])
+                        period.solve_batch(part, running[None, start:end])
+                        cost = period.costs[0]
+                    options.append(cost + 1.5 + best_from(end))
+                memo[start] = min(options)
+            return memo[start]
+
+        solver = WeeklyPeriodicitySolver(config)
+        segments = solver.solve_segmented(clusters, running)
+        assert solver.cost == pytest.approx(best_from(0))
+        assert all(s.end - s.start + 1 >= 4 for s in segments)
+        assert segments[0].start == 0 and segments[-1].end == 30
+        assert solver.cost == pytest.approx(sum(s.cost + 1.5 for s in segments))
+        for s in segments:
+            assert cost_of(
+                (
+                    matrix[:, s.start : s.end + 1],
+                    names,
+                    day_indices[s.start : s.end + 1],
+                ),
+                running[s.start : s.end + 1],
+                s.cover,
+                config,
+            ) == pytest.approx(s.cost)
+
+    def test_multi_year_range_is_linear(self):
+        """Test that segmenting three years costs about three single years."""
+
+        def timed(years):
+            clusters = create_range_clusters(
+                date(2024, 1, 1), date(2023 + years, 12, 31), ClusterConfig(year=2024)
+            )
+            running = row(clusters, "Working days")
+            running[100:200] = row(clusters, "Saturday", "Sunday")[100:200]
+            running ^= np.random.default_rng(0).random(len(running)) < 0.02
+            solver = WeeklyPeriodicitySolver()
+            elapsed = []
+            for _ in range(3):
+                begin = time.perf_counter()
+                segments = solver.solve_segmented(clusters, running)
+                elapsed.append(time.perf_counter() - begin)
+            return min(elapsed), segments
+
+        one_year, _ = timed(1)
+        three_years, segments = timed(3)
+        assert [(s.start, s.end) for s in segments] == [
+            (0, 99),
+            (100, 199),
+            (200, 1095),
+        ]
+        # A quadratic search takes about nine times as long
+        assert three_years < 6 * one_year
+
+    def test_invalid_segmentation(self, clusters):
+        """Test that malformed inputs are rejected."""
+        with pytest.raises(ValueError):
+            solve_segmented_cover(clusters, np.zeros(366, dtype=bool))
+        with pytest.raises(ValueError):
+            solve_segmented_cover(
+                clusters, np.ones(366, dtype=bool), SolverConfig(min_segment_days=0)
+            )